@@ -0,0 +1,44 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer asynchronous client
+"""
+
+import threading
+
+import pytest
+
+# Asynchronous client is based on Qt thread pools
+asyncclient = pytest.importorskip('tpDcc.tools.renamer.core.asyncclient', exc_type=ImportError)
+
+
+class FakeRenamerClient(object):
+    """
+    Renamer client that records the threads its commands are called from
+    """
+
+    def __init__(self):
+        self.threads = dict()
+
+    def add_job_progress_callback(self, callback):
+        pass
+
+    def automatic_suffix(self, as_job=False):
+        self.threads['automatic_suffix'] = threading.current_thread()
+        return as_job
+
+    def cancel_job(self, job_id=None):
+        self.threads['cancel_job'] = threading.current_thread()
+        return True
+
+
+def test_commands_and_job_cancellation_do_not_run_in_caller_thread():
+    renamer_client = FakeRenamerClient()
+    async_client = asyncclient.AsyncRenamerClient(renamer_client)
+
+    assert async_client.automatic_suffix(as_job=True).result(timeout=5) is True
+    assert async_client.cancel_jobs().result(timeout=5) is True
+
+    assert renamer_client.threads['automatic_suffix'] is not threading.current_thread()
+    assert renamer_client.threads['cancel_job'] is not threading.current_thread()
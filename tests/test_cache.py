@@ -0,0 +1,40 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer query cache
+"""
+
+from tpDcc.tools.renamer.core import cache
+
+
+def test_cached_results_are_copies():
+    query_cache = cache.QueryCache()
+    key = query_cache.make_key('list_nodes', kwargs={'node_type': 'camera'})
+    query_cache.set(key, 'list_nodes', ['persp', 'top'])
+
+    found, result = query_cache.get(key)
+    result.append('front')
+    assert found
+    assert query_cache.get(key) == (True, ['persp', 'top'])
+    assert query_cache.get(query_cache.make_key('list_nodes', kwargs={'node_type': 'mesh'})) == (False, None)
+
+
+def test_generation_change_keeps_static_queries():
+    query_cache = cache.QueryCache(static_queries=['dcc_to_tpdcc_str_types'])
+    static_key = query_cache.make_key('dcc_to_tpdcc_str_types')
+    scene_key = query_cache.make_key('all_scene_nodes', kwargs={'full_path': True})
+    query_cache.set(static_key, 'dcc_to_tpdcc_str_types', ['Transform'])
+    query_cache.set(scene_key, 'all_scene_nodes', ['|root'])
+
+    query_cache.update_generation(1)
+    query_cache.set(scene_key, 'all_scene_nodes', ['|root'])
+    query_cache.update_generation(1)
+    assert query_cache.get(scene_key)[0]
+
+    query_cache.update_generation(2)
+    assert not query_cache.get(scene_key)[0]
+    assert query_cache.get(static_key)[0]
+
+    query_cache.invalidate(static=True)
+    assert query_cache.stats()['entries'] == 0
@@ -0,0 +1,44 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer node types classification
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.tools.renamer.core import categories
+
+NODE_TYPES = {'|arm_jnt': 'joint', '|leg_jnt': 'joint', '|arm_ctrl': 'transform', '|cam': 'camera', '|mesh': 'mesh'}
+INHERITED_TYPES = {'joint': ['transform'], 'mesh': ['shape'], 'camera': ['shape']}
+
+
+def test_classify_nodes_by_type():
+    checks = list()
+
+    def _check_type(node, category_type):
+        checks.append((NODE_TYPES[node], category_type))
+        return category_type in INHERITED_TYPES.get(NODE_TYPES[node], list())
+
+    nodes = ['|arm_jnt', '|arm_ctrl', '|leg_jnt', '|cam', '|mesh', '|cam']
+    type_ids = categories.classify_nodes(
+        nodes, ['transform', 'camera'], NODE_TYPES.get, _check_type, type_based_check=True)
+
+    assert type_ids == [0, 0, 0, 1, categories.UNCLASSIFIED, 1]
+
+    # Type based checks are done once per node type
+    assert checks == [('joint', 'transform'), ('mesh', 'transform'), ('mesh', 'camera')]
+
+
+def test_classify_nodes_checks_each_node():
+    node_types = {'|box': 'transform', '|cam_grp': 'transform', '|light': 'transform', '|box_mesh': 'mesh'}
+    shapes = {'|box': 'mesh', '|light': 'light'}
+
+    # Transforms match the category type of their shapes, so the result depends on the node and not on its type
+    def _check_type(node, category_type):
+        return shapes.get(node, None) == category_type
+
+    nodes = ['|box', '|cam_grp', '|light', '|box_mesh']
+    type_ids = categories.classify_nodes(nodes, ['mesh', 'light'], node_types.get, _check_type)
+
+    assert type_ids == [0, categories.UNCLASSIFIED, 1, 0]
@@ -0,0 +1,48 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer client
+"""
+
+import pytest
+
+# Renamer client is based on tpDcc client
+client = pytest.importorskip('tpDcc.tools.renamer.core.client', exc_type=ImportError)
+
+
+class FakeRenamerClient(client.RenamerClient):
+    """
+    Renamer client that replies commands without connecting to a server
+    """
+
+    def __init__(self):
+        super(FakeRenamerClient, self).__init__()
+
+        self.sent_commands = list()
+
+    def send(self, cmd_dict):
+        self.sent_commands.append(cmd_dict)
+        if cmd_dict['cmd'] == 'scene_generation':
+            return {'success': True, 'msg': '', 'result': {'tracked': True, 'generation': 1}}
+        if cmd_dict['cmd'] == 'batch':
+            return {'success': True, 'msg': '', 'result': [
+                {'success': True, 'msg': '', 'result': '{}_type'.format(command['args'][0])}
+                for command in cmd_dict['commands']]}
+
+        return {'success': False, 'msg': 'Command not expected', 'result': None}
+
+    def is_valid_reply(self, reply_dict):
+        return bool(reply_dict and reply_dict.get('success', False))
+
+
+def test_prefetch_queries_fills_cache():
+    renamer_client = FakeRenamerClient()
+    renamer_client.prefetch_queries([('node_type', ['|a'], dict()), ('node_type', ['|b'], dict())])
+
+    assert renamer_client.cached_query('node_type', '|a') == '|a_type'
+    assert renamer_client.cached_query('node_type', '|b') == '|b_type'
+
+    # Queries are sent in a single batch and cached results are used without contacting the server again
+    assert [command['cmd'] for command in renamer_client.sent_commands] == ['scene_generation', 'batch']
+    assert renamer_client.sent_commands[1]['commands'][0]['args'] == ['|a']
@@ -0,0 +1,76 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer rename plans conflicts analyzer
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.tools.renamer.core import conflicts, sceneindex
+from tpDcc.tools.renamer.core.conflicts import ConflictTypes
+
+
+def test_analyze_rename_plan():
+    scene_index = sceneindex.SceneNameIndex(['a', 'b', 'c', 'd', 'taken', 'e'])
+    plan = [
+        ('id_a', 'new', True),
+        ('id_b', 'new', True),
+        ('id_c', 'taken', True),
+        ('id_d', 'e', True),
+        ('id_e', 'd', True),
+        ('id_f', 'f', True),
+        ('id_g', '1bad name', True),
+        ('id_h', 'x', True),
+    ]
+    current_names = ['a', 'b', 'c', 'd', 'e', 'f', 'g', None]
+    report = conflicts.analyze_rename_plan(
+        plan, current_names, scene_index, valid_name_pattern=conflicts.MAYA_NAME_PATTERN)
+
+    assert report.has_errors
+    assert dict(report.conflicts(ConflictTypes.DUPLICATED)) == {'new': ['id_a', 'id_b']}
+
+    # Nodes d and e swap their names: node d is renamed first, while node e still uses its new name
+    assert dict(report.conflicts(ConflictTypes.EXISTING)) == {'taken': ['id_c'], 'e': ['id_d']}
+    assert dict(report.conflicts(ConflictTypes.NO_OP)) == {'f': ['id_f']}
+    assert dict(report.conflicts(ConflictTypes.INVALID)) == {'1bad name': ['id_g']}
+    assert dict(report.conflicts(ConflictTypes.MISSING)) == {'x': ['id_h']}
+    assert report.count(ConflictTypes.DUPLICATED) == 2
+
+
+def test_analyze_rename_plan_follows_plan_order():
+    scene_index = sceneindex.SceneNameIndex(['a', 'b', 'c'])
+
+    # Each node uses the name freed by the previous entry
+    report = conflicts.analyze_rename_plan(
+        [('id_c', 'd', True), ('id_b', 'c', True), ('id_a', 'b', True)], ['c', 'b', 'a'], scene_index)
+    assert not report.has_errors
+
+    # Names are freed by following entries, so nodes renamed in a cycle collide
+    report = conflicts.analyze_rename_plan(
+        [('id_a', 'b', True), ('id_b', 'c', True), ('id_c', 'a', True)], ['a', 'b', 'c'], scene_index)
+    assert dict(report.conflicts(ConflictTypes.EXISTING)) == {'b': ['id_a'], 'c': ['id_b']}
+
+
+def test_valid_name_patterns():
+    scene_index = sceneindex.SceneNameIndex(['a', 'b', 'c'])
+    plan = [('id_a', 'ns:sub:arm', True), ('id_b', 'Box 01-L', True), ('id_c', '', True)]
+
+    report = conflicts.analyze_rename_plan(plan, ['a', 'b', 'c'], scene_index)
+    assert dict(report.conflicts(ConflictTypes.INVALID)) == {'': ['id_c']}
+
+    report = conflicts.analyze_rename_plan(
+        plan, ['a', 'b', 'c'], scene_index, valid_name_pattern=conflicts.MAYA_NAME_PATTERN)
+    assert dict(report.conflicts(ConflictTypes.INVALID)) == {'Box 01-L': ['id_b'], '': ['id_c']}
+
+
+def test_conflict_report_serialization():
+    scene_index = sceneindex.SceneNameIndex(['a', 'b'])
+    report = conflicts.analyze_rename_plan([('id_a', 'c', True), ('id_b', 'b', True)], ['a', 'b'], scene_index)
+    assert not report.has_errors
+    assert not report
+
+    loaded_report = conflicts.ConflictReport.from_dict(report.to_dict())
+    assert loaded_report.total == 2
+    assert loaded_report.to_dict() == report.to_dict()
+    assert loaded_report.summary() == 'Rename plan with 2 entries: 1 no_op'
@@ -0,0 +1,87 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer persistent connections
+"""
+
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from tpDcc.tools.renamer.core import connection
+
+
+def _recv_bytes(client_socket, size):
+    data = b''
+    while len(data) < size:
+        chunk = client_socket.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+
+    return data
+
+
+def _serve(server_socket, echo_ids):
+    client_socket, _ = server_socket.accept()
+    with client_socket:
+        while True:
+            header = _recv_bytes(client_socket, connection.RenamerConnection.HEADER_SIZE)
+            if not header:
+                break
+            data = json.loads(_recv_bytes(client_socket, int(header)).decode())
+            reply = {'success': True, 'msg': '', 'result': data['value'] * 2}
+            if echo_ids and 'request_id' in data:
+                reply['request_id'] = data['request_id']
+            message = json.dumps(reply).encode()
+            client_socket.sendall(str(len(message)).zfill(connection.RenamerConnection.HEADER_SIZE).encode() + message)
+
+
+@pytest.mark.parametrize('echo_ids', [True, False])
+def test_pipeline_replies_are_matched(echo_ids):
+    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server_socket.bind(('localhost', 0))
+    server_socket.listen(1)
+    server_thread = threading.Thread(target=_serve, args=(server_socket, echo_ids))
+    server_thread.daemon = True
+    server_thread.start()
+
+    renamer_connection = connection.RenamerConnection(port=server_socket.getsockname()[1], timeout=5)
+    try:
+        replies = renamer_connection.pipeline([{'cmd': 'double', 'value': i} for i in range(100)], depth=8)
+        assert [reply['result'] for reply in replies] == [i * 2 for i in range(100)]
+        assert renamer_connection.request({'cmd': 'double', 'value': 4})['result'] == 8
+    finally:
+        renamer_connection.close()
+        server_socket.close()
+
+
+def _serve_after_closing_first_connection(server_socket, first_closed):
+    client_socket, _ = server_socket.accept()
+    client_socket.close()
+    first_closed.set()
+    _serve(server_socket, True)
+
+
+def test_connection_closed_by_server_is_reopened():
+    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server_socket.bind(('localhost', 0))
+    server_socket.listen(1)
+    first_closed = threading.Event()
+    server_thread = threading.Thread(target=_serve_after_closing_first_connection, args=(server_socket, first_closed))
+    server_thread.daemon = True
+    server_thread.start()
+
+    renamer_connection = connection.RenamerConnection(port=server_socket.getsockname()[1], timeout=5)
+    try:
+        assert renamer_connection.connect()
+        assert first_closed.wait(5)
+        time.sleep(0.1)
+        assert renamer_connection.request({'cmd': 'double', 'value': 4})['result'] == 8
+    finally:
+        renamer_connection.close()
+        server_socket.close()
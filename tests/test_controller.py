@@ -0,0 +1,176 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer controller
+"""
+
+import functools
+from collections import OrderedDict
+
+import pytest
+
+# Renamer controller is based on tpDcc
+controller = pytest.importorskip('tpDcc.tools.renamer.core.controller', exc_type=ImportError)
+
+from tpDcc.tools.renamer.core import paths  # noqa: E402
+
+
+class FakeRule(object):
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeNamingLib(object):
+    """
+    Naming library whose solved names contain the index they were solved with
+    """
+
+    def __init__(self):
+        self._active_rule = FakeRule('default')
+
+    def has_rule(self, rule_name):
+        return True
+
+    def active_rule(self):
+        return self._active_rule
+
+    def set_active_rule(self, rule_name):
+        self._active_rule = FakeRule(rule_name)
+
+    def solve(self, description='', side=None, node_type='', id=None):
+        return '{}_{}_{}'.format(description, node_type, id)
+
+
+class FakeNamingConfig(object):
+    def get(self, key, default=None):
+        return {'auto_suffixes': {'default': {'joint': 'jnt'}}}.get(key, default)
+
+
+class FakeModel(object):
+    def __init__(self):
+        self.active_rule = FakeRule('default')
+        self.hierarchy_check = True
+        self.selection_type = 0
+        self.filter_type = None
+        self.rename_shape = True
+        self.naming_config = FakeNamingConfig()
+
+
+class FakeRenamerClient(object):
+    """
+    Renamer client that works over a fixed hierarchy without connecting to a server
+    """
+
+    def __init__(self, hierarchy):
+        self._hierarchy = hierarchy
+        self.applied_plans = list()
+        self.applied_as_job = list()
+        self.collect_kwargs = list()
+        self.solved_chunks = list()
+
+    def is_maya(self):
+        return False
+
+    def collect_rename_targets(self, hierarchy_check=False, only_selection=True, filter_type=None, depth_sort=True):
+        self.collect_kwargs.append({
+            'hierarchy_check': hierarchy_check, 'only_selection': only_selection, 'filter_type': filter_type,
+            'depth_sort': depth_sort})
+        return paths.sort_paths_by_depth(self._hierarchy) if depth_sort else list(self._hierarchy)
+
+    def find_auto_solved_data(self, auto_suffixes, tokens_dict, last_joint_end=True, nodes=None):
+        self.solved_chunks.append(list(nodes))
+        # Nodes are solved in the given order, as renamer servers do
+        return OrderedDict(
+            (node, {'description': node.rsplit('|', 1)[-1], 'node_type': auto_suffixes['joint']}) for node in nodes)
+
+    def find_unique_names(self, names):
+        return list(names)
+
+    def apply_rename_plan(self, plan, as_job=False, check_conflicts=False):
+        self.applied_plans.append(plan)
+        self.applied_as_job.append(as_job)
+        return {'renamed': len(plan), 'failed': dict()}
+
+
+def test_auto_rename_numbers_nodes_in_selection_order(monkeypatch):
+    renamer_client = FakeRenamerClient(['|root', '|root|s1', '|root|s2', '|root|s3'])
+    monkeypatch.setattr(controller.utils.dcc, 'client', lambda *args, **kwargs: renamer_client, raising=False)
+
+    renamer_controller = controller.RenamerController(FakeNamingLib(), renamer_client, FakeModel())
+    renamer_controller.auto_rename(dict())
+
+    # Parent is numbered before its children and siblings are numbered in hierarchy order
+    assert [plan_entry[:2] for plan_entry in renamer_client.applied_plans[0]] == [
+        ('|root', 'root_jnt_0'), ('|root|s1', 's1_jnt_1'), ('|root|s2', 's2_jnt_2'), ('|root|s3', 's3_jnt_3')]
+
+
+def test_auto_rename_applies_large_plans_in_a_single_undo_chunk(monkeypatch):
+    renamer_client = FakeRenamerClient(['|root'] + ['|root|s{}'.format(i) for i in range(2000)])
+    monkeypatch.setattr(controller.utils.dcc, 'client', lambda *args, **kwargs: renamer_client, raising=False)
+
+    renamer_controller = controller.RenamerController(FakeNamingLib(), renamer_client, FakeModel())
+    renamer_controller.auto_rename(dict())
+
+    # Server jobs apply each chunk in a different undo chunk, so plans are always applied synchronously
+    assert len(renamer_client.applied_plans) == 1 and len(renamer_client.applied_plans[0]) == 2001
+    assert renamer_client.applied_as_job == [False]
+
+
+def test_auto_rename_worker_steps_only_use_captured_settings(monkeypatch):
+    renamer_client = FakeRenamerClient(['|root', '|root|s1'])
+    monkeypatch.setattr(controller.utils.dcc, 'client', lambda *args, **kwargs: renamer_client, raising=False)
+
+    naming_lib = FakeNamingLib()
+    model = FakeModel()
+    renamer_controller = controller.RenamerController(naming_lib, renamer_client, model)
+    settings = renamer_controller.auto_rename_settings(dict())
+
+    # Steps executed in worker threads must not access the model or the naming library shared with the UI
+    monkeypatch.setattr(renamer_controller, '_model', None)
+    monkeypatch.setattr(renamer_controller, '_naming_lib', None)
+    targets = renamer_controller.collect_auto_rename_targets(settings)
+    monkeypatch.setattr(renamer_controller, '_model', model)
+    monkeypatch.setattr(renamer_controller, '_naming_lib', naming_lib)
+    solved_names = renamer_controller.solve_auto_rename_names(settings, targets)
+    monkeypatch.setattr(renamer_controller, '_model', None)
+    monkeypatch.setattr(renamer_controller, '_naming_lib', None)
+
+    assert renamer_controller.apply_auto_rename_names(settings, solved_names) is True
+    assert [plan_entry[:2] for plan_entry in renamer_client.applied_plans[0]] == [
+        ('|root', 'root_jnt_0'), ('|root|s1', 's1_jnt_1')]
+    assert naming_lib.active_rule().name == 'default'
+
+
+def test_rename_collects_the_nodes_of_rename_previews(monkeypatch):
+    renamer_client = FakeRenamerClient(['|root', '|root|s1'])
+    monkeypatch.setattr(controller.utils.dcc, 'client', lambda *args, **kwargs: renamer_client, raising=False)
+
+    model = FakeModel()
+    model.filter_type = 'joint'
+    renamer_controller = controller.RenamerController(FakeNamingLib(), renamer_client, model)
+    collected_nodes = list()
+    monkeypatch.setattr(
+        renamer_controller, 'generate_names', lambda items, **kwargs: collected_nodes.extend(items) or list())
+    renamer_controller.rename(name='node')
+
+    # Server collects preview nodes with the same filter type and without sorting them by depth
+    assert renamer_client.collect_kwargs == [
+        {'hierarchy_check': True, 'only_selection': True, 'filter_type': 'joint', 'depth_sort': False}]
+    assert collected_nodes == ['|root', '|root|s1']
+
+
+def test_auto_rename_sends_nodes_in_chunks(monkeypatch):
+    renamer_client = FakeRenamerClient(['|root', '|root|s1', '|root|s2'])
+    monkeypatch.setattr(controller.utils.dcc, 'client', lambda *args, **kwargs: renamer_client, raising=False)
+    monkeypatch.setattr(
+        controller.utils, 'iter_objects_to_rename',
+        functools.partial(controller.utils.iter_objects_to_rename, chunk_size=2))
+
+    renamer_controller = controller.RenamerController(FakeNamingLib(), renamer_client, FakeModel())
+    renamer_controller.auto_rename(dict())
+
+    # Nodes are numbered in selection order across chunks and the plan is applied at once
+    assert renamer_client.solved_chunks == [['|root', '|root|s1'], ['|root|s2']]
+    assert [plan_entry[:2] for plan_entry in renamer_client.applied_plans[0]] == [
+        ('|root', 'root_jnt_0'), ('|root|s1', 's1_jnt_1'), ('|root|s2', 's2_jnt_2')]
@@ -0,0 +1,199 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer name generation engine
+"""
+
+import random
+
+import pytest
+
+from tpDcc.tools.renamer.core import engine, pipeline
+
+
+def test_get_alpha():
+    assert [pipeline.get_alpha(i) for i in (0, 25, 26, 27, 701, 702)] == ['a', 'z', 'aa', 'ab', 'zz', 'aaa']
+    assert pipeline.get_alpha(2, capital=True) == 'C'
+
+
+def test_format_name():
+    spec = engine.RenameSpec(prefix='char', side='L', suffix='jnt', padding=2, remove_first=1, search='a', replace='o')
+    assert engine.format_name('arm', spec, index=3) == 'hor_L_orm_03_jnt'
+    assert engine.format_name('arm', spec, index=3, affixes=False) == 'hor_orm_03'
+
+
+def test_generate_names_with_text():
+    spec = engine.RenameSpec.from_settings(name='spine', padding=2, suffix='jnt')
+    names = ['|a', '|a|b', '|a|b|c']
+    assert engine.generate_names(['a', 'b', 'c'], names, spec, taken_names=set(names)) == [
+        'spine_00_jnt', 'spine_01_jnt', 'spine_02_jnt']
+
+
+def test_generate_names_keeps_names_without_changes():
+    spec = engine.RenameSpec()
+    assert engine.generate_names(['a', 'b'], ['a', 'b'], spec) == ['a', 'b']
+
+    spec = engine.RenameSpec(prefix='pre')
+    assert engine.generate_names(['a', 'b'], ['a', 'b'], spec) == ['pre_a', 'pre_b']
+
+
+def test_generate_names_resolves_collisions():
+    spec = engine.RenameSpec(name='node', suffix='geo', letters=True)
+    existing = {'node_a_geo', 'node_b'}
+    names = engine.generate_names(['x'] * 3, [None] * 3, spec, name_exists=existing.__contains__)
+
+    # Collided names do not keep suffix, as renamer always did
+    assert names == ['node_c', 'node_b_geo', 'node_c_geo']
+
+
+def test_generate_names_with_removed_indices():
+    # Removed characters hide several indices, but increasing the index frees the name later
+    spec = engine.RenameSpec(name='arm', remove_last=2)
+    assert engine.generate_names(['x', 'y', 'z'], [None] * 3, spec, taken_names={'arm'}) == ['arm_', 'arm_1', 'arm_2']
+
+
+def test_generate_names_without_available_name(monkeypatch):
+    monkeypatch.setattr(engine, 'MAX_INDEX_SEARCH', 1000)
+    spec = engine.RenameSpec(name='node', remove_first=100)
+    with pytest.raises(ValueError):
+        engine.generate_names(['x'], [None], spec, taken_names={''})
+
+
+def _reference_generate_names(base_names, current_names, spec, taken_names, name_exists):
+    """
+    Original renamer algorithm, that checks names one index at a time
+    """
+
+    def _find_available_name(base_name, index):
+        new_name = engine.format_name(base_name, spec, index=index)
+        while new_name in taken_names or name_exists(new_name):
+            index = (index if index is not None else -1) + 1
+            new_name = engine.format_name(base_name, spec, index=index, affixes=False)
+        return new_name
+
+    duplicated_names = dict()
+    generated_names = list()
+    for base_name, current_name in zip(base_names, current_names):
+        base_name = spec.name or base_name
+        duplicated_names[base_name] = duplicated_names.get(base_name, -1) + 1
+        if base_name == current_name and not spec.has_affixes:
+            generated_names.append(base_name)
+            continue
+        new_name = _find_available_name(
+            base_name, None if base_name == current_name else duplicated_names[base_name])
+        while new_name in generated_names:
+            duplicated_names[base_name] += 1
+            new_name = _find_available_name(base_name, duplicated_names[base_name])
+        generated_names.append(new_name)
+
+    return generated_names
+
+
+@pytest.mark.parametrize('spec_kwargs', [
+    dict(),
+    dict(name='node'),
+    dict(prefix='pre'),
+    dict(name='node', side='L', suffix='geo', padding=3),
+    dict(prefix='pre', suffix='jnt', letters=True),
+    dict(side='R', search='_', replace=''),
+    dict(name='arm', remove_last=2),
+    dict(name='node', padding=2, remove_last=3),
+    dict(prefix='pre', remove_last=1),
+])
+def test_generate_names_matches_reference(spec_kwargs):
+    random_generator = random.Random(len(spec_kwargs))
+    spec = engine.RenameSpec(**spec_kwargs)
+    base_names = [random_generator.choice(['a', 'b', 'node', 'pre_a']) for _ in range(300)]
+    current_names = [random_generator.choice([base_name, None]) for base_name in base_names]
+    existing = set(random_generator.choice([
+        engine.format_name(base_name, spec, index=i, affixes=affixes) for base_name in ('a', 'node', 'pre_a')
+        for i in range(100) for affixes in (True, False)]) for _ in range(150))
+    taken_names = {'b', engine.format_name('x', spec), engine.format_name('x', spec, index=0, affixes=False)}
+    existing_calls = list()
+
+    def _name_exists(name):
+        existing_calls.append(name)
+        return name in existing
+
+    assert engine.generate_names(
+        base_names, current_names, spec, taken_names=taken_names, name_exists=_name_exists) == (
+        _reference_generate_names(base_names, current_names, spec, taken_names, existing.__contains__))
+    assert len(existing_calls) == len(set(existing_calls))
+
+
+def test_preview_names_flags_collisions():
+    spec = engine.RenameSpec(name='arm', padding=2)
+    scene_names = {'arm_00', 'hand'}
+    previews = engine.preview_names(
+        ['a', 'b'], ['a', 'b'], spec, taken_names={'a', 'b'}, name_exists=scene_names.__contains__)
+    assert previews == [('arm_01', True), ('arm_02', True)]
+    assert engine.preview_names(['a'], ['a'], spec, name_exists=scene_names.__contains__) == [('arm_01', True)]
+    assert engine.preview_names(['a'], ['a'], engine.RenameSpec(name='leg')) == [('leg_0', False)]
+
+
+def test_incremental_preview_matches_generate_names():
+    random_generator = random.Random(16)
+    base_names = [random_generator.choice(['a', 'b', 'node', 'pre_a', 'a_1']) for _ in range(300)]
+    current_names = [random_generator.choice([base_name, None]) for base_name in base_names]
+    existing = {'a_1', 'node_2', 'pre_node_3_geo', 'L_b', 'b_5'}
+    name_preview = engine.IncrementalPreview(
+        base_names, current_names, taken_names={'b'}, name_exists=existing.__contains__)
+
+    # Settings change one at a time, as they do while the user types in the renamer widgets
+    for spec_kwargs in (
+            dict(), dict(prefix='p'), dict(prefix='pr'), dict(prefix='pre'), dict(prefix='pre', suffix='geo'),
+            dict(prefix='pre', suffix='g'), dict(suffix='g', search='a', replace='b'), dict(side='L', search='a'),
+            dict(side='L', search='a', replace='a_1'), dict(name='node'), dict(name='node', remove_first=1),
+            dict(remove_last=2), dict(suffix='s', remove_last=2), dict(remove_last=2), dict(remove_first=1),
+            dict(prefix='p', remove_first=1), dict(remove_first=1)):
+        spec = engine.RenameSpec(**spec_kwargs)
+        assert name_preview.generate_names(spec) == engine.generate_names(
+            base_names, current_names, spec, taken_names={'b'}, name_exists=existing.__contains__)
+
+
+def test_incremental_preview_reuses_unchanged_stages():
+    name_preview = engine.IncrementalPreview(['a', 'b'], [None, None])
+    assert name_preview.generate_names(engine.RenameSpec(prefix='pre', suffix='geo')) == ['pre_a_0_geo', 'pre_b_0_geo']
+    prefix_names = name_preview._stage_names[0]
+    assert name_preview.generate_names(engine.RenameSpec(prefix='pre', suffix='jnt')) == ['pre_a_0_jnt', 'pre_b_0_jnt']
+
+    # Only suffix changed, so names generated by previous stages are not generated again
+    assert name_preview._stage_names[0] is prefix_names
+    assert name_preview.preview_names(engine.RenameSpec(name='c')) == [('c_0', False), ('c_1', False)]
+
+
+def test_generate_names_parallel(monkeypatch):
+    monkeypatch.setattr(engine, 'PARALLEL_CHUNK_SIZE', 50)
+    random_generator = random.Random(18)
+    base_names = [random_generator.choice(['a', 'b', 'node', 'a_1']) for _ in range(400)]
+    current_names = [random_generator.choice([base_name, None]) for base_name in base_names]
+    existing = {'a_1', 'node_2', 'pre_node_3_geo', 'b_5'}
+    for spec in (engine.RenameSpec(), engine.RenameSpec(prefix='pre', suffix='geo'), engine.RenameSpec(name='node')):
+        assert engine.generate_names(
+            base_names, current_names, spec, taken_names={'b'}, name_exists=existing.__contains__, parallel=True,
+            processes=2) == engine.generate_names(
+            base_names, current_names, spec, taken_names={'b'}, name_exists=existing.__contains__, parallel=False)
+
+
+@pytest.mark.parametrize('executable, available', [
+    ('/usr/bin/python3.11', True),
+    ('C:/Python27/python.exe', True),
+    ('/usr/autodesk/maya2022/bin/mayapy', True),
+    ('/usr/autodesk/maya2022/bin/maya.bin', False),
+    ('C:/Program Files/Autodesk/Maya2022/bin/maya.exe', False),
+    ('', False),
+])
+def test_process_pool_only_in_standalone_interpreters(monkeypatch, executable, available):
+    monkeypatch.setattr(engine.sys, 'executable', executable)
+    assert engine._process_pool_available() == available
+
+
+def test_incremental_preview_checks_kept_names_when_affixes_change():
+    name_preview = engine.IncrementalPreview(['c'], ['c'], name_exists={'c'}.__contains__)
+    assert name_preview.generate_names(engine.RenameSpec(remove_last=2)) == ['c']
+
+    # Adding a suffix makes the node request a new name, which collides with the name trimmed by remove_last
+    spec = engine.RenameSpec(suffix='s', remove_last=2)
+    assert name_preview.generate_names(spec) == engine.generate_names(
+        ['c'], ['c'], spec, name_exists={'c'}.__contains__) == ['c_']
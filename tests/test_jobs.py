@@ -0,0 +1,67 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer chunked jobs
+"""
+
+from tpDcc.tools.renamer.core import jobs
+
+
+def test_job_processes_all_items_in_chunks():
+    chunks = list()
+    job = jobs.RenamerJob('test', range(10), chunks.append, chunk_size=4)
+    job.run()
+
+    assert chunks == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    progress = job.progress()
+    assert progress['state'] == jobs.JobStates.FINISHED
+    assert progress['processed'] == progress['total'] == 10
+
+
+def test_job_cancel_stops_at_chunk_boundary():
+    events = list()
+    job = jobs.RenamerJob(
+        'test', range(10), events.append, chunk_size=4,
+        start_fn=lambda: events.append('start'), finish_fn=lambda: events.append('finish'))
+
+    assert job.run_next_chunk()
+    job.cancel()
+    assert not job.run_next_chunk()
+
+    assert events == ['start', [0, 1, 2, 3], 'finish']
+    assert job.state == jobs.JobStates.CANCELLED
+    assert job.progress()['processed'] == 4
+
+
+def test_job_failure_is_reported():
+    def _fail(chunk):
+        raise ValueError('invalid chunk')
+
+    job = jobs.RenamerJob('test', range(3), _fail)
+    job.run()
+
+    assert job.state == jobs.JobStates.FAILED
+    assert 'invalid chunk' in job.progress()['error']
+
+
+def test_job_queue_runs_jobs_in_order():
+    events = list()
+    job_queue = jobs.JobQueue()
+    first_job = jobs.RenamerJob('first', range(4), lambda chunk: events.append(('first', chunk)) or len(chunk), 2)
+    second_job = jobs.RenamerJob('second', range(2), lambda chunk: events.append(('second', chunk)), 2)
+
+    assert job_queue.submit(first_job) == 0
+    assert job_queue.submit(second_job) == 1
+    assert second_job.state == jobs.JobStates.QUEUED
+
+    assert job_queue.run_next_chunk()
+    assert job_queue.position(second_job.id) == 1
+    while job_queue.run_next_chunk():
+        pass
+
+    assert events == [('first', [0, 1]), ('first', [2, 3]), ('second', [0, 1])]
+    assert first_job.results == [2, 2]
+    assert second_job.results == list()
+    assert job_queue.position(second_job.id) == -1
+    assert second_job.progress()['queue_wait'] >= first_job.progress()['queue_wait']
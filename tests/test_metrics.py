@@ -0,0 +1,36 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer commands instrumentation
+"""
+
+import json
+
+from tpDcc.tools.renamer.core import metrics
+
+
+def test_histogram_percentiles():
+    histogram = metrics.Histogram(metrics.TIME_BOUNDS)
+    for _ in range(90):
+        histogram.add(0.0008)
+    for _ in range(10):
+        histogram.add(0.2)
+
+    assert histogram.count == 100
+    assert histogram.percentile(50) == 0.001
+    assert histogram.percentile(95) == 0.25
+    assert histogram.to_dict()['max'] == 0.2
+
+
+def test_command_metrics_to_json():
+    command_metrics = metrics.CommandMetrics()
+    command_metrics.record('apply_rename_plan', {'serialize': 0.001, 'execute': None, 'reply_bytes': 300, 'foo': 1})
+    command_metrics.record('apply_rename_plan', {'serialize': 0.002, 'execute': 0.5, 'reply_bytes': 100})
+
+    data = json.loads(command_metrics.to_json())
+    assert data['apply_rename_plan']['calls'] == 2
+    assert data['apply_rename_plan']['serialize']['count'] == 2
+    assert data['apply_rename_plan']['execute']['count'] == 1
+    assert data['apply_rename_plan']['reply_bytes']['total'] == 400
+    assert 'transport' not in data['apply_rename_plan']
@@ -0,0 +1,56 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer node cache
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.tools.renamer.core import nodecache
+
+
+class FakeHandle(object):
+    def __init__(self, full_path):
+        self.full_path = full_path
+
+
+def _build_cache(resolved_nodes):
+    def _resolve(node):
+        resolved_nodes.append(node)
+        full_path = node if isinstance(node, str) else node.full_path
+        if full_path == '|missing':
+            return None
+        return full_path, 'uuid{}'.format(full_path)
+
+    return nodecache.NodeCache(_resolve)
+
+
+def test_nodes_are_resolved_once():
+    resolved_nodes = list()
+    cache = _build_cache(resolved_nodes)
+    handle = FakeHandle('|root|arm')
+
+    record = cache.resolve(handle)
+    assert record.short_name == 'arm' and record.full_path == '|root|arm' and record.uuid == 'uuid|root|arm'
+    assert cache.resolve(handle) is record
+    assert cache.resolve('|missing') is None and cache.resolve('|missing') is None
+    assert cache.find('uuid|root|arm') is record
+    assert cache.resolve_count == 2
+    assert resolved_nodes == [handle, '|missing']
+
+
+def test_rename_updates_cached_descendants():
+    cache = _build_cache(list())
+    hand = cache.resolve(FakeHandle('|root|arm|hand'))
+    arm = cache.resolve(FakeHandle('|root|arm'))
+    root = cache.resolve(FakeHandle('|root'))
+
+    assert cache.rename('uuid|root|arm|hand', 'l_hand')
+    assert cache.rename('uuid|root|arm', 'l_arm')
+    assert cache.rename('uuid|root', 'body')
+    assert not cache.rename('uuid|other', 'other')
+
+    assert root.full_path == '|body'
+    assert arm.full_path == '|body|l_arm' and arm.short_name == 'l_arm'
+    assert hand.full_path == '|body|l_arm|l_hand' and hand.short_name == 'l_hand'
@@ -0,0 +1,43 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer paths functions
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.tools.renamer.core import paths
+
+
+def test_path_depth():
+    assert paths.path_depth('|root') == 0
+    assert paths.path_depth('|root|child|grand_child') == 2
+    assert paths.path_depth('node') == 0
+
+
+def test_sort_paths_by_depth():
+    node_paths = ['|a', '|b|b1', '|a|a1', '|a|a1|a2', '|b', '|a|a1', '|c']
+    sorted_paths = paths.sort_paths_by_depth(paths.unique_paths(node_paths))
+    assert sorted_paths == ['|a|a1|a2', '|b|b1', '|a|a1', '|a', '|b', '|c']
+
+    # Each node is renamed after all its descendants
+    for i, node_path in enumerate(sorted_paths):
+        assert not any(other_path.startswith(node_path + '|') for other_path in sorted_paths[i + 1:])
+
+
+def test_minimal_roots_drops_nodes_with_selected_ancestors():
+    node_paths = ['|root|arm|hand', '|root', '|other|leg', '|rootA', '|other']
+
+    assert paths.minimal_roots(node_paths) == ['|root', '|rootA', '|other']
+
+
+def test_path_trie_ancestors():
+    trie = paths.PathTrie(['|root', '|root|arm', '|root|arm|hand', '|other'])
+
+    assert not trie.add('|root')
+    assert len(trie) == 4
+    assert '|root|arm' in trie and '|root|leg' not in trie
+    assert trie.has_ancestor('|root|arm|hand') and trie.has_ancestor('|root|leg')
+    assert not trie.has_ancestor('|root') and not trie.has_ancestor('|rootA|arm')
+    assert trie.roots() == ['|root', '|other']
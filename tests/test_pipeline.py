@@ -0,0 +1,88 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer rename pipelines
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import json
+
+import pytest
+
+from tpDcc.tools.renamer.core import engine, pipeline
+
+
+def test_pipeline_only_compiles_used_stages():
+    rename_pipeline = engine.RenameSpec(prefix='pre', padding=2).compile()
+    assert [stage.STAGE_TYPE for stage in rename_pipeline.stages] == ['prefix_side', 'number']
+    assert not engine.RenameSpec().has_affixes
+    assert [stage.STAGE_TYPE for stage in engine.RenameSpec().compile().stages] == ['number']
+
+
+def test_pipeline_serialization():
+    spec = engine.RenameSpec(
+        name='arm', prefix='hor', side='L', suffix='jnt', padding=2, letters=True, capital=True, remove_first=1,
+        remove_last=2, search='a', replace='o')
+    rename_pipeline = spec.compile()
+    loaded_pipeline = pipeline.RenamePipeline.from_dict(json.loads(json.dumps(rename_pipeline.to_dict())))
+    assert loaded_pipeline == rename_pipeline
+    assert loaded_pipeline.name == 'arm'
+    assert loaded_pipeline.has_affixes
+    assert loaded_pipeline.format('arm', index=27) == rename_pipeline.format('arm', index=27) == 'or_L_orm_AB_j'
+
+
+def test_pipeline_unknown_stage():
+    try:
+        pipeline.RenamePipeline.from_dict({'stages': [{'type': 'invalid'}]})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('Unknown stages must raise ValueError')
+
+
+def test_generate_names_with_pipeline():
+    spec = engine.RenameSpec(side='L', padding=2)
+    current_names = ['a', 'b', 'c']
+    assert engine.generate_names(['a', 'a', 'b'], current_names, spec.compile(), taken_names=current_names) == \
+        engine.generate_names(['a', 'a', 'b'], current_names, spec, taken_names=current_names)
+
+
+def test_replace_stage_literal():
+    replace_stage = pipeline.ReplaceStage('a', 'o')
+    assert replace_stage.substitute('arm_a') == ('orm_o', 2)
+    assert replace_stage.substitute('leg') == ('leg', 0)
+
+    # Literal replacement text is never interpreted as a template
+    assert pipeline.ReplaceStage('L', r'\1', ignore_case=True).substitute('l_arm') == (r'\1_arm', 1)
+
+
+def test_replace_stage_regex():
+    replace_stage = pipeline.ReplaceStage(r'(\w+)_(L|R)$', r'\2_\1', regex=True)
+    assert replace_stage.substitute('arm_L') == ('L_arm', 1)
+    assert pipeline.ReplaceStage('ARM', 'leg', ignore_case=True).substitute('arm_Arm') == ('leg_leg', 2)
+    assert pipeline.ReplaceStage('arm', 'leg', whole_word=True).substitute('arm_farm_arm1_arm') == (
+        'leg_farm_arm1_leg', 2)
+
+    with pytest.raises(ValueError):
+        pipeline.ReplaceStage('(', '', regex=True)
+    with pytest.raises(ValueError):
+        pipeline.ReplaceStage('a', r'\2', regex=True).substitute('a')
+
+
+def test_replace_stage_checks_template_once():
+    # Invalid templates are found when the stage is built, even if search pattern does not match any name
+    for search, replace in ((r'(a)', r'\2'), (r'(a)', r'\g<side>'), (r'(?P<side>L)', r'\g<2>')):
+        with pytest.raises(ValueError):
+            pipeline.ReplaceStage(search, replace, regex=True)
+
+    assert pipeline.ReplaceStage(r'(?P<side>L)_(\w+)', r'\2_\g<side>\\1', regex=True).substitute('L_arm') == (
+        'arm_L\\1', 1)
+    assert pipeline.ReplaceStage('a', r'\2', regex=False).substitute('a') == (r'\2', 1)
+
+
+def test_replace_stage_in_pipeline():
+    spec = engine.RenameSpec.from_settings(search='^(.)', replace=r'X\1', regex=True)
+    rename_pipeline = pipeline.RenamePipeline.from_dict(spec.compile().to_dict())
+    assert rename_pipeline.format('arm') == 'Xarm'
@@ -0,0 +1,40 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer compact wire format
+"""
+
+import json
+
+import pytest
+
+from tpDcc.tools.renamer.core import protocol
+
+
+def test_paths_table_round_trip():
+    paths = ['|root|spine_01|spine_{:02d}'.format(i) for i in range(20)] + ['|root', 'persp', '|root|arm|']
+    assert protocol.decode_paths(protocol.encode_paths(paths)) == paths
+
+
+@pytest.mark.parametrize('compress_threshold', [-1, 0, protocol.COMPRESS_THRESHOLD])
+def test_pack_round_trip(compress_threshold):
+    data = {
+        'cmd': 'search_and_replace',
+        'search': 'L_',
+        'replace': 'R_',
+        'nodes': ['|character|hips|leg_{}|foot'.format(i) for i in range(500)],
+        'short': ['a', 'b']
+    }
+    frame = protocol.pack(data, compress_threshold=compress_threshold)
+    assert protocol.unpack(protocol.text_to_frame(protocol.frame_to_text(frame))) == data
+
+
+def test_compact_frame_is_smaller_than_json():
+    data = {'nodes': ['|character|hips|spine|chest|neck|head|joint_{}'.format(i) for i in range(5000)]}
+    assert len(protocol.pack(data)) < len(json.dumps(data)) / 10
+
+
+def test_unpack_invalid_frame():
+    with pytest.raises(ValueError):
+        protocol.unpack(b'XX' + protocol.pack({'cmd': 'ping'})[2:])
@@ -0,0 +1,33 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer scene name index
+"""
+
+from tpDcc.tools.renamer.core import sceneindex
+
+
+def test_index_from_paths():
+    scene_index = sceneindex.SceneNameIndex.from_paths(['|root|arm', '|root', '|other|arm', 'time1'])
+
+    assert len(scene_index) == 3
+    assert scene_index.count('arm') == 2
+    assert 'root' in scene_index and '|root' not in scene_index
+
+    scene_index.rename('arm', 'arm1')
+    assert scene_index.count('arm') == 1
+    assert 'arm1' in scene_index
+
+
+def test_find_unique_name():
+    scene_index = sceneindex.SceneNameIndex(['arm', 'arm_1', 'leg01', 'leg02', 'leg04'])
+
+    assert scene_index.find_unique_name('spine') == 'spine'
+    assert scene_index.find_unique_name('arm') == 'arm_2'
+    assert scene_index.find_unique_name('leg01') == 'leg03'
+    assert [scene_index.find_unique_name('leg01', reserve=True) for _ in range(3)] == ['leg03', 'leg05', 'leg06']
+
+    # Removed names can be used again
+    scene_index.remove('leg02')
+    assert scene_index.find_unique_name('leg01') == 'leg02'
@@ -0,0 +1,36 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-tools-renamer base server
+"""
+
+import pytest
+
+# Renamer server is based on tpDcc server
+server = pytest.importorskip('tpDcc.tools.renamer.core.server', exc_type=ImportError)
+
+from tpDcc.tools.renamer.core import client  # noqa: E402
+
+
+class EchoRenamerServer(server.RenamerServer):
+    """
+    Renamer server with a command that returns the data it receives
+    """
+
+    def echo(self, data, reply):
+        reply['success'] = True
+        reply['result'] = data
+
+
+def test_batch_commands_pass_kwargs_as_handler_data():
+    renamer_server = EchoRenamerServer()
+    cmd = client.batch_command('echo', 'first', args='a', kwargs='k', value=2)
+    assert cmd == {'cmd': 'echo', 'args': ['first'], 'kwargs': {'args': 'a', 'kwargs': 'k', 'value': 2}}
+
+    reply = {'cmd': 'batch', 'success': False, 'msg': '', 'result': None}
+    renamer_server.batch({'commands': [cmd]}, reply)
+
+    # Handlers read keyword arguments by name, even if they are named as the keys of the command
+    assert reply['result'][0]['success']
+    assert reply['result'][0]['result'] == {'cmd': 'echo', 'args': 'a', 'kwargs': 'k', 'value': 2}
@@ -0,0 +1,243 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tpDcc-tools-renamer asynchronous client implementation
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import logging
+import threading
+import traceback
+
+from Qt.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+LOGGER = logging.getLogger('tpDcc-tools-renamer')
+
+
+def run_command(client, fn, *args, **kwargs):
+    """
+    Executes given function in a worker thread if given client is asynchronous or synchronously otherwise
+    Function receives the synchronous renamer client as its first argument
+    :param client: AsyncRenamerClient or RenamerClient
+    :param fn: callable
+    :return: RenamerFuture or object, future if the function is executed in a worker thread or its result otherwise
+    """
+
+    if isinstance(client, AsyncRenamerClient):
+        return client.submit(fn, client.client, *args, **kwargs)
+
+    return fn(client, *args, **kwargs)
+
+
+class RenamerFuture(QObject, object):
+    """
+    Result of a renamer command executed asynchronously
+    Signals are emitted from worker threads, so connected slots of objects living in the main thread are executed
+    within Qt event loop
+    """
+
+    finished = Signal(object)
+    failed = Signal(str)
+    done_signal = Signal(object)
+
+    def __init__(self, name):
+        super(RenamerFuture, self).__init__()
+
+        self._name = name
+        self._result = None
+        self._error = None
+        self._done_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def error(self):
+        return self._error
+
+    def done(self):
+        """
+        Returns whether or not the command execution is finished
+        :return: bool
+        """
+
+        return self._done_event.is_set()
+
+    def result(self, timeout=None):
+        """
+        Blocks until the command execution is finished and returns its result
+        :param timeout: float or None, maximum number of seconds to wait
+        :return: object
+        """
+
+        if not self._done_event.wait(timeout):
+            raise RuntimeError('Renamer command "{}" not finished after {} seconds'.format(self._name, timeout))
+        if self._error:
+            raise RuntimeError('Renamer command "{}" failed: {}'.format(self._name, self._error))
+
+        return self._result
+
+    def add_done_callback(self, callback):
+        """
+        Connects given callback so it is called with this future once the command execution is finished
+        If the execution is already finished, the callback is called immediately
+        :param callback: callable
+        """
+
+        with self._lock:
+            if not self.done():
+                self.done_signal.connect(callback)
+                return
+
+        callback(self)
+
+    def set_result(self, result):
+        with self._lock:
+            self._result = result
+            self._done_event.set()
+        self.finished.emit(result)
+        self.done_signal.emit(self)
+
+    def set_error(self, error):
+        with self._lock:
+            self._error = error
+            self._done_event.set()
+        self.failed.emit(error)
+        self.done_signal.emit(self)
+
+
+class RenamerRunnable(QRunnable, object):
+    """
+    Runnable that executes a function in a worker thread and stores its result in a future
+    """
+
+    def __init__(self, fn, future, args, kwargs, done_callback):
+        super(RenamerRunnable, self).__init__()
+
+        self._fn = fn
+        self._future = future
+        self._args = args
+        self._kwargs = kwargs
+        self._done_callback = done_callback
+
+    def run(self):
+        try:
+            result = self._fn(*self._args, **self._kwargs)
+        except Exception:
+            error = traceback.format_exc()
+            LOGGER.error('Renamer asynchronous command "{}" failed: {}'.format(self._future.name, error))
+            self._future.set_error(error)
+        else:
+            self._future.set_result(result)
+        finally:
+            self._done_callback(self._future)
+
+
+class AsyncRenamerClient(QObject, object):
+    """
+    Wraps a renamer client so all its commands are executed in worker threads and return RenamerFuture objects
+    instead of blocking Qt event loop until the server replies
+    """
+
+    busyChanged = Signal(bool)
+    progressChanged = Signal(int, int)
+    commandFinished = Signal(str)
+    jobProgressChanged = Signal(dict)
+
+    def __init__(self, client, max_threads=1, parent=None):
+        super(AsyncRenamerClient, self).__init__(parent)
+
+        self._client = client
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(max(1, max_threads))
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+
+        if hasattr(self._client, 'add_job_progress_callback'):
+            self._client.add_job_progress_callback(self.jobProgressChanged.emit)
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+
+        client_attr = getattr(self._client, attr)
+        if not callable(client_attr):
+            return client_attr
+
+        def _submit_command(*args, **kwargs):
+            return self.submit(client_attr, *args, **kwargs)
+
+        return _submit_command
+
+    @property
+    def client(self):
+        return self._client
+
+    @property
+    def is_busy(self):
+        return self._completed < self._submitted
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Executes given function in a worker thread
+        :param fn: callable
+        :return: RenamerFuture
+        """
+
+        future = RenamerFuture(getattr(fn, '__name__', str(fn)))
+        with self._lock:
+            was_busy = self.is_busy
+            self._submitted += 1
+            submitted, completed = self._submitted, self._completed
+        if not was_busy:
+            self.busyChanged.emit(True)
+        self.progressChanged.emit(completed, submitted)
+
+        self._thread_pool.start(RenamerRunnable(fn, future, args, kwargs, self._on_command_done))
+
+        return future
+
+    def cancel_jobs(self):
+        """
+        Requests the cancellation of all the server jobs that are being executed by this client
+        Cancellation is sent from a thread of Qt global thread pool: client worker threads are busy waiting for those
+        jobs and caller thread must not wait for the server (it can be the thread that runs the server event loop)
+        :return: RenamerFuture
+        """
+
+        future = RenamerFuture('cancel_job')
+        QThreadPool.globalInstance().start(
+            RenamerRunnable(self._client.cancel_job, future, tuple(), dict(), lambda done_future: None))
+
+        return future
+
+    def wait_for_done(self, timeout=-1):
+        """
+        Blocks until all submitted commands are finished
+        :param timeout: int, maximum number of milliseconds to wait. -1 waits forever
+        :return: bool
+        """
+
+        return self._thread_pool.waitForDone(timeout)
+
+    def _on_command_done(self, future):
+        """
+        Internal callback function that is called from worker threads each time a command is finished
+        :param future: RenamerFuture
+        """
+
+        with self._lock:
+            self._completed += 1
+            submitted, completed = self._submitted, self._completed
+            if completed >= submitted:
+                self._submitted = self._completed = 0
+
+        self.commandFinished.emit(future.name)
+        self.progressChanged.emit(completed, submitted)
+        if completed >= submitted:
+            self.busyChanged.emit(False)
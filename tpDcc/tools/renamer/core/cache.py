@@ -0,0 +1,111 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains query cache used by tpDcc-tools-renamer client to avoid repeating idempotent server queries
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import copy
+import json
+
+
+class QueryCache(object):
+    """
+    Cache of query results keyed by command name and arguments
+    Results of scene queries are invalidated each time scene generation changes. Results of static queries (queries
+    whose result does not depend on the scene) are kept until the cache is fully invalidated
+    """
+
+    def __init__(self, static_queries=None):
+        super(QueryCache, self).__init__()
+
+        self._static_queries = set(static_queries or list())
+        self._entries = dict()
+        self._generation = None
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def generation(self):
+        return self._generation
+
+    @staticmethod
+    def make_key(cmd_name, args=None, kwargs=None):
+        """
+        Returns cache key for the query with given command name and arguments
+        :param cmd_name: str
+        :param args: list or None
+        :param kwargs: dict or None
+        :return: str
+        """
+
+        return json.dumps([cmd_name, list(args or list()), kwargs or dict()], sort_keys=True, default=str)
+
+    def has(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Returns cached result for given key
+        :param key: str
+        :return: tuple(bool, object), whether the result was found and a copy of the result
+        """
+
+        entry = self._entries.get(key, None)
+        if entry is None:
+            self._misses += 1
+            return False, None
+
+        self._hits += 1
+
+        # Callers usually extend or modify returned lists, so we never return cached objects directly
+        return True, copy.deepcopy(entry[1])
+
+    def set(self, key, cmd_name, value):
+        """
+        Stores the result of a query
+        :param key: str
+        :param cmd_name: str
+        :param value: object
+        """
+
+        self._entries[key] = (cmd_name, copy.deepcopy(value))
+
+    def invalidate(self, static=False):
+        """
+        Removes cached results
+        :param static: bool, whether or not static queries results should be removed too
+        """
+
+        if static:
+            self._entries.clear()
+            return
+
+        for key in [key for key, entry in self._entries.items() if entry[0] not in self._static_queries]:
+            self._entries.pop(key)
+
+    def update_generation(self, generation):
+        """
+        Updates the scene generation the cache results belong to. If the generation changed or is unknown, scene
+        queries results are invalidated
+        :param generation: int or None
+        """
+
+        if generation is None or generation != self._generation:
+            self.invalidate()
+        self._generation = generation
+
+    def stats(self):
+        """
+        Returns cache usage statistics
+        :return: dict
+        """
+
+        return {
+            'entries': len(self._entries),
+            'hits': self._hits,
+            'misses': self._misses,
+            'generation': self._generation
+        }
@@ -0,0 +1,51 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains node types classification used by tpDcc-tools-renamer category browser
+"""
+
+from __future__ import print_function, division, absolute_import
+
+# Type ID of the nodes that do not match any category type
+UNCLASSIFIED = -1
+
+
+def classify_nodes(nodes, category_types, node_type_fn, check_type_fn, type_based_check=False):
+    """
+    Returns the index of the first category type matched by each one of the given nodes
+    A node matches a category type if its type is the category type or if given check function says so (for example,
+    because its type inherits from the category type)
+    :param nodes: list(str)
+    :param category_types: list(str)
+    :param node_type_fn: fn, function that returns the type of a node
+    :param check_type_fn: fn, function that receives a node and a category type and returns whether or not the node
+        matches the category type
+    :param type_based_check: bool, whether or not check function result only depends on the node type. If True, each
+        node type is checked once and its result is used for all the nodes of that type. Otherwise, check function can
+        inspect the node (for example, the shapes of a transform), so each node is checked
+    :return: list(int), type ID (category type index or UNCLASSIFIED) of each node
+    """
+
+    category_ids = dict()
+    for i, category_type in enumerate(category_types):
+        category_ids.setdefault(category_type, i)
+
+    type_ids = list()
+    checked_type_ids = dict()
+    for node in nodes:
+        node_type = node_type_fn(node)
+        type_id = category_ids.get(node_type, UNCLASSIFIED)
+        if type_id == UNCLASSIFIED:
+            if type_based_check and node_type in checked_type_ids:
+                type_id = checked_type_ids[node_type]
+            else:
+                for i, category_type in enumerate(category_types):
+                    if check_type_fn(node, category_type):
+                        type_id = i
+                        break
+                if type_based_check:
+                    checked_type_ids[node_type] = type_id
+        type_ids.append(type_id)
+
+    return type_ids
@@ -8,20 +8,142 @@ Module that contains tpDcc-tools-renamer client implementation
 from __future__ import print_function, division, absolute_import
 
 import os
+import time
+import logging
+import threading
+from collections import OrderedDict
 
 from tpDcc.core import client
 from tpDcc.libs.python import python, path as path_utils
 import tpDcc.libs.nameit
 
+from tpDcc.tools.renamer.core import exceptions, connection, protocol, jobs, cache, metrics, engine, conflicts
+
+LOGGER = logging.getLogger('tpDcc-tools-renamer')
+
+
+def batch_command(cmd_name, *args, **kwargs):
+    """
+    Returns a command that can be executed within a RenamerClient batch
+    Renamer server commands receive kwargs as command data and the rest of commands are forwarded to tpDcc. Keyword
+    arguments are only stored in the kwargs key, so they never overwrite the keys of the command
+    :param cmd_name: str, name of the command to execute
+    :return: dict
+    """
+
+    return {'cmd': cmd_name, 'args': list(args), 'kwargs': kwargs}
+
 
 class RenamerClient(client.DccClient, object):
 
     PORT = 16231
 
+    # Renamer server handles one connection at a time, so by default we keep a single persistent connection
+    CONNECTION_POOL_SIZE = 1
+    CONNECTION_TIMEOUT = 20
+
+    # Commands that can carry large lists of nodes and that are sent using compact wire format when available
+    COMPACT_COMMANDS = [
+        'batch', 'apply_rename_plan', 'find_auto_solved_data', 'search_and_replace', 'simple_rename',
+        'find_unique_names', 'preview_rename', 'analyze_rename_plan', 'collect_rename_targets', 'classify_node_types']
+
+    # Number of seconds between job progress requests
+    JOB_POLL_INTERVAL = 0.1
+
+    # Queries whose result does not depend on current scene
+    STATIC_QUERIES = ['dcc_to_tpdcc_str_types', 'dcc_to_tpdcc_types']
+
+    # Idempotent queries whose result can be cached until the scene changes
+    SCENE_QUERIES = [
+        'default_scene_nodes', 'list_nodes', 'all_scene_nodes', 'node_type', 'node_short_name', 'check_object_type',
+        'list_children']
+
+    # Commands that never modify the scene, so sending them does not invalidate cached queries
+    READ_ONLY_COMMANDS = STATIC_QUERIES + SCENE_QUERIES + [
+        'wire_capabilities', 'job_progress', 'scene_generation', 'find_unique_name', 'find_unique_names', 'node_handle',
+        'preview_rename', 'analyze_rename_plan', 'collect_rename_targets', 'classify_node_types']
+
+    # Number of seconds during which cached queries are used without asking the server for its scene generation
+    SCENE_GENERATION_CHECK_INTERVAL = 0.5
+
+    def __init__(self, *args, **kwargs):
+        super(RenamerClient, self).__init__(*args, **kwargs)
+
+        self._connection_pool = None
+        self._server_capabilities = None
+        self._active_jobs = set()
+        self._job_progress_callbacks = list()
+        self._query_cache = cache.QueryCache(static_queries=self.STATIC_QUERIES)
+        self._query_cache_lock = threading.Lock()
+        self._query_cache_checked = None
+        self._metrics = metrics.CommandMetrics()
+
+    # =================================================================================================================
+    # PROPERTIES
+    # =================================================================================================================
+
+    @property
+    def connection_pool(self):
+        if self._connection_pool is None:
+            self._connection_pool = connection.RenamerConnectionPool(
+                port=self.PORT, timeout=self.CONNECTION_TIMEOUT, size=self.CONNECTION_POOL_SIZE)
+
+        return self._connection_pool
+
+    @property
+    def server_capabilities(self):
+        if self._server_capabilities is None:
+            # Servers that do not support capabilities negotiation only support JSON format without request IDs
+            self._server_capabilities = {'formats': [protocol.JSON_FORMAT], 'request_ids': False}
+            reply_dict = self._send_command({'cmd': 'wire_capabilities'})
+            if reply_dict and reply_dict.get('success', False):
+                self._server_capabilities.update(reply_dict.get('result', None) or dict())
+
+        return self._server_capabilities
+
+    @property
+    def wire_format(self):
+        if protocol.COMPACT_FORMAT in self.server_capabilities.get('formats', list()):
+            return protocol.COMPACT_FORMAT
+
+        return protocol.JSON_FORMAT
+
     # =================================================================================================================
     # OVERRIDES
     # =================================================================================================================
 
+    def send(self, cmd_dict):
+        """
+        Sends given command to the renamer server and returns its reply
+        Commands with large payloads are sent using compact wire format if server supports it
+        :param cmd_dict: dict
+        :return: dict or None
+        """
+
+        cmd_name = cmd_dict.get('cmd', '')
+        if not self._is_read_only_command(cmd_dict):
+            self._query_cache_checked = None
+
+        use_compact = cmd_name in self.COMPACT_COMMANDS and self.wire_format == protocol.COMPACT_FORMAT
+
+        start_time = time.time()
+        timings = dict()
+        if not use_compact:
+            reply_dict = self._send_command(cmd_dict, timings=timings)
+        else:
+            frame_text = protocol.frame_to_text(protocol.pack(cmd_dict))
+            pack_time = time.time() - start_time
+            reply_dict = self._send_command({'cmd': 'compact', 'frame': frame_text}, timings=timings)
+            timings['serialize'] = timings.get('serialize', 0.0) + pack_time
+            if reply_dict and reply_dict.get('success', False):
+                unpack_start_time = time.time()
+                reply_dict = protocol.unpack(protocol.text_to_frame(reply_dict['result']))
+                timings['deserialize'] = timings.get('deserialize', 0.0) + time.time() - unpack_start_time
+        timings['total'] = time.time() - start_time
+        self._metrics.record(cmd_name, timings)
+
+        return reply_dict
+
     def _get_paths_to_update(self):
         paths_to_update = super(RenamerClient, self)._get_paths_to_update()
 
@@ -30,10 +152,308 @@ class RenamerClient(client.DccClient, object):
 
         return paths_to_update
 
+    # =================================================================================================================
+    # CONNECTION
+    # =================================================================================================================
+
+    def connection_health(self):
+        """
+        Returns basic health information of the persistent connections with the renamer server
+        :return: dict
+        """
+
+        return self.connection_pool.health()
+
+    def close_connections(self):
+        """
+        Closes all persistent connections with the renamer server. They will be reopened if a new command is sent
+        """
+
+        if self._connection_pool is not None:
+            self._connection_pool.close()
+
+        # Server capabilities are negotiated again in next connection, server could be a different one
+        self._server_capabilities = None
+        self.invalidate_query_cache(static=True)
+
+    # =================================================================================================================
+    # CACHE
+    # =================================================================================================================
+
+    def cached_query(self, cmd_name, *args, **kwargs):
+        """
+        Executes given idempotent query and caches its result until the scene changes
+        Scene generation is checked at most once every SCENE_GENERATION_CHECK_INTERVAL seconds, so repeated UI
+        refreshes do not need any round trip to the server
+        :param cmd_name: str, name of the query (must be one of STATIC_QUERIES or SCENE_QUERIES)
+        :return: object
+        """
+
+        if cmd_name not in self.STATIC_QUERIES and cmd_name not in self.SCENE_QUERIES:
+            return getattr(self, cmd_name)(*args, **kwargs)
+
+        if cmd_name in self.SCENE_QUERIES:
+            self._validate_query_cache()
+
+        key = self._query_cache.make_key(cmd_name, args, kwargs)
+        with self._query_cache_lock:
+            found, result = self._query_cache.get(key)
+        if found:
+            return result
+
+        result = getattr(self, cmd_name)(*args, **kwargs)
+        with self._query_cache_lock:
+            self._query_cache.set(key, cmd_name, result)
+
+        return result
+
+    def prefetch_queries(self, queries):
+        """
+        Executes all given queries whose result is not cached yet using a single batch request, so following
+        cached_query calls for those queries do not need to contact the server
+        :param queries: list(tuple(str, list, dict)), name, arguments and keyword arguments of each query
+        """
+
+        queries = [query for query in queries if query[0] in self.STATIC_QUERIES or query[0] in self.SCENE_QUERIES]
+        if any(query[0] in self.SCENE_QUERIES for query in queries):
+            self._validate_query_cache()
+
+        missing = OrderedDict()
+        with self._query_cache_lock:
+            for query_name, query_args, query_kwargs in queries:
+                key = self._query_cache.make_key(query_name, query_args, query_kwargs)
+                if key not in missing and not self._query_cache.has(key):
+                    missing[key] = (query_name, query_args, query_kwargs)
+        if not missing:
+            return
+
+        # Inside a batch, queries are forwarded to tpDcc functions with their positional and keyword arguments
+        replies = self.batch([
+            batch_command(query_name, *query_args, **query_kwargs) for query_name, query_args, query_kwargs in
+            missing.values()])
+
+        with self._query_cache_lock:
+            for (key, query), reply_dict in zip(missing.items(), replies):
+                if reply_dict and reply_dict.get('success', False):
+                    self._query_cache.set(key, query[0], reply_dict.get('result', None))
+
+    def invalidate_query_cache(self, static=False):
+        """
+        Removes cached query results
+        :param static: bool, whether or not results of static queries should be removed too
+        """
+
+        with self._query_cache_lock:
+            self._query_cache.invalidate(static=static)
+            self._query_cache_checked = None
+
+    def query_cache_stats(self):
+        with self._query_cache_lock:
+            return self._query_cache.stats()
+
+    # =================================================================================================================
+    # METRICS
+    # =================================================================================================================
+
+    def command_metrics(self):
+        """
+        Returns the histograms of timings and payload sizes of all the commands sent by this client
+        :return: dict
+        """
+
+        return self._metrics.to_dict()
+
+    def server_command_metrics(self, reset=False):
+        """
+        Returns the histograms of execution timings of all the commands executed by the renamer server
+        :param reset: bool, whether or not server metrics should be reset after retrieving them
+        :return: dict or None
+        """
+
+        cmd = {
+            'cmd': 'command_metrics',
+            'reset': reset
+        }
+
+        reply_dict = self.send(cmd)
+
+        if not self.is_valid_reply(reply_dict):
+            return None
+
+        return reply_dict['result']
+
+    def dump_command_metrics(self, file_path=None):
+        """
+        Dumps client commands metrics into a JSON file or, if no file is given, into renamer logger
+        :param file_path: str or None
+        """
+
+        self._metrics.dump(file_path=file_path)
+
+    def reset_command_metrics(self):
+        self._metrics.reset()
+
+    # =================================================================================================================
+    # JOBS
+    # =================================================================================================================
+
+    def add_job_progress_callback(self, callback):
+        """
+        Registers a callback that is called with the progress dictionary of any job executed by this client
+        :param callback: callable
+        """
+
+        if callback not in self._job_progress_callbacks:
+            self._job_progress_callbacks.append(callback)
+
+    def remove_job_progress_callback(self, callback):
+        if callback in self._job_progress_callbacks:
+            self._job_progress_callbacks.remove(callback)
+
+    def job_progress(self, job_id):
+        cmd = {
+            'cmd': 'job_progress',
+            'job_id': job_id
+        }
+
+        reply_dict = self.send(cmd)
+
+        if not self.is_valid_reply(reply_dict):
+            return None
+
+        return reply_dict['result']
+
+    def job_result(self, job_id, offset=0):
+        """
+        Returns the results of the job with given ID. If the job is not done yet, results are partial
+        :param job_id: str
+        :param offset: int, number of results to skip (results already retrieved)
+        :return: dict or None, dictionary with the progress of the job and its results
+        """
+
+        cmd = {
+            'cmd': 'job_result',
+            'job_id': job_id,
+            'offset': offset
+        }
+
+        reply_dict = self.send(cmd)
+
+        if not self.is_valid_reply(reply_dict):
+            return None
+
+        return reply_dict['result']
+
+    def list_jobs(self):
+        """
+        Returns the progress of all the jobs queued in the server, including the jobs started by other clients
+        :return: list(dict)
+        """
+
+        cmd = {
+            'cmd': 'list_jobs'
+        }
+
+        reply_dict = self.send(cmd)
+
+        if not self.is_valid_reply(reply_dict):
+            return list()
+
+        return reply_dict['result']
+
+    def submit_job(self, cmd):
+        """
+        Queues given command as a job in the server and returns without waiting for the job to finish
+        :param cmd: dict, command created with batch_command function
+        :return: dict or None, initial progress of the job. Servers that do not support jobs execute the command
+            synchronously and return its reply instead
+        """
+
+        cmd = dict(cmd)
+        cmd['job'] = True
+        reply_dict = self.send(cmd)
+        if not self.is_valid_reply(reply_dict):
+            return None
+
+        progress = reply_dict.get('result', None)
+        if not isinstance(progress, dict) or 'id' not in progress:
+            return {'state': jobs.JobStates.FINISHED if reply_dict['success'] else jobs.JobStates.FAILED,
+                    'reply': reply_dict}
+
+        return progress
+
+    def cancel_job(self, job_id=None):
+        """
+        Requests the cancellation of the job with given ID. Job stops at its next chunk boundary
+        :param job_id: str or None, ID of the job to cancel. If not given, all active jobs are cancelled
+        :return: bool
+        """
+
+        job_ids = [job_id] if job_id else list(self._active_jobs)
+        valid = True
+        for job_to_cancel in job_ids:
+            cmd = {
+                'cmd': 'cancel_job',
+                'job_id': job_to_cancel
+            }
+            reply_dict = self.send(cmd)
+            valid = self.is_valid_reply(reply_dict) and valid
+
+        return valid
+
+    def wait_for_job(self, job_id, progress_callback=None):
+        """
+        Blocks until the job with given ID is done, reporting its progress periodically
+        Server executes job chunks within its event loop, so this function must be called from a worker thread (for
+        example, through AsyncRenamerClient) and never from the thread that runs the server event loop
+        :param job_id: str
+        :param progress_callback: callable or None, function called with the progress dictionary of the job
+        :return: dict, last progress of the job
+        """
+
+        progress = dict()
+        while True:
+            new_progress = self.job_progress(job_id)
+            if not new_progress:
+                break
+            progress = new_progress
+            for callback in self._job_progress_callbacks + ([progress_callback] if progress_callback else list()):
+                callback(progress)
+            if progress.get('state', None) in jobs.JobStates.DONE_STATES:
+                break
+            time.sleep(self.JOB_POLL_INTERVAL)
+
+        return progress
+
     # =================================================================================================================
     # BASE
     # =================================================================================================================
 
+    def batch(self, commands, stop_on_error=False):
+        """
+        Executes given list of commands in the server in a single round-trip
+        :param commands: list(dict), ordered list of commands. Use batch_command function to create them
+        :param stop_on_error: bool, whether to skip remaining commands once a command fails
+        :return: list(dict), list of replies (one per command) with its own success, msg and result keys
+        """
+
+        commands = python.force_list(commands)
+        if not commands:
+            return list()
+
+        cmd = {
+            'cmd': 'batch',
+            'commands': commands,
+            'stop_on_error': stop_on_error
+        }
+
+        reply_dict = self.send(cmd)
+
+        if not self.is_valid_reply(reply_dict):
+            return list()
+
+        return reply_dict['result']
+
     def simple_rename(self, new_name, nodes=None, rename_shape=True):
         cmd = {
             'cmd': 'simple_rename',
@@ -49,6 +469,163 @@ class RenamerClient(client.DccClient, object):
 
         return reply_dict['success']
 
+    def apply_rename_plan(self, plan, as_job=False, check_conflicts=False):
+        """
+        Applies given rename plan in the server in a single pass and undo chunk
+        :param plan: list(tuple(str, str, bool)), list of (node UUID, new short name, rename_shape) entries
+        :param as_job: bool, whether or not the plan is applied by a server job in chunks. Each chunk is a different
+            undo entry. If the job is cancelled, only the result of the applied chunks is returned
+        :param check_conflicts: bool, whether or not plan is analyzed before applying it
+        :return: dict, dictionary containing the number of renamed nodes and the nodes that failed to be renamed
+        :raises RenameConflictError: if check_conflicts is True and plan has conflicts
+        """
+
+        if check_conflicts:
+            report = self.analyze_rename_plan(plan)
+            if report is None:
+                return False
+            if report.has_errors:
+                raise exceptions.RenameConflictError(report)
+
+        cmd = {
+            'cmd': 'apply_rename_plan',
+            'plan': [list(plan_entry) for plan_entry in plan or list()]
+        }
+
+        if not as_job:
+            reply_dict = self.send(cmd)
+        else:
+            progress = self._execute_job(cmd)
+            if 'id' in progress:
+                job_result = self.job_result(progress['id'])
+                if not job_result:
+                    return False
+                rename_result = {'renamed': 0, 'failed': OrderedDict()}
+                for chunk_result in job_result['results']:
+                    rename_result['renamed'] += chunk_result.get('renamed', 0)
+                    rename_result['failed'].update(chunk_result.get('failed', dict()))
+                return rename_result
+            reply_dict = progress.get('reply', None)
+
+        if not self.is_valid_reply(reply_dict):
+            return False
+
+        return reply_dict['result']
+
+    def collect_rename_targets(self, hierarchy_check=False, only_selection=True, filter_type=None, depth_sort=True):
+        """
+        Returns the full paths of the nodes to rename, without duplicates. Hierarchies are expanded by the server, so
+        a single request is sent
+        :param hierarchy_check: bool, whether or not the descendants of the nodes are also returned
+        :param only_selection: bool, whether or not only selected nodes are returned. Otherwise, all scene nodes are
+        :param filter_type: str or None, type of the nodes to return
+        :param depth_sort: bool, whether or not nodes are sorted from the deepest to the shallowest one, as needed to
+            rename nodes by full path. Otherwise, selection and hierarchy order is kept
+        :return: list(str) or None
+        """
+
+        cmd = {
+            'cmd': 'collect_rename_targets',
+            'hierarchy_check': hierarchy_check,
+            'only_selection': only_selection,
+            'filter_type': filter_type,
+            'depth_sort': depth_sort
+        }
+
+        reply_dict = self.send(cmd)
+
+        if not self.is_valid_reply(reply_dict):
+            return None
+
+        return reply_dict['result']
+
+    def classify_node_types(self, nodes, node_types):
+        """
+        Returns the category type matched by each one of the given nodes. All nodes are classified in a single request
+        :param nodes: list(str)
+        :param node_types: list(str), category types. Nodes whose type inherits from a category type match it
+        :return: list(int) or None, index of the first category type matched by each node or -1 if the node does not
+            match any category type
+        """
+
+        cmd = {
+            'cmd': 'classify_node_types',
+            'nodes': python.force_list(nodes),
+            'node_types': python.force_list(node_types)
+        }
+
+        reply_dict = self.send(cmd)
+
+        if not self.is_valid_reply(reply_dict):
+            return None
+
+        return reply_dict['result']
+
+    def analyze_rename_plan(self, plan):
+        """
+        Returns the conflicts of given rename plan without applying it: names repeated in the plan, names used by other
+        nodes, invalid names, missing nodes and entries that do not change the node name
+        :param plan: list(tuple(str, str, bool)), list of (node UUID, new short name, rename_shape) entries
+        :return: ConflictReport or None
+        """
+
+        cmd = {
+            'cmd': 'analyze_rename_plan',
+            'plan': [list(plan_entry) for plan_entry in plan or list()]
+        }
+
+        reply_dict = self.send(cmd)
+
+        if not self.is_valid_reply(reply_dict):
+            return None
+
+        return conflicts.ConflictReport.from_dict(reply_dict['result'])
+
+    def find_unique_names(self, names):
+        """
+        Returns a unique name for each one of the given names. Server checks all of them against a single snapshot of
+        the scene names, and returned names do not collide between them
+        :param names: list(str)
+        :return: list(str) or None
+        """
+
+        cmd = {
+            'cmd': 'find_unique_names',
+            'names': list(names)
+        }
+
+        reply_dict = self.send(cmd)
+
+        if not self.is_valid_reply(reply_dict):
+            return None
+
+        return reply_dict['result']
+
+    def preview_rename(self, pipeline, hierarchy_check=False, only_selection=True, filter_type=None):
+        """
+        Returns the names the server would give to the filtered nodes without renaming them
+        :param pipeline: RenamePipeline, RenameSpec or dict, rename settings used to generate the new names
+        :param hierarchy_check: bool
+        :param only_selection: bool
+        :param filter_type: str or None
+        :return: list(tuple(str, str, str, bool)) or None, list of (node UUID, old name, new name, collision) entries
+        """
+
+        cmd = {
+            'cmd': 'preview_rename',
+            'pipeline': pipeline if isinstance(pipeline, dict) else engine.compile_spec(pipeline).to_dict(),
+            'hierarchy_check': hierarchy_check,
+            'only_selection': only_selection,
+            'filter_type': filter_type
+        }
+
+        reply_dict = self.send(cmd)
+
+        if not self.is_valid_reply(reply_dict):
+            return None
+
+        return [tuple(preview_entry) for preview_entry in reply_dict['result']]
+
     def find_auto_solved_data(self, auto_suffixes, tokens_dict, last_joint_end=True, nodes=None):
         cmd = {
             'cmd': 'find_auto_solved_data',
@@ -234,7 +811,8 @@ class RenamerClient(client.DccClient, object):
         return reply_dict['success']
 
     def add_replace_namespace(
-            self, namespace, rename_shape=True, hierarchy_check=False, only_selection=True, filter_type=None):
+            self, namespace, rename_shape=True, hierarchy_check=False, only_selection=True, filter_type=None,
+            as_job=False):
         cmd = {
             'cmd': 'add_replace_namespace',
             'namespace': namespace,
@@ -244,6 +822,9 @@ class RenamerClient(client.DccClient, object):
             'filter_type': filter_type
         }
 
+        if as_job:
+            return self._run_job(cmd)
+
         reply_dict = self.send(cmd)
 
         if not self.is_valid_reply(reply_dict):
@@ -269,12 +850,27 @@ class RenamerClient(client.DccClient, object):
 
         return reply_dict['success']
 
-    def search_and_replace(self, search_str, replace_str, nodes=None):
+    def search_and_replace(
+            self, search_str, replace_str, nodes=None, regex=False, ignore_case=False, whole_word=False):
+        """
+        Replaces the given text in the names of the given nodes. All nodes are renamed by the server in a single pass
+        :param search_str: str, text or regular expression to search
+        :param replace_str: str, replacement text. In regex mode, it can reference capture groups
+        :param nodes: list(str) or None, nodes to rename. If not given, selected nodes are renamed
+        :param regex: bool, whether or not search text is a regular expression
+        :param ignore_case: bool
+        :param whole_word: bool, whether or not only whole name tokens (separated by underscores) are replaced
+        :return: dict or bool, number of nodes, matched, changed and skipped nodes. False if the operation failed
+        """
+
         cmd = {
             'cmd': 'search_and_replace',
             'search': search_str,
             'replace': replace_str,
-            'nodes': python.force_list(nodes)
+            'nodes': python.force_list(nodes),
+            'regex': regex,
+            'ignore_case': ignore_case,
+            'whole_word': whole_word
         }
 
         reply_dict = self.send(cmd)
@@ -282,10 +878,11 @@ class RenamerClient(client.DccClient, object):
         if not self.is_valid_reply(reply_dict):
             return False
 
-        return reply_dict['success']
+        return reply_dict.get('result', None) or reply_dict['success']
 
     def automatic_suffix(
-            self, rename_shape=True, hierarchy_check=False, only_selection=True, filter_type=None):
+            self, rename_shape=True, hierarchy_check=False, only_selection=True, filter_type=None,
+            as_job=False):
         cmd = {
             'cmd': 'automatic_suffix',
             'rename_shape': rename_shape,
@@ -294,6 +891,9 @@ class RenamerClient(client.DccClient, object):
             'filter_type': filter_type
         }
 
+        if as_job:
+            return self._run_job(cmd)
+
         reply_dict = self.send(cmd)
 
         if not self.is_valid_reply(reply_dict):
@@ -302,7 +902,8 @@ class RenamerClient(client.DccClient, object):
         return reply_dict['success']
 
     def make_unique_name(
-            self, rename_shape=True, hierarchy_check=False, only_selection=True, filter_type=None):
+            self, rename_shape=True, hierarchy_check=False, only_selection=True, filter_type=None,
+            as_job=False):
         cmd = {
             'cmd': 'make_unique_name',
             'rename_shape': rename_shape,
@@ -311,6 +912,9 @@ class RenamerClient(client.DccClient, object):
             'filter_type': filter_type
         }
 
+        if as_job:
+            return self._run_job(cmd)
+
         reply_dict = self.send(cmd)
 
         if not self.is_valid_reply(reply_dict):
@@ -319,7 +923,8 @@ class RenamerClient(client.DccClient, object):
         return reply_dict['success']
 
     def remove_all_numbers(
-            self, rename_shape=True, hierarchy_check=False, only_selection=True, filter_type=None):
+            self, rename_shape=True, hierarchy_check=False, only_selection=True, filter_type=None,
+            as_job=False):
         cmd = {
             'cmd': 'remove_all_numbers',
             'rename_shape': rename_shape,
@@ -328,6 +933,9 @@ class RenamerClient(client.DccClient, object):
             'filter_type': filter_type
         }
 
+        if as_job:
+            return self._run_job(cmd)
+
         reply_dict = self.send(cmd)
 
         if not self.is_valid_reply(reply_dict):
@@ -399,3 +1007,96 @@ class RenamerClient(client.DccClient, object):
             return False
 
         return reply_dict['success']
+
+    # =================================================================================================================
+    # INTERNAL
+    # =================================================================================================================
+
+    def _send_command(self, cmd_dict, timings=None):
+        """
+        Internal function that sends given command to the renamer server through a persistent connection
+        If persistent connection cannot be established, default tpDcc client connection is used
+        :param cmd_dict: dict
+        :param timings: dict or None, dictionary filled with the timings and sizes of the request
+        :return: dict or None
+        """
+
+        try:
+            return self.connection_pool.request(cmd_dict, timings=timings)
+        except exceptions.RenamerConnectionError as exc:
+            if exc.delivered:
+                LOGGER.warning('Renamer server command "{}" failed: {}'.format(cmd_dict.get('cmd', ''), exc))
+                return None
+            LOGGER.debug('Renamer persistent connection not available, using default connection | {}'.format(exc))
+
+        return super(RenamerClient, self).send(cmd_dict)
+
+    def _is_read_only_command(self, cmd_dict):
+        """
+        Internal function that returns whether or not given command never modifies the scene
+        Batches are read only if all their commands are
+        :param cmd_dict: dict
+        :return: bool
+        """
+
+        cmd_name = cmd_dict.get('cmd', '')
+        if cmd_name == 'batch':
+            return all(
+                command.get('cmd', '') in self.READ_ONLY_COMMANDS for command in cmd_dict.get('commands', list()))
+
+        return cmd_name in self.READ_ONLY_COMMANDS
+
+    def _validate_query_cache(self):
+        """
+        Internal function that invalidates cached scene queries if server scene generation changed
+        Servers that cannot track scene changes report no generation, so their cached scene queries only live
+        during SCENE_GENERATION_CHECK_INTERVAL seconds
+        """
+
+        checked = self._query_cache_checked
+        if checked is not None and time.time() - checked < self.SCENE_GENERATION_CHECK_INTERVAL:
+            return
+
+        generation = None
+        reply_dict = self.send({'cmd': 'scene_generation'})
+        if reply_dict and reply_dict.get('success', False):
+            result = reply_dict.get('result', None) or dict()
+            if result.get('tracked', False):
+                generation = result.get('generation', None)
+
+        with self._query_cache_lock:
+            self._query_cache.update_generation(generation)
+            self._query_cache_checked = time.time()
+
+    def _run_job(self, cmd):
+        """
+        Internal function that executes given command as a job in the server and waits until the job is done
+        :param cmd: dict
+        :return: bool, True if the job was finished successfully; False otherwise
+        """
+
+        progress = self._execute_job(cmd)
+
+        return progress.get('state', None) == jobs.JobStates.FINISHED
+
+    def _execute_job(self, cmd):
+        """
+        Internal function that queues given command as a job in the server and waits until the job is done
+        :param cmd: dict
+        :return: dict, last progress of the job
+        """
+
+        progress = self.submit_job(cmd)
+        if not progress:
+            return {'state': jobs.JobStates.FAILED}
+
+        # Servers that do not support jobs execute the command synchronously
+        if 'id' not in progress:
+            return progress
+
+        job_id = progress['id']
+        self._active_jobs.add(job_id)
+        try:
+            return self.wait_for_job(job_id) or progress
+        finally:
+            self._active_jobs.discard(job_id)
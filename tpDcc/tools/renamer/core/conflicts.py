@@ -0,0 +1,162 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains rename plans conflicts analyzer used by tpDcc-tools-renamer
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import re
+from collections import OrderedDict
+
+# Default pattern that new node names must match: any name that is not empty. DCC servers define their own patterns
+VALID_NAME_PATTERN = r'^.+$'
+
+# Pattern of valid Maya node names: letters, numbers and underscores not starting with a number, optionally preceded
+# by the namespaces that contain the node
+MAYA_NAME_PATTERN = r'^:?(?:[a-zA-Z_][a-zA-Z0-9_]*:)*[a-zA-Z_][a-zA-Z0-9_]*$'
+
+
+class ConflictTypes(object):
+    DUPLICATED = 'duplicated'
+    EXISTING = 'existing'
+    INVALID = 'invalid'
+    MISSING = 'missing'
+    NO_OP = 'no_op'
+
+    # Conflicts that make a rename plan fail or rename nodes with names different from the planned ones
+    ERRORS = [DUPLICATED, EXISTING, INVALID, MISSING]
+
+
+class ConflictReport(object):
+    """
+    Conflicts found in a rename plan, grouped by conflict type and by new name
+    """
+
+    def __init__(self, total=0, conflicts=None):
+        """
+        :param total: int, number of entries of the analyzed plan
+        :param conflicts: dict or None, dictionary with the node IDs of each conflict type grouped by new name
+        """
+
+        super(ConflictReport, self).__init__()
+
+        self._total = total
+        self._conflicts = dict((conflict_type, OrderedDict()) for conflict_type in (
+            ConflictTypes.ERRORS + [ConflictTypes.NO_OP]))
+        for conflict_type, conflict_names in (conflicts or dict()).items():
+            self._conflicts[conflict_type].update(conflict_names)
+
+    def __bool__(self):
+        return self.has_errors
+
+    __nonzero__ = __bool__
+
+    @property
+    def total(self):
+        return self._total
+
+    @property
+    def has_errors(self):
+        return any(self._conflicts[conflict_type] for conflict_type in ConflictTypes.ERRORS)
+
+    @classmethod
+    def from_dict(cls, report_dict):
+        return cls(total=report_dict.get('total', 0), conflicts=report_dict.get('conflicts', dict()))
+
+    def add(self, conflict_type, new_name, node_id):
+        """
+        Adds a conflict to the report
+        :param conflict_type: str, ConflictTypes value
+        :param new_name: str
+        :param node_id: str
+        """
+
+        self._conflicts[conflict_type].setdefault(new_name, list()).append(node_id)
+
+    def conflicts(self, conflict_type):
+        """
+        Returns the conflicts of given type
+        :param conflict_type: str, ConflictTypes value
+        :return: OrderedDict, node IDs grouped by new name
+        """
+
+        return self._conflicts[conflict_type]
+
+    def count(self, conflict_type):
+        """
+        Returns the number of plan entries with given conflict type
+        :param conflict_type: str, ConflictTypes value
+        :return: int
+        """
+
+        return sum(len(node_ids) for node_ids in self._conflicts[conflict_type].values())
+
+    def summary(self):
+        """
+        Returns a short text describing the conflicts of the report
+        :return: str
+        """
+
+        counts = ', '.join('{} {}'.format(self.count(conflict_type), conflict_type) for conflict_type in (
+            ConflictTypes.ERRORS + [ConflictTypes.NO_OP]) if self._conflicts[conflict_type])
+
+        return 'Rename plan with {} entries: {}'.format(self._total, counts or 'no conflicts')
+
+    def to_dict(self):
+        return {
+            'total': self._total,
+            'has_errors': self.has_errors,
+            'conflicts': dict(
+                (conflict_type, [[new_name, node_ids] for new_name, node_ids in conflict_names.items()])
+                for conflict_type, conflict_names in self._conflicts.items())
+        }
+
+
+def analyze_rename_plan(plan, current_names, scene_index, valid_name_pattern=VALID_NAME_PATTERN):
+    """
+    Analyzes given rename plan and returns the conflicts found
+    All entries are checked in a single pass: new names repeated in the plan, new names used by nodes that are not
+    renamed before them, new names that are not valid and entries that do not change the node name
+    Plans are applied in order, so a new name is only free if the node that uses it is renamed by a previous entry.
+    Nodes that swap their names (or rename in a cycle) always collide, because one of them is renamed first
+    :param plan: list(tuple(str, str, bool)), list of (node ID, new short name, rename_shape) entries
+    :param current_names: list(str or None), current short name of each plan node. None if the node does not exist
+    :param scene_index: SceneNameIndex, names of the nodes of the scene
+    :param valid_name_pattern: str or None, pattern that valid names must match
+    :return: ConflictReport
+    """
+
+    report = ConflictReport(total=len(plan))
+    valid_name_regex = re.compile(valid_name_pattern) if valid_name_pattern else None
+    new_names = OrderedDict()
+    freed_names = dict()
+
+    for i, (plan_entry, current_name) in enumerate(zip(plan, current_names)):
+        node_id, new_name = plan_entry[0], plan_entry[1]
+        if current_name is None:
+            report.add(ConflictTypes.MISSING, new_name, node_id)
+            continue
+        if new_name == current_name:
+            report.add(ConflictTypes.NO_OP, new_name, node_id)
+            continue
+        if valid_name_regex and not valid_name_regex.match(new_name or ''):
+            report.add(ConflictTypes.INVALID, new_name, node_id)
+        new_names.setdefault(new_name, list()).append((i, node_id))
+        # Renamed nodes do not use their current name anymore, so nodes renamed after them can use it
+        freed_names.setdefault(current_name, list()).append(i)
+
+    for new_name, name_entries in new_names.items():
+        if len(name_entries) > 1:
+            for _, node_id in name_entries:
+                report.add(ConflictTypes.DUPLICATED, new_name, node_id)
+        name_count = scene_index.count(new_name)
+        if not name_count:
+            continue
+        freed_indices = freed_names.get(new_name, list())
+        for i, node_id in name_entries:
+            if name_count > len([freed_index for freed_index in freed_indices if freed_index < i]):
+                report.add(ConflictTypes.EXISTING, new_name, node_id)
+
+    return report
@@ -0,0 +1,374 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains persistent connections used by tpDcc-tools-renamer client to communicate with renamer server
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import json
+import time
+import select
+import socket
+import logging
+import itertools
+import threading
+from collections import OrderedDict
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from tpDcc.tools.renamer.core import exceptions
+
+LOGGER = logging.getLogger('tpDcc-tools-renamer')
+
+
+class RenamerConnection(object):
+    """
+    Persistent keep-alive socket connection with a renamer server
+    Messages are sent and received with the same format used by tpDcc servers: a fixed size header containing the
+    size of the message followed by the message itself
+    """
+
+    HEADER_SIZE = 10
+
+    # Key used to tag pipelined requests so their replies can be matched
+    REQUEST_ID_KEY = 'request_id'
+
+    # Default maximum number of pipelined requests sent before waiting for replies
+    PIPELINE_DEPTH = 32
+
+    def __init__(self, host='localhost', port=16231, timeout=20):
+        super(RenamerConnection, self).__init__()
+
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._socket = None
+        self._connections_count = 0
+        self._requests_count = 0
+        self._failures_count = 0
+        self._last_used = 0.0
+        self._last_latency = 0.0
+        self._total_latency = 0.0
+        self._request_ids = itertools.count(1)
+
+    @property
+    def is_connected(self):
+        return self._socket is not None
+
+    @property
+    def last_used(self):
+        return self._last_used
+
+    def connect(self):
+        """
+        Opens connection with the server
+        :return: bool
+        """
+
+        self.close()
+
+        try:
+            new_socket = socket.create_connection((self._host, self._port), timeout=self._timeout)
+            # Small commands must not wait for Nagle buffering and connections must be kept alive while idle
+            new_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            new_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        except (socket.error, OSError) as exc:
+            LOGGER.debug('Impossible to connect to renamer server {}:{} | {}'.format(self._host, self._port, exc))
+            return False
+
+        self._socket = new_socket
+        self._connections_count += 1
+
+        return True
+
+    def close(self):
+        """
+        Closes connection with the server
+        """
+
+        if not self._socket:
+            return
+
+        try:
+            self._socket.close()
+        except (socket.error, OSError):
+            pass
+        finally:
+            self._socket = None
+
+    def send_message(self, message):
+        """
+        Sends given message to the server. If the connection was closed by the server, it is reopened before failing
+        :param message: str
+        """
+
+        message_bytes = message.encode()
+        header = '{0:{1}d}'.format(len(message_bytes), self.HEADER_SIZE).encode()
+        data = header + message_bytes
+
+        for _ in range(2):
+            # Servers can close idle connections. Sending a message through them usually succeeds, but its reply is
+            # never received, so closed connections are detected and reopened before sending anything
+            if self.is_connected and self._is_closed_by_server():
+                LOGGER.debug('Renamer connection closed by server, reconnecting ...')
+                self.close()
+            if not self.is_connected and not self.connect():
+                break
+            try:
+                self._socket.sendall(data)
+                return
+            except (socket.error, OSError) as exc:
+                # Nothing reached the server, so it is safe to reconnect and send the message again
+                LOGGER.debug('Renamer connection lost while sending message, reconnecting ... | {}'.format(exc))
+                self.close()
+
+        self._failures_count += 1
+        raise exceptions.RenamerConnectionError(
+            'Impossible to send message to renamer server {}:{}'.format(self._host, self._port))
+
+    def _is_closed_by_server(self):
+        """
+        Internal function that returns whether or not the server closed the connection
+        The socket is checked without blocking: a closed connection is readable and has no data to read
+        :return: bool
+        """
+
+        try:
+            readable, _, _ = select.select([self._socket], [], [], 0)
+            if not readable:
+                return False
+            return not self._socket.recv(1, socket.MSG_PEEK)
+        except (socket.error, OSError, ValueError):
+            return True
+
+    def recv_message(self):
+        """
+        Waits until a full message is received from the server and returns it
+        :return: str
+        """
+
+        try:
+            header = self._recv_bytes(self.HEADER_SIZE)
+            message = self._recv_bytes(int(header.decode()))
+        except (socket.error, OSError, ValueError) as exc:
+            # The reply is lost, so we cannot retry. We close the connection to avoid reading stale data later
+            self.close()
+            self._failures_count += 1
+            raise exceptions.RenamerConnectionError(
+                'Impossible to receive message from renamer server: {}'.format(exc), delivered=True)
+
+        return message.decode()
+
+    def request(self, cmd_dict, timings=None):
+        """
+        Sends given command to the server and returns its reply
+        :param cmd_dict: dict
+        :param timings: dict or None, if given, it is filled with the timings (in seconds) and sizes (in bytes) of the
+            request. Transport time does not include the execution time reported by the server
+        :return: dict
+        """
+
+        start_time = time.time()
+        message = json.dumps(cmd_dict)
+        serialized_time = time.time()
+        self.send_message(message)
+        reply_message = self.recv_message()
+        received_time = time.time()
+        reply_dict = json.loads(reply_message)
+
+        self._last_used = time.time()
+        self._last_latency = self._last_used - start_time
+        self._total_latency += self._last_latency
+        self._requests_count += 1
+
+        if timings is not None:
+            execute_time = ((reply_dict.get('timing', None) if isinstance(reply_dict, dict) else None) or dict()).get(
+                'execute', None)
+            timings.update({
+                'serialize': serialized_time - start_time,
+                'transport': max(0.0, received_time - serialized_time - (execute_time or 0.0)),
+                'execute': execute_time,
+                'deserialize': self._last_used - received_time,
+                'request_bytes': len(message) + self.HEADER_SIZE,
+                'reply_bytes': len(reply_message) + self.HEADER_SIZE
+            })
+
+        return reply_dict
+
+    def pipeline(self, cmd_dicts, depth=PIPELINE_DEPTH):
+        """
+        Sends given commands to the server without waiting for the reply of each one before sending the next one
+        Each request is tagged with an ID. Replies tagged with an ID are matched by it and replies without ID (sent by
+        servers that do not support request IDs) are matched in order, because servers process requests sequentially
+        :param cmd_dicts: list(dict)
+        :param depth: int, maximum number of requests waiting for its reply
+        :return: list(dict), replies in the same order as the given commands
+        """
+
+        start_time = time.time()
+        replies = [None] * len(cmd_dicts)
+        pending = OrderedDict()
+        next_index = 0
+        depth = max(1, depth)
+        while next_index < len(cmd_dicts) or pending:
+            while next_index < len(cmd_dicts) and len(pending) < depth:
+                request_id = next(self._request_ids)
+                cmd_dict = dict(cmd_dicts[next_index])
+                cmd_dict[self.REQUEST_ID_KEY] = request_id
+                try:
+                    self.send_message(json.dumps(cmd_dict))
+                except exceptions.RenamerConnectionError as exc:
+                    # If some requests were already sent, they could be executed, so we cannot resend them
+                    exc.delivered = bool(pending) or next_index > 0
+                    raise
+                pending[request_id] = next_index
+                next_index += 1
+
+            reply_dict = json.loads(self.recv_message())
+            request_id = reply_dict.get(self.REQUEST_ID_KEY, None) if isinstance(reply_dict, dict) else None
+            if request_id in pending:
+                replies[pending.pop(request_id)] = reply_dict
+            else:
+                replies[pending.popitem(last=False)[1]] = reply_dict
+
+        self._last_used = time.time()
+        self._last_latency = self._last_used - start_time
+        self._total_latency += self._last_latency
+        self._requests_count += len(cmd_dicts)
+
+        return replies
+
+    def health(self):
+        """
+        Returns a dictionary with basic health information of the connection
+        :return: dict
+        """
+
+        return {
+            'connected': self.is_connected,
+            'connections': self._connections_count,
+            'reconnections': max(0, self._connections_count - 1),
+            'requests': self._requests_count,
+            'failures': self._failures_count,
+            'last_latency': self._last_latency,
+            'average_latency': self._total_latency / self._requests_count if self._requests_count else 0.0,
+            'idle_time': time.time() - self._last_used if self._last_used else 0.0
+        }
+
+    def _recv_bytes(self, size):
+        """
+        Internal function that reads given number of bytes from the socket
+        :param size: int
+        :return: bytes
+        """
+
+        chunks = list()
+        bytes_remaining = size
+        while bytes_remaining > 0:
+            chunk = self._socket.recv(min(bytes_remaining, 65536))
+            if not chunk:
+                raise socket.error('Connection closed by renamer server')
+            chunks.append(chunk)
+            bytes_remaining -= len(chunk)
+
+        return b''.join(chunks)
+
+
+class RenamerConnectionPool(object):
+    """
+    Small pool of persistent connections with a renamer server that can be shared between threads
+    """
+
+    def __init__(self, host='localhost', port=16231, timeout=20, size=1):
+        super(RenamerConnectionPool, self).__init__()
+
+        self._timeout = timeout
+        self._connections = [RenamerConnection(host=host, port=port, timeout=timeout) for _ in range(max(1, size))]
+        self._available = queue.Queue()
+        for renamer_connection in self._connections:
+            self._available.put(renamer_connection)
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return len(self._connections)
+
+    def acquire(self):
+        """
+        Returns an available connection of the pool. Blocks until a connection is available
+        :return: RenamerConnection
+        """
+
+        try:
+            return self._available.get(timeout=self._timeout)
+        except queue.Empty:
+            raise exceptions.RenamerConnectionError(
+                'No renamer server connection available after {} seconds'.format(self._timeout))
+
+    def release(self, renamer_connection):
+        """
+        Returns given connection to the pool
+        :param renamer_connection: RenamerConnection
+        """
+
+        self._available.put(renamer_connection)
+
+    def request(self, cmd_dict, timings=None):
+        """
+        Sends given command to the server using one of the connections of the pool and returns its reply
+        :param cmd_dict: dict
+        :param timings: dict or None, dictionary filled with the timings and sizes of the request
+        :return: dict
+        """
+
+        renamer_connection = self.acquire()
+        try:
+            return renamer_connection.request(cmd_dict, timings=timings)
+        finally:
+            self.release(renamer_connection)
+
+    def pipeline(self, cmd_dicts, depth=RenamerConnection.PIPELINE_DEPTH):
+        """
+        Sends given commands pipelined using one of the connections of the pool and returns their replies
+        :param cmd_dicts: list(dict)
+        :param depth: int, maximum number of requests waiting for its reply
+        :return: list(dict)
+        """
+
+        renamer_connection = self.acquire()
+        try:
+            return renamer_connection.pipeline(cmd_dicts, depth=depth)
+        finally:
+            self.release(renamer_connection)
+
+    def close(self):
+        """
+        Closes all the connections of the pool
+        """
+
+        with self._lock:
+            for renamer_connection in self._connections:
+                renamer_connection.close()
+
+    def health(self):
+        """
+        Returns a dictionary with basic health information of the pool and all its connections
+        :return: dict
+        """
+
+        connections_health = [renamer_connection.health() for renamer_connection in self._connections]
+
+        return {
+            'size': self.size,
+            'connected': len([health for health in connections_health if health['connected']]),
+            'available': self._available.qsize(),
+            'requests': sum(health['requests'] for health in connections_health),
+            'failures': sum(health['failures'] for health in connections_health),
+            'reconnections': sum(health['reconnections'] for health in connections_health),
+            'connections': connections_health
+        }
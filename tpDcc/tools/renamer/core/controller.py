@@ -8,11 +8,10 @@ Renamer widget controller class implementation
 from __future__ import print_function, division, absolute_import
 
 import logging
-import traceback
 from collections import OrderedDict
 from tpDcc import dcc
-from tpDcc.libs.python import python, strings
-from tpDcc.tools.renamer.core import utils
+from tpDcc.libs.python import python
+from tpDcc.tools.renamer.core import utils, client, asyncclient, engine, sceneindex, nodecache
 
 LOGGER = logging.getLogger('tpDcc-tools-renamer')
 
@@ -24,6 +23,7 @@ class RenamerController(object):
         self._client = client
         self._model = model
         self._naming_lib = naming_lib
+        self._async_client = None
 
     @property
     def naming_lib(self):
@@ -33,6 +33,13 @@ class RenamerController(object):
     def client(self):
         return self._client
 
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            self._async_client = asyncclient.AsyncRenamerClient(client=self._client)
+
+        return self._async_client
+
     @property
     def model(self):
         return self._model
@@ -52,90 +59,89 @@ class RenamerController(object):
     def auto_rename_shapes_check_toggle(self, flag):
         self._model.rename_shape = flag
 
-    def generate_names(self, items, **kwargs):
-        text = kwargs.get('name', '')
-        prefix = kwargs.get('prefix', '')
-        suffix = kwargs.get('suffix', '')
-        padding = kwargs.get('padding', 0)
-        naming_method = kwargs.get('naming_method', 0)
-        upper = kwargs.get('upper', False)
-        side = kwargs.get('side', '')
-        remove_first = kwargs.get('remove_first', 0)
-        remove_last = kwargs.get('remove_last', 0)
-        joint_end = kwargs.get('joint_end', False)
-        search_str = kwargs.get('search', '')
-        replace_str = kwargs.get('replace', '')
-        items = python.force_list(items)
+    def compile_rename_pipeline(self, **kwargs):
+        """
+        Compiles given rename settings into the pipeline used to generate names
+        :return: RenamePipeline
+        """
 
-        duplicated_names = dict()
-        generated_names = list()
+        return engine.RenameSpec.from_settings(**kwargs).compile()
 
-        for item in items:
-            compare_item = item
-            if not text:
-                base_name = None
-                if dcc.client().is_maya():
-                    if hasattr(item, 'object'):
-                        mobj = item.object()
-                        try:
-                            dag_path = maya.api.OpenMaya.MDagPath.getAPathTo(mobj)
-                            base_name = dag_path.partialPathName()
-                            compare_item = base_name
-                        except Exception as exc:
-                            LOGGER.warning('Error while retrieving node path from MObject: {}'.format(exc))
-                            continue
-                if base_name is None:
-                    if hasattr(item, 'obj'):
-                        base_name = item.obj
-                    else:
-                        base_name = dcc.node_short_name(item)
-            else:
-                base_name = text
-                if dcc.client().is_maya():
-                    if hasattr(item, 'object'):
-                        mobj = item.object()
-                        try:
-                            dag_path = maya.api.OpenMaya.MDagPath.getAPathTo(mobj)
-                            compare_item = dag_path.partialPathName()
-                        except Exception as exc:
-                            LOGGER.warning('Error while retrieving node path from MObject: {}'.format(exc))
-                            continue
-
-            if base_name == compare_item and not prefix and not suffix and not side:
-                generate_preview_name = False
-            else:
-                generate_preview_name = True
-            if base_name in duplicated_names:
-                duplicated_names[base_name] += 1
-            else:
-                duplicated_names[base_name] = 0
+    def generate_names(self, items, pipeline=None, node_cache=None, **kwargs):
+        """
+        Generates new names for given items using the given rename settings and stores them as items preview names
+        :param items: list, widget items, Maya MObject handles or node names
+        :param pipeline: RenamePipeline or None, compiled rename settings. If not given, given settings are compiled
+        :param node_cache: NodeCache or None, cache of the nodes of current operation. If not given, a new one is used
+        :return: list(str)
+        """
 
-            if generate_preview_name:
-                if base_name == compare_item and (prefix or suffix or side):
-                    index = None
-                else:
-                    index = duplicated_names[base_name]
-                preview_name = self._find_manual_available_name(
-                    items, base_name, prefix=prefix, side=side, suffix=suffix, index=index, padding=padding,
-                    letters=naming_method, capital=upper, joint_end=joint_end, remove_first=remove_first,
-                    remove_last=remove_last, search_str=search_str, replace_str=replace_str)
-                while preview_name in generated_names:
-                    duplicated_names[base_name] += 1
-                    preview_name = self._find_manual_available_name(
-                        items, base_name, prefix=prefix, side=side, suffix=suffix, index=duplicated_names[base_name],
-                        padding=padding, letters=naming_method, capital=upper, joint_end=joint_end,
-                        remove_first=remove_first, remove_last=remove_last, search_str=search_str,
-                        replace_str=replace_str)
+        rename_pipeline = pipeline or self.compile_rename_pipeline(**kwargs)
+        items = python.force_list(items)
+        is_maya = dcc.client().is_maya()
+        node_cache = node_cache or nodecache.NodeCache(utils.resolve_node)
+
+        valid_items = list()
+        base_names = list()
+        current_names = list()
+        taken_names = set()
+        for item in items:
+            dag_name = None
+            if is_maya and hasattr(item, 'object'):
+                node_record = node_cache.resolve(item)
+                dag_name = node_record.short_name if node_record else None
+            if hasattr(item, 'obj'):
+                taken_names.add(item.obj)
+            elif dag_name is not None:
+                taken_names.add(dag_name)
+            elif python.is_string(item):
+                taken_names.add(item)
+            if is_maya and hasattr(item, 'object') and dag_name is None:
+                continue
+
+            if dag_name is not None:
+                base_name = dag_name
+            elif hasattr(item, 'obj'):
+                base_name = item.obj
+            elif not rename_pipeline.name:
+                base_name = dcc.node_short_name(item)
             else:
-                preview_name = base_name
+                base_name = None
+            valid_items.append(item)
+            base_names.append(base_name)
+            current_names.append(dag_name if dag_name is not None else item if python.is_string(item) else None)
+
+        # Existence checks are done against a single snapshot of the scene names instead of querying the DCC
+        scene_index = sceneindex.SceneNameIndex.from_paths(
+            self._client.cached_query('all_scene_nodes', full_path=True) or list())
+
+        try:
+            generated_names = engine.generate_names(
+                base_names, current_names, rename_pipeline, taken_names=taken_names,
+                name_exists=scene_index.__contains__)
+        except ValueError as exc:
+            LOGGER.warning('Impossible to generate names: {}'.format(exc))
+            return list()
 
+        for item, preview_name in zip(valid_items, generated_names):
             if not python.is_string(item) and hasattr(item, 'preview_name'):
                 item.preview_name = preview_name
 
-            generated_names.append(preview_name)
-
         return generated_names
 
+    def preview_rename(self, pipeline=None, **kwargs):
+        """
+        Returns the diff between current and new names of the nodes to rename, without renaming them
+        :param pipeline: RenamePipeline or None, compiled rename settings. If not given, given settings are compiled
+        :return: list(tuple(str, str, str, bool)) or None, list of (node UUID, old name, new name, collision) entries
+        """
+
+        rename_pipeline = pipeline or self.compile_rename_pipeline(**kwargs)
+
+        return self._client.preview_rename(
+            rename_pipeline, hierarchy_check=self._model.hierarchy_check,
+            only_selection=self._model.selection_type == 0, filter_type=self._model.filter_type or None)
+
     def set_naming_file(self, file_path):
         self._naming_lib.naming_file = file_path
         self.update_rules()
@@ -157,31 +163,48 @@ class RenamerController(object):
     def change_selected_rule(self, active_rule):
         self._model.active_rule = active_rule
 
-    @dcc.undo_decorator()
+    # No undo chunk is opened here because scene changes are applied by the server in a single undo chunk. This allows
+    # to execute auto rename server steps in worker threads through the asynchronous client
     def auto_rename(self, tokens_dict, unique_id=True, last_joint_end=True):
-        active_rule = self._model.active_rule
-        if not active_rule:
-            LOGGER.warning('Impossible to auto rename because no active rule defined.')
+        """
+        Renames the nodes to rename using the active NameIt rule, executing all auto rename steps synchronously
+        :param tokens_dict: dict
+        :param unique_id: bool
+        :param last_joint_end: bool
+        :return: bool
+        """
+
+        settings = self.auto_rename_settings(tokens_dict, unique_id=unique_id, last_joint_end=last_joint_end)
+        if not settings:
             return False
 
-        rule_name = active_rule.name
+        auto_rename_targets = self.collect_auto_rename_targets(settings)
+        if not auto_rename_targets:
+            return False
 
-        hierarchy_check = self._model.hierarchy_check
-        selection_type = self._model.selection_type
-        rename_shape = self._model.rename_shape
+        solved_names = self.solve_auto_rename_names(settings, auto_rename_targets)
 
-        if not self._naming_lib.has_rule(rule_name):
-            return False
+        return self.apply_auto_rename_names(settings, solved_names)
 
-        current_rule = self._naming_lib.active_rule()
+    def auto_rename_settings(self, tokens_dict, unique_id=True, last_joint_end=True):
+        """
+        Returns the settings used by all auto rename steps
+        Must be called from the main thread: settings are read from the model, so the steps executed in worker threads
+        never access the model or the naming library
+        :param tokens_dict: dict
+        :param unique_id: bool
+        :param last_joint_end: bool
+        :return: dict or None
+        """
 
-        self._naming_lib.set_active_rule(rule_name)
+        active_rule = self._model.active_rule
+        if not active_rule:
+            LOGGER.warning('Impossible to auto rename because no active rule defined.')
+            return None
 
-        objs_to_rename = utils.get_objects_to_rename(
-            hierarchy_check=hierarchy_check, selection_type=selection_type, uuid=False) or list()
-        if not objs_to_rename:
-            LOGGER.warning('No objects to rename. Please select at least one object!')
-            return False
+        rule_name = active_rule.name
+        if not self._naming_lib.has_rule(rule_name):
+            return None
 
         auto_suffixes = None
         if self._model.naming_config:
@@ -189,162 +212,176 @@ class RenamerController(object):
             if auto_suffixes_data:
                 auto_suffixes = auto_suffixes_data.get(rule_name, None)
 
+        return {
+            'rule_name': rule_name,
+            'tokens_dict': dict(tokens_dict),
+            'unique_id': unique_id,
+            'last_joint_end': last_joint_end,
+            'hierarchy_check': self._model.hierarchy_check,
+            'selection_type': self._model.selection_type,
+            'rename_shape': self._model.rename_shape,
+            'auto_suffixes': auto_suffixes
+        }
+
+    def collect_auto_rename_targets(self, settings):
+        """
+        Returns the nodes to auto rename and the data needed to solve their names
+        Only sends requests to the server, so it can be executed in a worker thread
+        :param settings: dict, settings returned by auto_rename_settings function
+        :return: list(tuple(str, str, dict or None)) or None, list of (node name, node UUID, auto solved data) entries
+        """
+
+        # Nodes are renamed by UUID, so they keep selection and hierarchy order, used to number them. Each chunk of
+        # nodes is sent to the server as soon as it is retrieved, so requests have a bounded size
+        auto_rename_targets = list()
+        tokens_dict = dict(settings['tokens_dict'])
+        for objs_chunk in utils.iter_objects_to_rename(
+                hierarchy_check=settings['hierarchy_check'], selection_type=settings['selection_type'], uuid=False,
+                depth_sort=False):
+            if settings['auto_suffixes']:
+                auto_data = self._client.find_auto_solved_data(
+                    auto_suffixes=settings['auto_suffixes'], tokens_dict=dict(tokens_dict),
+                    last_joint_end=settings['last_joint_end'], nodes=objs_chunk) or dict()
+                for node_uuid, data in auto_data.items():
+                    auto_rename_targets.append((None, node_uuid, data))
+                # Server only uses node type token for the first solved node
+                tokens_dict.pop('node_type', None)
+            else:
+                # Rename plans are defined by node UUIDs, so we retrieve all of them in a single round-trip per chunk
+                nodes_ids_replies = self._client.batch(
+                    [client.batch_command('node_handle', obj_name) for obj_name in objs_chunk])
+                for obj_name, node_id_reply in zip(objs_chunk, nodes_ids_replies):
+                    if not node_id_reply['success'] or not node_id_reply['result']:
+                        LOGGER.warning('Was not possible to retrieve UUID of node "{}"'.format(obj_name))
+                        continue
+                    auto_rename_targets.append((obj_name, node_id_reply['result'], None))
+
+        if not auto_rename_targets:
+            LOGGER.warning('No objects to rename. Please select at least one object!')
+            return None
+
+        return auto_rename_targets
+
+    def solve_auto_rename_names(self, settings, auto_rename_targets):
+        """
+        Solves the new names of given auto rename targets with the rule of given settings
+        Must be called from the main thread: naming library active rule is changed while names are solved
+        :param settings: dict, settings returned by auto_rename_settings function
+        :param auto_rename_targets: list(tuple(str, str, dict or None)), targets returned by collect_auto_rename_targets
+        :return: OrderedDict(str, str), new name of each node UUID
+        """
+
+        rule_name = settings['rule_name']
+        tokens_dict = settings['tokens_dict']
+
+        current_rule = self._naming_lib.active_rule()
+        self._naming_lib.set_active_rule(rule_name)
+
         solved_names = OrderedDict()
-        if auto_suffixes:
-            auto_data = self._client.find_auto_solved_data(
-                auto_suffixes=auto_suffixes, tokens_dict=tokens_dict, last_joint_end=last_joint_end,
-                nodes=objs_to_rename)
-
-            for i, (node_uuid, data) in enumerate(auto_data.items()):
-                description = data.get('description', '')
-                side = tokens_dict.get('side', None)
-                node_type = data.get('node_type', '')
-                if unique_id:
-                    solved_name = self._naming_lib.solve(description, side=side, node_type=node_type, id=i)
+        try:
+            for i, (obj_name, node_uuid, data) in enumerate(auto_rename_targets):
+                if data is None:
+                    solved_name = self._naming_lib.solve(**tokens_dict)
+                    if not solved_name:
+                        LOGGER.warning(
+                            'Impossible to rename "{}" with rule "{}" | "{}"'.format(obj_name, rule_name, tokens_dict))
+                        continue
                 else:
-                    solved_name = self._naming_lib.solve(description, side=side, node_type=node_type)
-                if not solved_name:
-                    continue
-                solved_name = self._client.find_unique_name(solved_name)
+                    description = data.get('description', '')
+                    side = tokens_dict.get('side', None)
+                    node_type = data.get('node_type', '')
+                    if settings['unique_id']:
+                        solved_name = self._naming_lib.solve(description, side=side, node_type=node_type, id=i)
+                    else:
+                        solved_name = self._naming_lib.solve(description, side=side, node_type=node_type)
+                    if not solved_name:
+                        continue
                 solved_names[node_uuid] = solved_name
+        finally:
+            if current_rule:
+                self._naming_lib.set_active_rule(current_rule.name)
+
+        return solved_names
+
+    def apply_auto_rename_names(self, settings, solved_names):
+        """
+        Renames the nodes with given UUIDs to their solved names
+        Only sends requests to the server, so it can be executed in a worker thread
+        :param settings: dict, settings returned by auto_rename_settings function
+        :param solved_names: OrderedDict(str, str), names returned by solve_auto_rename_names function
+        :return: bool
+        """
+
+        if not solved_names:
+            return False
+
+        solved_names = OrderedDict(solved_names)
+        if settings['auto_suffixes']:
+            # We solve all unique names in a single round-trip against a single snapshot of the scene names
+            unique_names = self._client.find_unique_names(list(solved_names.values())) or list()
+            for node_uuid, unique_name in zip(list(solved_names.keys()), unique_names):
+                if unique_name:
+                    solved_names[node_uuid] = unique_name
 
-        if solved_names:
-            for obj_id, solved_name in solved_names.items():
-                obj_name = self._client.find_node_by_id(unique_id=obj_id, full_path=True)
-                if not obj_name:
-                    LOGGER.warning('Was not possible to find a node from UUID "{}" in current scene'.format(obj_id))
-                    continue
-                self._client.rename_node(obj_name, solved_name, uuid=obj_id, rename_shape=rename_shape)
-        else:
-            for obj_name in objs_to_rename:
-                solve_name = self._naming_lib.solve(**tokens_dict)
-                if not solve_name:
-                    LOGGER.warning(
-                        'Impossible to rename "{}" with rule "{}" | "{}"'.format(obj_name, rule_name, tokens_dict))
-                    continue
-                try:
-                    self._client.rename_node(obj_name, solve_name, rename_shape=rename_shape)
-                except Exception as exc:
-                    LOGGER.error('Impossible to rename "{}" to "{}" | {}'.format(obj_name, solve_name, exc))
-                    continue
-
-        if current_rule:
-            self._naming_lib.set_active_rule(current_rule.name)
+        # Plan is never applied as a job: job chunks are different undo entries, and the whole auto rename must be
+        # undone at once
+        rename_plan = [(obj_id, solved_name, settings['rename_shape']) for obj_id, solved_name in solved_names.items()]
+        plan_result = self._client.apply_rename_plan(rename_plan) or dict()
+        for obj_id, error_msg in plan_result.get('failed', dict()).items():
+            LOGGER.error('Impossible to rename node with UUID "{}" | {}'.format(obj_id, error_msg))
+
+        return bool(plan_result)
 
     @dcc.undo_decorator()
-    def rename(self, **kwargs):
+    def rename(self, pipeline=None, **kwargs):
         hierarchy_check = self._model.hierarchy_check
         selection_type = self._model.selection_type
+        filter_type = self._model.filter_type or None
+
+        # Nodes are collected in the same order as the nodes of rename previews, so names match the previewed ones.
+        # Plan is applied by node UUID, so nodes do not need to be sorted by depth. All nodes are needed at once:
+        # generated names depend on the names of all the renamed nodes, so they cannot be generated per chunk
+        nodes = utils.get_objects_to_rename(
+            hierarchy_check=hierarchy_check, selection_type=selection_type, uuid=True, depth_sort=False,
+            filter_type=filter_type)
 
-        nodes = utils.get_objects_to_rename(hierarchy_check=hierarchy_check, selection_type=selection_type, uuid=True)
-        generated_names = self.generate_names(items=nodes, **kwargs)
+        # Each node is resolved once: names generation and rename plan share the same node records
+        node_cache = nodecache.NodeCache(utils.resolve_node)
+        generated_names = self.generate_names(items=nodes, pipeline=pipeline, node_cache=node_cache, **kwargs)
 
         if not generated_names or len(nodes) != len(generated_names):
             LOGGER.warning('Impossible to rename because was impossible to generate some of the names ...')
             return
 
-        if dcc.is_maya():
-            import maya.api.OpenMaya
-
+        rename_shape = self._model.rename_shape
+        rename_plan = list()
+        plan_items = OrderedDict()
         for item, new_name in zip(nodes, generated_names):
-            if dcc.is_maya():
-                mobj = None
-                if hasattr(item, 'handle'):
-                    mobj = item.handle.object()
-                elif hasattr(item, 'object'):
-                    mobj = item.object()
-                if mobj:
-                    try:
-                        dag_path = maya.api.OpenMaya.MDagPath.getAPathTo(mobj)
-                        full_name = dag_path.fullPathName()
-                    except Exception as exc:
-                        if hasattr(item, 'full_name'):
-                            full_name = item.full_name
-                        else:
-                            LOGGER.warning('Impossible to retrieve Maya node full path: {}'.format(item))
-                            continue
-                else:
-                    full_name = item
-            else:
-                if hasattr(item, 'full_name'):
-                    full_name = item.full_name
-                else:
-                    full_name = item
-
-            try:
-                dcc.rename_node(full_name, new_name)
-                if hasattr(item, 'obj') and hasattr(item, 'preview_name'):
-                    item.obj = item.preview_name
-                    item.preview_name = ''
-            except Exception:
-                LOGGER.error('Impossible to rename: {} to {} | {}'.format(full_name, new_name, traceback.format_exc()))
-
-    def _find_manual_available_name(
-            self, items, name, prefix=None, suffix=None, side='', index=-1, padding=0, letters=False, capital=False,
-            remove_first=0, remove_last=0, search_str=None, replace_str=None, joint_end=False):
-
-        if dcc.is_maya():
-            import maya.api.OpenMaya
-
-        if prefix:
-            if side and side != '':
-                test_name = '{}_{}_{}'.format(prefix, side, name)
-            else:
-                test_name = '{}_{}'.format(prefix, name)
-        else:
-            if side and side != '':
-                test_name = '{}_{}'.format(side, name)
-            else:
-                test_name = name
-
-        if index >= 0:
-            if letters:
-                letter = strings.get_alpha(index, capital)
-                test_name = '{}_{}'.format(test_name, letter)
-            else:
-                test_name = '{}_{}'.format(test_name, str(index).zfill(padding))
-
-        if suffix:
-            test_name = '{}_{}'.format(test_name, suffix)
-
-        if remove_first and remove_first > 0:
-            test_name = test_name[remove_first:]
-
-        if remove_last and remove_last > 0:
-            test_name = test_name[:-remove_last]
+            node_record = node_cache.resolve(item)
+            if not node_record or not node_record.uuid:
+                LOGGER.error('Impossible to rename: {} to {} | Node cannot be resolved'.format(item, new_name))
+                continue
+            rename_plan.append((node_record.uuid, new_name, rename_shape))
+            plan_items[node_record.uuid] = (item, new_name)
+
+        if not rename_plan:
+            return
 
-        if search_str is not None and search_str != '' and replace_str is not None:
-            test_name = test_name.replace(search_str, replace_str)
+        # All nodes are renamed by the server in a single pass and undo chunk
+        plan_result = self._client.apply_rename_plan(rename_plan)
+        if not plan_result:
+            LOGGER.error('Impossible to apply rename plan: {}'.format(rename_plan))
+            return
 
-        item_names = list()
-        for item in items:
-            if hasattr(item, 'obj'):
-                item_names.append(item.obj)
-            else:
-                if dcc.is_maya():
-                    if hasattr(item, 'object'):
-                        mobj = item.object()
-                        try:
-                            dag_path = maya.api.OpenMaya.MDagPath.getAPathTo(mobj)
-                            item_to_add = dag_path.partialPathName()
-                            item_names.append(item_to_add)
-                            continue
-                        except Exception as exc:
-                            LOGGER.warning('Error while retrieving node path from MObject: {}'.format(exc))
-                            continue
-                else:
-                    item_names.append(item)
-
-        # if object exists, try next index
-        if dcc.node_exists(test_name) or test_name in item_names:
-            new_index = int(index) + 1
-            return self._find_manual_available_name(
-                items, name, prefix=prefix, index=new_index, padding=padding,
-                letters=letters, capital=capital, remove_first=remove_first, remove_last=remove_last,
-                joint_end=joint_end, search_str=search_str, replace_str=replace_str
-            )
-
-        return test_name
+        failed = plan_result.get('failed', dict())
+        for node_id, (item, new_name) in plan_items.items():
+            if node_id in failed:
+                LOGGER.error('Impossible to rename: {} | {}'.format(item, failed[node_id]))
+                continue
+            node_cache.rename(node_id, new_name)
+            if hasattr(item, 'obj') and hasattr(item, 'preview_name'):
+                item.obj = item.preview_name
+                item.preview_name = ''
 
     def add_plugin_widget(self, plugin_class, parent, close_button_visible=True, data=None):
         plugin_widget = plugin_class.create(parent)
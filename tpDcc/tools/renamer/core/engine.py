@@ -0,0 +1,615 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tpDcc-tools-renamer name generation engine
+Engine works with plain lists of names, so it does not depend on Qt or on any DCC and can be used headless
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import re
+import sys
+import logging
+import multiprocessing
+
+from tpDcc.tools.renamer.core import pipeline
+
+LOGGER = logging.getLogger('tpDcc-tools-renamer')
+
+# Number of nodes from which names are generated by a process pool when parallel generation is not forced
+PARALLEL_THRESHOLD = 100000
+
+# Number of names generated by each process pool task
+PARALLEL_CHUNK_SIZE = 20000
+
+# Executables of the interpreters that can launch the process pool used to generate names
+STANDALONE_INTERPRETER_REGEX = re.compile(r'^(python|pythonw|mayapy)(\d+(\.\d+)*)?$')
+
+# Maximum number of taken indices checked while searching an available name. Settings such as remove_last can make
+# several consecutive indices generate the same name, so the search cannot stop at the first repeated name
+MAX_INDEX_SEARCH = 1000000
+
+
+class RenameSpec(object):
+    """
+    Settings used to generate new names
+    """
+
+    SETTINGS_KEYS = {
+        'name': 'name',
+        'prefix': 'prefix',
+        'suffix': 'suffix',
+        'side': 'side',
+        'padding': 'padding',
+        'naming_method': 'letters',
+        'upper': 'capital',
+        'remove_first': 'remove_first',
+        'remove_last': 'remove_last',
+        'search': 'search',
+        'replace': 'replace',
+        'regex': 'regex',
+        'ignore_case': 'ignore_case',
+        'whole_word': 'whole_word',
+        'joint_end': 'joint_end'
+    }
+
+    def __init__(
+            self, name='', prefix='', suffix='', side='', padding=0, letters=False, capital=False, remove_first=0,
+            remove_last=0, search='', replace='', regex=False, ignore_case=False, whole_word=False, joint_end=False):
+        super(RenameSpec, self).__init__()
+
+        self.name = name or ''
+        self.prefix = prefix or ''
+        self.suffix = suffix or ''
+        self.side = side or ''
+        self.padding = padding or 0
+        self.letters = bool(letters)
+        self.capital = bool(capital)
+        self.remove_first = remove_first or 0
+        self.remove_last = remove_last or 0
+        self.search = search or ''
+        self.replace = replace
+        self.regex = bool(regex)
+        self.ignore_case = bool(ignore_case)
+        self.whole_word = bool(whole_word)
+        self.joint_end = bool(joint_end)
+
+    def __eq__(self, other):
+        return isinstance(other, RenameSpec) and self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    @property
+    def has_affixes(self):
+        return bool(self.prefix or self.suffix or self.side)
+
+    @classmethod
+    def from_settings(cls, **kwargs):
+        """
+        Creates a new spec from the rename settings used by renamer tools widgets
+        :return: RenameSpec
+        """
+
+        return cls(**dict(
+            (spec_key, kwargs[settings_key]) for settings_key, spec_key in cls.SETTINGS_KEYS.items()
+            if settings_key in kwargs))
+
+    @classmethod
+    def from_dict(cls, spec_dict):
+        return cls(**spec_dict)
+
+    def to_dict(self):
+        return dict((spec_key, getattr(self, spec_key)) for spec_key in self.SETTINGS_KEYS.values())
+
+    def compile(self):
+        """
+        Compiles the spec into the pipeline of string transforms used to generate names
+        :return: RenamePipeline
+        """
+
+        return pipeline.RenamePipeline.from_spec(self)
+
+
+def compile_spec(spec):
+    """
+    Returns the rename pipeline compiled from given spec
+    :param spec: RenameSpec or RenamePipeline. If a pipeline is given, it is returned as it is
+    :return: RenamePipeline
+    """
+
+    return spec if isinstance(spec, pipeline.RenamePipeline) else spec.compile()
+
+
+def format_name(base_name, spec, index=None, affixes=True):
+    """
+    Returns the name generated from given base name following given spec
+    :param base_name: str
+    :param spec: RenameSpec or RenamePipeline
+    :param index: int or None, index added to the name. If None or negative, no index is added
+    :param affixes: bool, whether or not side and suffix are added to the name
+    :return: str
+    """
+
+    return compile_spec(spec).format(base_name, index=index, affixes=affixes)
+
+
+class NameResolver(object):
+    """
+    Finds available names for a rename operation
+    Names that are taken before the operation starts (by the nodes being renamed or by other nodes of the scene) are
+    checked only once. For each base name, the resolver remembers which ranges of indices are taken, so finding the
+    next free index does not check again the same names and resolving all the names of the operation is linear
+    """
+
+    def __init__(self, spec, taken_names=None, name_exists=None, free_names=None):
+        """
+        :param spec: RenameSpec or RenamePipeline
+        :param taken_names: set(str) or None, names that cannot be used
+        :param name_exists: callable or None, function that returns whether or not a name already exists in the scene
+        :param free_names: dict or None, checked names. Can be shared by resolvers that use the same taken names
+        """
+
+        super(NameResolver, self).__init__()
+
+        self._pipeline = compile_spec(spec)
+        self._taken_names = set(taken_names or list())
+        self._name_exists = name_exists
+        self._free_names = free_names if free_names is not None else dict()
+        self._index_jumps = dict()
+
+    def is_free(self, name):
+        """
+        Returns whether or not given name was free before the rename operation started
+        :param name: str
+        :return: bool
+        """
+
+        is_free = self._free_names.get(name, None)
+        if is_free is None:
+            is_free = self._free_names[name] = name not in self._taken_names and not (
+                self._name_exists and self._name_exists(name))
+
+        return is_free
+
+    def find_available_name(self, base_name, index=None):
+        """
+        Returns the first name generated from given base name that is not taken
+        If the name is taken, the index is increased until a free name is found. Names generated after the first try
+        do not include side or suffix, as renamer always did
+        :param base_name: str
+        :param index: int or None
+        :return: str
+        :raises ValueError: if no available name can be generated
+        """
+
+        new_name = self._pipeline.format(base_name, index=index)
+        if self.is_free(new_name):
+            return new_name
+
+        next_index = (index if index is not None else -1) + 1
+
+        return self._pipeline.format(base_name, index=self._next_free_index(base_name, next_index), affixes=False)
+
+    def _next_free_index(self, base_name, index):
+        """
+        Internal function that returns the first index, starting from the given one, whose name (without side and
+        suffix) is free. Ranges of taken indices are stored, so they are skipped in following calls
+        :param base_name: str
+        :param index: int
+        :return: int
+        :raises ValueError: if no free index is found after checking MAX_INDEX_SEARCH indices
+        """
+
+        index_jumps = self._index_jumps.setdefault(base_name, dict())
+        visited_indices = list()
+        while True:
+            if len(visited_indices) >= MAX_INDEX_SEARCH:
+                raise ValueError('Impossible to find an available name for "{}"'.format(base_name))
+            if index in index_jumps:
+                visited_indices.append(index)
+                index = index_jumps[index]
+                continue
+            new_name = self._pipeline.format(base_name, index=index, affixes=False)
+            if self.is_free(new_name):
+                break
+            visited_indices.append(index)
+            index += 1
+
+        # All visited indices are taken, so next searches starting from them can jump directly to the free one
+        for visited_index in visited_indices:
+            index_jumps[visited_index] = index
+
+        return index
+
+
+def generate_names(
+        base_names, current_names, spec, taken_names=None, name_exists=None, parallel=None, processes=None):
+    """
+    Generates new names for a list of nodes
+    :param base_names: list(str), names used as base to generate the new names. If spec defines a name, it is used
+        instead of these names
+    :param current_names: list(str or None), current names of the nodes. Nodes keep their name if their base name
+        is their current name and spec does not define prefix, suffix or side
+    :param spec: RenameSpec or RenamePipeline, spec is compiled only once for all the names
+    :param taken_names: set(str) or None, names that cannot be used (usually the current names of the nodes)
+    :param name_exists: callable or None, function that returns whether or not a name already exists in the scene
+    :param parallel: bool or None, whether or not names are generated by a process pool. If None, a process pool is
+        used if the number of names is greater than PARALLEL_THRESHOLD
+    :param processes: int or None, number of processes of the pool. If None, the number of CPUs is used
+    :return: list(str), new names in the same order as given base names
+    """
+
+    rename_pipeline = compile_spec(spec)
+    resolver = NameResolver(rename_pipeline, taken_names=taken_names, name_exists=name_exists)
+
+    if parallel is None:
+        parallel = len(base_names) > PARALLEL_THRESHOLD and multiprocessing.cpu_count() > 1
+    if parallel and _process_pool_available():
+        # Processes only generate the names requested by the nodes. Available names are resolved in this process, in
+        # nodes order, so result does not depend on how names are split between processes
+        layout = NameLayout(base_names, current_names, name=rename_pipeline.name)
+        formatted_names = _format_names_parallel(rename_pipeline, layout, processes=processes)
+        if formatted_names is not None:
+            requested_names = layout.requested_names(formatted_names, rename_pipeline.has_affixes)
+            return _merge_names(
+                resolver, rename_pipeline, layout, base_names, current_names, requested_names)[0]
+
+    return _resolve_names(resolver, rename_pipeline, base_names, current_names)
+
+
+def preview_names(base_names, current_names, spec, taken_names=None, name_exists=None):
+    """
+    Generates new names for a list of nodes without renaming them and flags the names that collide
+    A name collides when the name generated by the spec is already taken, so an available one is used instead
+    :param base_names: list(str)
+    :param current_names: list(str or None)
+    :param spec: RenameSpec or RenamePipeline
+    :param taken_names: set(str) or None, names that cannot be used (usually the current names of the nodes)
+    :param name_exists: callable or None, function that returns whether or not a name already exists in the scene
+    :return: list(tuple(str, bool)), (new name, collision) tuples in the same order as given base names
+    """
+
+    name_preview = IncrementalPreview(base_names, current_names, taken_names=taken_names, name_exists=name_exists)
+
+    return name_preview.preview_names(spec)
+
+
+class NameLayout(object):
+    """
+    Groups the nodes of a rename operation by the base name used to generate their new names and stores the index that
+    each node requests to the rename pipeline
+    """
+
+    def __init__(self, base_names, current_names, name=''):
+        """
+        :param base_names: list(str)
+        :param current_names: list(str or None)
+        :param name: str, name used instead of nodes base names
+        """
+
+        super(NameLayout, self).__init__()
+
+        self.name = name
+        self.group_names = [name or base_name for base_name in base_names]
+        self.keep_names = [group_name == current_name for group_name, current_name in zip(
+            self.group_names, current_names)]
+        self.indices = list()
+        self._groups = None
+        self._node_groups = None
+
+        # Each node requests the index of its position inside its group
+        group_counts = dict()
+        for group_name, keep_name in zip(self.group_names, self.keep_names):
+            index = group_counts.get(group_name, 0)
+            group_counts[group_name] = index + 1
+            self.indices.append(None if keep_name else index)
+
+    @property
+    def groups(self):
+        """
+        Returns the indices of the nodes of each group
+        :return: list(list(int))
+        """
+
+        if self._groups is None:
+            self._update_groups()
+
+        return self._groups
+
+    @property
+    def node_groups(self):
+        """
+        Returns the group of each node
+        :return: list(int)
+        """
+
+        if self._node_groups is None:
+            self._update_groups()
+
+        return self._node_groups
+
+    def requested_names(self, formatted_names, has_affixes):
+        """
+        Returns the names requested by the nodes, before checking if they are available
+        :param formatted_names: list(str), names generated by the pipeline using the index requested by each node
+        :param has_affixes: bool, whether or not pipeline adds prefix, side or suffix to names
+        :return: list(str)
+        """
+
+        if has_affixes:
+            return formatted_names
+
+        # Nodes that keep their names do not use the names generated by the pipeline
+        return [
+            group_name if keep_name else name for name, group_name, keep_name in zip(
+                formatted_names, self.group_names, self.keep_names)]
+
+    def _update_groups(self):
+        """
+        Internal function that groups nodes by their base name. Groups are only needed when names collide, so they are
+        not created until they are used
+        """
+
+        group_ids = dict()
+        self._groups = list()
+        self._node_groups = list()
+        for i, group_name in enumerate(self.group_names):
+            group_index = group_ids.get(group_name, None)
+            if group_index is None:
+                group_index = group_ids[group_name] = len(self._groups)
+                self._groups.append(list())
+            self._groups[group_index].append(i)
+            self._node_groups.append(group_index)
+
+
+class IncrementalPreview(object):
+    """
+    Generates the names of the same list of nodes each time the rename settings change
+    The names generated by each pipeline stage are stored per node, so when a setting changes only the changed stage
+    and the following ones are executed again. Collisions are only resolved again for the base names whose generated
+    names changed or that collided in the previous generation
+    """
+
+    def __init__(self, base_names, current_names, taken_names=None, name_exists=None):
+        """
+        :param base_names: list(str)
+        :param current_names: list(str or None)
+        :param taken_names: set(str) or None, names that cannot be used (usually the current names of the nodes)
+        :param name_exists: callable or None, function that returns whether or not a name already exists in the scene
+        """
+
+        super(IncrementalPreview, self).__init__()
+
+        self._base_names = list(base_names)
+        self._current_names = list(current_names)
+        self._taken_names = set(taken_names or list())
+        self._name_exists = name_exists
+        self._free_names = dict()
+        self._layout = None
+        self._stage_keys = list()
+        self._stage_names = list()
+        self._requested_names = None
+        self._collided_groups = set()
+        self._has_affixes = None
+
+    @property
+    def base_names(self):
+        return self._base_names
+
+    def generate_names(self, spec):
+        """
+        Generates new names for the nodes of the preview
+        :param spec: RenameSpec or RenamePipeline
+        :return: list(str), new names in the same order as preview base names
+        :raises ValueError: if no available name can be generated for a node
+        """
+
+        rename_pipeline = compile_spec(spec)
+        if not self._layout or self._layout.name != rename_pipeline.name:
+            self._layout = NameLayout(self._base_names, self._current_names, name=rename_pipeline.name)
+            self._stage_keys = list()
+            self._stage_names = list()
+            self._requested_names = None
+            self._collided_groups = set()
+        layout = self._layout
+
+        # Stages are executed again from the first one that changed
+        stage_keys = [stage.key for stage in rename_pipeline.stages]
+        names = layout.group_names
+        stage_names = list()
+        stages_changed = False
+        for i, (stage, stage_key) in enumerate(zip(rename_pipeline.stages, stage_keys)):
+            stages_changed = stages_changed or i >= len(self._stage_keys) or self._stage_keys[i] != stage_key
+            if stages_changed:
+                names = [stage.apply(name, index) for name, index in zip(names, layout.indices)]
+            else:
+                names = self._stage_names[i]
+            stage_names.append(names)
+        self._stage_keys = stage_keys
+        self._stage_names = stage_names
+        requested_names = layout.requested_names(names, rename_pipeline.has_affixes)
+
+        # Groups whose requested names did not change and that did not collide keep their names. Nodes that keep their
+        # names are only skipped if pipeline does not add affixes, so all groups are checked again if that changes
+        previous_names = self._requested_names
+        if previous_names is None or self._has_affixes != rename_pipeline.has_affixes:
+            affected_groups = None
+        else:
+            affected_groups = set(self._collided_groups)
+            affected_groups.update(
+                layout.node_groups[i] for i, (name, previous_name) in enumerate(zip(requested_names, previous_names))
+                if name != previous_name)
+
+        resolver = NameResolver(
+            rename_pipeline, taken_names=self._taken_names, name_exists=self._name_exists, free_names=self._free_names)
+        new_names, collided_groups = _merge_names(
+            resolver, rename_pipeline, layout, self._base_names, self._current_names, requested_names,
+            affected_groups=affected_groups)
+        self._requested_names = requested_names
+        self._collided_groups = collided_groups
+        self._has_affixes = rename_pipeline.has_affixes
+
+        return new_names
+
+    def preview_names(self, spec):
+        """
+        Generates new names for the nodes of the preview and flags the names that collide
+        A name collides when the name generated by the spec is already taken, so an available one is used instead
+        :param spec: RenameSpec or RenamePipeline
+        :return: list(tuple(str, bool)), (new name, collision) tuples in the same order as preview base names
+        """
+
+        new_names = self.generate_names(spec)
+
+        return [
+            (new_name, new_name != requested_name) for new_name, requested_name in zip(
+                new_names, self._requested_names)]
+
+
+def _merge_names(
+        resolver, rename_pipeline, layout, base_names, current_names, requested_names, affected_groups=None):
+    """
+    Internal function that returns the available names for the names requested by the nodes
+    Each group of nodes is resolved independently and groups whose requested names are free are not resolved. If
+    names of different groups collide, all names are resolved in order, so the result is always the same that
+    resolving all the names in order
+    :param resolver: NameResolver
+    :param rename_pipeline: RenamePipeline
+    :param layout: NameLayout
+    :param base_names: list(str)
+    :param current_names: list(str or None)
+    :param requested_names: list(str)
+    :param affected_groups: set(int) or None, groups to check. Other groups keep their requested names. If None, all
+        groups are checked
+    :return: tuple(list(str), set(int)), new names and groups whose new names are not their requested names
+    """
+
+    kept_names = layout.keep_names if not rename_pipeline.has_affixes else [False] * len(layout.keep_names)
+    if affected_groups is None:
+        # Usually, all requested names are free and unique, so there is no need to check each group
+        if len(set(requested_names)) == len(requested_names) and all(
+                kept_name or resolver.is_free(name) for name, kept_name in zip(requested_names, kept_names)):
+            return list(requested_names), set()
+        affected_groups = range(len(layout.groups))
+    groups = layout.groups
+    new_names = list(requested_names)
+    collided_groups = set()
+    for group_index in affected_groups:
+        group_indices = groups[group_index]
+        # Requested names that are free and not repeated inside the group do not need to be resolved
+        if all(kept_names[i] or resolver.is_free(requested_names[i]) for i in group_indices) and (
+                len(group_indices) == 1 or len(set(requested_names[i] for i in group_indices)) == len(group_indices)):
+            continue
+        group_new_names = _resolve_names(
+            resolver, rename_pipeline, [layout.group_names[group_indices[0]]] * len(group_indices),
+            [current_names[i] for i in group_indices])
+        for i, new_name in zip(group_indices, group_new_names):
+            if new_name != requested_names[i]:
+                collided_groups.add(group_index)
+            new_names[i] = new_name
+
+    if len(set(new_names)) != len(new_names):
+        new_names = _resolve_names(resolver, rename_pipeline, base_names, current_names)
+        collided_groups.update(
+            layout.node_groups[i] for i, (name, requested_name) in enumerate(zip(new_names, requested_names))
+            if name != requested_name)
+
+    return new_names, collided_groups
+
+
+def _process_pool_available():
+    """
+    Internal function that returns whether or not current interpreter can launch a process pool
+    Only plain Python and mayapy interpreters can. Embedded interpreters (such as GUI DCCs ones) cannot launch new
+    processes using their executable and forking them would duplicate the whole application
+    :return: bool
+    """
+
+    executable_name = os.path.basename(sys.executable or '').lower()
+    if executable_name.endswith('.exe'):
+        executable_name = executable_name[:-len('.exe')]
+
+    return bool(STANDALONE_INTERPRETER_REGEX.match(executable_name))
+
+
+def _format_names_chunk(chunk_data):
+    """
+    Internal function executed by pool processes that generates the names requested by a chunk of nodes
+    :param chunk_data: tuple(dict, list(str), list(int or None)), serialized pipeline, base names and indices
+    :return: list(str)
+    """
+
+    pipeline_dict, base_names, indices = chunk_data
+    rename_pipeline = pipeline.RenamePipeline.from_dict(pipeline_dict)
+
+    return [rename_pipeline.format(base_name, index=index) for base_name, index in zip(base_names, indices)]
+
+
+def _format_names_parallel(rename_pipeline, layout, processes=None):
+    """
+    Internal function that generates the names requested by the nodes of given layout using a process pool
+    :param rename_pipeline: RenamePipeline
+    :param layout: NameLayout
+    :param processes: int or None
+    :return: list(str) or None, generated names or None if the process pool could not be created
+    """
+
+    pipeline_dict = rename_pipeline.to_dict()
+    chunks = [
+        (pipeline_dict, layout.group_names[i:i + PARALLEL_CHUNK_SIZE], layout.indices[i:i + PARALLEL_CHUNK_SIZE])
+        for i in range(0, len(layout.group_names), PARALLEL_CHUNK_SIZE)]
+    if not chunks:
+        return list()
+
+    try:
+        pool = multiprocessing.Pool(processes=processes or min(len(chunks), multiprocessing.cpu_count()))
+    except Exception as exc:
+        LOGGER.warning('Impossible to create names process pool, names are generated in a single process: {}'.format(
+            exc))
+        return None
+
+    try:
+        # Chunks results are returned in the same order as the chunks
+        chunks_names = pool.map(_format_names_chunk, chunks)
+    finally:
+        pool.close()
+        pool.join()
+
+    return [name for chunk_names in chunks_names for name in chunk_names]
+
+
+def _resolve_names(resolver, rename_pipeline, base_names, current_names):
+    """
+    Internal function that generates new names for a list of nodes using given resolver
+    :param resolver: NameResolver
+    :param rename_pipeline: RenamePipeline
+    :param base_names: list(str)
+    :param current_names: list(str or None)
+    :return: list(str)
+    """
+
+    duplicated_names = dict()
+    generated_names = list()
+    generated_names_set = set()
+
+    for base_name, current_name in zip(base_names, current_names):
+        if rename_pipeline.name:
+            base_name = rename_pipeline.name
+        keep_name = base_name == current_name
+        duplicated_names[base_name] = duplicated_names.get(base_name, -1) + 1
+
+        if keep_name and not rename_pipeline.has_affixes:
+            new_name = base_name
+        else:
+            new_name = resolver.find_available_name(base_name, index=None if keep_name else duplicated_names[base_name])
+            while new_name in generated_names_set:
+                duplicated_names[base_name] += 1
+                new_name = resolver.find_available_name(base_name, index=duplicated_names[base_name])
+
+        generated_names.append(new_name)
+        generated_names_set.add(new_name)
+
+    return generated_names
@@ -3,12 +3,11 @@
 
 """
 Module that contains exceptions used by tpRenamer
+Module does not import tpDcc at module level, so headless modules (such as renamer connections) can use it
 """
 
 from __future__ import print_function, division, absolute_import
 
-from tpDcc import dcc
-
 
 class RenameException(Exception):
     """
@@ -17,6 +16,8 @@ class RenameException(Exception):
 
     def __init__(self, nodes):
 
+        from tpDcc import dcc
+
         error_text = '======= Renamer: Failed to rename one or more nodes ======='
         if not hasattr(nodes, '__iter__'):
             nodes = [nodes]
@@ -29,3 +30,25 @@ class RenameException(Exception):
                 error_text += "\t'%s' failure unknows.\n" % node
 
         Exception.__init__(self, error_text)
+
+
+class RenamerConnectionError(Exception):
+    """
+    Custom exception class that will handle errors in the communication between renamer client and server
+    """
+
+    def __init__(self, msg, delivered=False):
+        # Whether or not the message reached the server before the communication failed
+        self.delivered = delivered
+        Exception.__init__(self, msg)
+
+
+class RenameConflictError(Exception):
+    """
+    Custom exception class raised when a rename plan is not applied because it has conflicts
+    """
+
+    def __init__(self, report):
+        # ConflictReport with the conflicts found in the rename plan
+        self.report = report
+        Exception.__init__(self, report.summary())
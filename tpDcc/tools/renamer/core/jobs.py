@@ -0,0 +1,279 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains jobs used by tpDcc-tools-renamer server to execute long operations in chunks
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import time
+import uuid
+import logging
+import traceback
+from collections import OrderedDict
+
+LOGGER = logging.getLogger('tpDcc-tools-renamer')
+
+
+class JobStates(object):
+    PENDING = 'pending'
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    CANCELLED = 'cancelled'
+    FAILED = 'failed'
+
+    DONE_STATES = [FINISHED, CANCELLED, FAILED]
+
+
+class RenamerJob(object):
+    """
+    Operation that processes a list of items in chunks, so it can report its progress and be cancelled between chunks
+    """
+
+    DEFAULT_CHUNK_SIZE = 500
+
+    def __init__(self, name, items, chunk_fn, chunk_size=DEFAULT_CHUNK_SIZE, start_fn=None, finish_fn=None):
+        """
+        :param name: str, name of the job
+        :param items: list, items to process
+        :param chunk_fn: callable, function that receives a list of items and processes them. Values returned by this
+            function are stored as partial results of the job
+        :param chunk_size: int, maximum number of items processed by each chunk
+        :param start_fn: callable or None, function called before processing first chunk
+        :param finish_fn: callable or None, function called once a started job is done, even if it is cancelled or fails
+        """
+
+        super(RenamerJob, self).__init__()
+
+        self._id = str(uuid.uuid4())
+        self._name = name
+        self._items = list(items)
+        self._chunk_fn = chunk_fn
+        self._chunk_size = max(1, int(chunk_size))
+        self._start_fn = start_fn
+        self._finish_fn = finish_fn
+        self._state = JobStates.PENDING
+        self._processed = 0
+        self._cancel_requested = False
+        self._error = ''
+        self._results = list()
+        self._created_time = time.time()
+        self._start_time = None
+        self._end_time = None
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def is_done(self):
+        return self._state in JobStates.DONE_STATES
+
+    @property
+    def results(self):
+        return self._results
+
+    def enqueue(self):
+        """
+        Marks the job as waiting in a queue for its execution
+        """
+
+        if self._state == JobStates.PENDING:
+            self._state = JobStates.QUEUED
+
+    def cancel(self):
+        """
+        Requests the cancellation of the job. Job will stop at next chunk boundary
+        """
+
+        if self.is_done:
+            return
+
+        self._cancel_requested = True
+        if self._state in (JobStates.PENDING, JobStates.QUEUED):
+            self._finish(JobStates.CANCELLED)
+
+    def run_next_chunk(self):
+        """
+        Processes next chunk of items
+        :return: bool, True if there are more chunks to process; False otherwise
+        """
+
+        if self.is_done:
+            return False
+
+        if self._state in (JobStates.PENDING, JobStates.QUEUED):
+            self._start_time = time.time()
+            self._state = JobStates.RUNNING
+            if self._start_fn:
+                try:
+                    self._start_fn()
+                except Exception:
+                    self._fail(traceback.format_exc())
+                    return False
+
+        if self._cancel_requested:
+            self._finish(JobStates.CANCELLED)
+            return False
+
+        chunk = self._items[self._processed:self._processed + self._chunk_size]
+        if chunk:
+            try:
+                chunk_result = self._chunk_fn(chunk)
+            except Exception:
+                self._fail(traceback.format_exc())
+                return False
+            self._processed += len(chunk)
+            if chunk_result is not None:
+                self._results.append(chunk_result)
+
+        if self._processed >= len(self._items):
+            self._finish(JobStates.FINISHED)
+            return False
+
+        return True
+
+    def run(self):
+        """
+        Processes all the chunks of the job
+        """
+
+        while self.run_next_chunk():
+            pass
+
+    def progress(self):
+        """
+        Returns a dictionary with current progress of the job
+        :return: dict
+        """
+
+        current_time = time.time()
+        if self._start_time is None:
+            elapsed = 0.0
+            queue_wait = (self._end_time or current_time) - self._created_time
+        else:
+            elapsed = (self._end_time or current_time) - self._start_time
+            queue_wait = self._start_time - self._created_time
+
+        return {
+            'id': self._id,
+            'name': self._name,
+            'state': self._state,
+            'total': len(self._items),
+            'processed': self._processed,
+            'results': len(self._results),
+            'queue_wait': queue_wait,
+            'elapsed': elapsed,
+            'throughput': self._processed / elapsed if elapsed > 0 else 0.0,
+            'error': self._error
+        }
+
+    def _finish(self, state):
+        """
+        Internal function that finishes the job with given state
+        :param state: str
+        """
+
+        self._state = state
+        self._end_time = time.time()
+        if self._finish_fn and self._start_time is not None:
+            try:
+                self._finish_fn()
+            except Exception:
+                LOGGER.error('Error while finishing renamer job "{}": {}'.format(self._name, traceback.format_exc()))
+
+    def _fail(self, error):
+        """
+        Internal function that finishes the job because of given error
+        :param error: str
+        """
+
+        LOGGER.error('Renamer job "{}" failed: {}'.format(self._name, error))
+        self._error = error
+        self._finish(JobStates.FAILED)
+
+
+class JobQueue(object):
+    """
+    Queue that executes jobs one after another, in the same order they were submitted
+    """
+
+    def __init__(self, max_finished_jobs=20):
+        """
+        :param max_finished_jobs: int, maximum number of finished jobs kept so their progress and results can be queried
+        """
+
+        super(JobQueue, self).__init__()
+
+        self._max_finished_jobs = max_finished_jobs
+        self._jobs = OrderedDict()
+
+    def __len__(self):
+        return len(self.pending_jobs())
+
+    def get(self, job_id):
+        """
+        Returns job with given ID
+        :param job_id: str
+        :return: RenamerJob or None
+        """
+
+        return self._jobs.get(job_id, None)
+
+    def jobs(self):
+        return list(self._jobs.values())
+
+    def pending_jobs(self):
+        return [job for job in self._jobs.values() if not job.is_done]
+
+    def submit(self, job):
+        """
+        Adds given job at the end of the queue
+        :param job: RenamerJob
+        :return: int, number of jobs that will be executed before the given one
+        """
+
+        finished_jobs = [job_id for job_id, queue_job in self._jobs.items() if queue_job.is_done]
+        for job_id in finished_jobs[:max(0, len(finished_jobs) - self._max_finished_jobs)]:
+            self._jobs.pop(job_id)
+
+        position = len(self.pending_jobs())
+        job.enqueue()
+        self._jobs[job.id] = job
+
+        return position
+
+    def position(self, job_id):
+        """
+        Returns the number of jobs that will be executed before the job with given ID
+        :param job_id: str
+        :return: int, -1 if the job is not waiting for its execution
+        """
+
+        pending_ids = [job.id for job in self.pending_jobs()]
+
+        return pending_ids.index(job_id) if job_id in pending_ids else -1
+
+    def run_next_chunk(self):
+        """
+        Processes next chunk of the first job that is not done yet
+        :return: bool, True if there is more work to do; False otherwise
+        """
+
+        pending_jobs = self.pending_jobs()
+        if not pending_jobs:
+            return False
+
+        pending_jobs[0].run_next_chunk()
+
+        return bool(self.pending_jobs())
@@ -0,0 +1,172 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains instrumentation used by tpDcc-tools-renamer client and server to measure commands performance
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import json
+import bisect
+import logging
+import threading
+from collections import OrderedDict
+
+LOGGER = logging.getLogger('tpDcc-tools-renamer')
+
+# Bucket upper bounds in seconds, from 0.1 ms up to 30 seconds
+TIME_BOUNDS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Bucket upper bounds in bytes, from 128 bytes up to 64 MB
+SIZE_BOUNDS = tuple(128 * 4 ** i for i in range(10))
+
+
+class Histogram(object):
+    """
+    Histogram with fixed buckets. Values bigger than last bound are stored in an overflow bucket
+    """
+
+    def __init__(self, bounds):
+        super(Histogram, self).__init__()
+
+        self._bounds = tuple(bounds)
+        self._buckets = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._min = None
+        self._max = None
+
+    @property
+    def count(self):
+        return self._count
+
+    def add(self, value):
+        """
+        Adds a new value to the histogram
+        :param value: float
+        """
+
+        self._buckets[bisect.bisect_left(self._bounds, value)] += 1
+        self._count += 1
+        self._total += value
+        self._min = value if self._min is None else min(self._min, value)
+        self._max = value if self._max is None else max(self._max, value)
+
+    def percentile(self, percent):
+        """
+        Returns an upper estimation of given percentile: the upper bound of the bucket containing it
+        :param percent: float, value between 0 and 100
+        :return: float
+        """
+
+        if not self._count:
+            return 0.0
+
+        target = self._count * percent / 100.0
+        accumulated = 0
+        for i, bucket_count in enumerate(self._buckets):
+            accumulated += bucket_count
+            if accumulated >= target:
+                return self._bounds[i] if i < len(self._bounds) else self._max
+
+        return self._max
+
+    def to_dict(self):
+        """
+        Returns a serializable dictionary with the contents of the histogram
+        :return: OrderedDict
+        """
+
+        buckets = OrderedDict()
+        for i, bucket_count in enumerate(self._buckets):
+            if bucket_count:
+                buckets['<={}'.format(self._bounds[i]) if i < len(self._bounds) else 'inf'] = bucket_count
+
+        return OrderedDict([
+            ('count', self._count),
+            ('total', self._total),
+            ('mean', self._total / self._count if self._count else 0.0),
+            ('min', self._min or 0.0),
+            ('max', self._max or 0.0),
+            ('p50', self.percentile(50)),
+            ('p95', self.percentile(95)),
+            ('buckets', buckets)
+        ])
+
+
+class CommandMetrics(object):
+    """
+    Thread safe registry that stores timings (in seconds) and payload sizes (in bytes) of each executed command
+    """
+
+    TIME_FIELDS = ['serialize', 'transport', 'execute', 'deserialize', 'total']
+    SIZE_FIELDS = ['request_bytes', 'reply_bytes']
+
+    def __init__(self):
+        super(CommandMetrics, self).__init__()
+
+        self._commands = dict()
+        self._lock = threading.Lock()
+
+    def record(self, cmd_name, values):
+        """
+        Records the measures of a single execution of the command with given name
+        :param cmd_name: str
+        :param values: dict, measures to record. Keys not included in TIME_FIELDS or SIZE_FIELDS are ignored
+        """
+
+        with self._lock:
+            command_histograms = self._commands.get(cmd_name, None)
+            if command_histograms is None:
+                command_histograms = self._commands[cmd_name] = OrderedDict(
+                    [('calls', 0)] + [(field, Histogram(TIME_BOUNDS)) for field in self.TIME_FIELDS] + [
+                        (field, Histogram(SIZE_BOUNDS)) for field in self.SIZE_FIELDS])
+            command_histograms['calls'] += 1
+            for field, value in values.items():
+                histogram = command_histograms.get(field, None)
+                if value is None or not isinstance(histogram, Histogram):
+                    continue
+                histogram.add(value)
+
+    def reset(self):
+        with self._lock:
+            self._commands.clear()
+
+    def to_dict(self):
+        """
+        Returns a serializable dictionary with the histograms of all recorded commands
+        :return: OrderedDict
+        """
+
+        with self._lock:
+            metrics = OrderedDict()
+            for cmd_name in sorted(self._commands):
+                command_metrics = metrics[cmd_name] = OrderedDict()
+                for field, histogram in self._commands[cmd_name].items():
+                    if not isinstance(histogram, Histogram):
+                        command_metrics[field] = histogram
+                    elif histogram.count:
+                        command_metrics[field] = histogram.to_dict()
+
+        return metrics
+
+    def to_json(self, indent=None):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def dump(self, file_path=None):
+        """
+        Dumps recorded metrics into a JSON file or, if no file is given, into renamer logger
+        :param file_path: str or None
+        """
+
+        if file_path:
+            with open(file_path, 'w') as fh:
+                fh.write(self.to_json(indent=4))
+            return
+
+        for cmd_name, command_metrics in self.to_dict().items():
+            LOGGER.info('{} | calls: {} | {}'.format(cmd_name, command_metrics.get('calls', 0), ' | '.join(
+                '{}: mean {:.6f} p95 {}'.format(field, field_metrics['mean'], field_metrics['p95'])
+                for field, field_metrics in command_metrics.items() if isinstance(field_metrics, dict))))
@@ -34,9 +34,10 @@ class RenamerModel(QObject, object):
     removePluginWidget = Signal(object)
     preparePluginsLoad = Signal()
 
-    def __init__(self, config=None, naming_config=None):
+    def __init__(self, config=None, naming_config=None, client=None):
         super(RenamerModel, self).__init__()
 
+        self._client = client
         self._config = config if config else configs.get_tool_config('tpDcc-tools-renamer')
         self._naming_config = naming_config if naming_config else configs.get_config(config_name='tpDcc-naming')
         self._selection_type = 0
@@ -137,6 +138,9 @@ class RenamerModel(QObject, object):
 
     @property
     def node_types(self):
+        if self._client:
+            return self._client.cached_query('dcc_to_tpdcc_str_types')
+
         return dcc.client().dcc_to_tpdcc_str_types()
 
     @property
@@ -0,0 +1,153 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains per operation node cache used by tpDcc-tools-renamer to resolve each node only once
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.tools.renamer.core import paths
+
+
+class NodeRecord(object):
+    """
+    Resolved data of a node: its handle, short name, full path and UUID
+    """
+
+    __slots__ = ('handle', 'short_name', 'full_path', 'uuid')
+
+    def __init__(self, handle, full_path, uuid, separator=paths.PATH_SEPARATOR):
+        self.handle = handle
+        self.full_path = full_path
+        self.short_name = full_path.rsplit(separator, 1)[-1]
+        self.uuid = uuid
+
+    def __repr__(self):
+        return 'NodeRecord({}, {})'.format(self.full_path, self.uuid)
+
+
+class NodeCache(object):
+    """
+    Cache of the nodes resolved during a renamer operation
+    Each node is resolved once, the first time it is requested. As nodes are renamed, cached records (and the full
+    paths of their cached descendants) are updated, so they keep matching the scene during the whole operation
+    """
+
+    def __init__(self, resolve_fn, separator=paths.PATH_SEPARATOR):
+        """
+        :param resolve_fn: fn, function that receives a node (handle, name or item) and returns a tuple with its full
+            path and UUID or None if the node cannot be resolved
+        :param separator: str
+        """
+
+        super(NodeCache, self).__init__()
+
+        self._resolve_fn = resolve_fn
+        self._separator = separator
+        self._records = dict()
+        self._records_by_uuid = dict()
+        self._children = dict()
+        self._resolve_count = 0
+
+    def __len__(self):
+        return len(self._records_by_uuid)
+
+    @property
+    def resolve_count(self):
+        return self._resolve_count
+
+    def resolve(self, node):
+        """
+        Returns the record of given node, resolving it only if it was not resolved before
+        :param node: object, node handle, node name or item
+        :return: NodeRecord or None
+        """
+
+        key = self._node_key(node)
+        if key in self._records:
+            return self._records[key]
+
+        self._resolve_count += 1
+        resolved = self._resolve_fn(node)
+        record = None
+        if resolved and resolved[0]:
+            full_path, uuid = resolved
+            record = self._records_by_uuid.get(uuid, None) if uuid else None
+            if record is None:
+                record = NodeRecord(node, full_path, uuid, separator=self._separator)
+                if uuid:
+                    self._records_by_uuid[uuid] = record
+                self._children.setdefault(self._parent_path(full_path), list()).append(record)
+        self._records[key] = record
+
+        return record
+
+    def find(self, uuid):
+        """
+        Returns the cached record of the node with given UUID
+        :param uuid: str
+        :return: NodeRecord or None
+        """
+
+        return self._records_by_uuid.get(uuid, None)
+
+    def rename(self, uuid, new_name):
+        """
+        Updates the cache after renaming the node with given UUID
+        :param uuid: str
+        :param new_name: str, new short name of the node
+        :return: bool, True if the node was cached or False otherwise
+        """
+
+        record = self._records_by_uuid.get(uuid, None)
+        if record is None:
+            return False
+
+        old_path = record.full_path
+        parent_path, separator, _ = old_path.rpartition(self._separator)
+        record.short_name = new_name
+        record.full_path = '{}{}{}'.format(parent_path, separator, new_name)
+        self._update_children(old_path, record.full_path)
+
+        return True
+
+    def _node_key(self, node):
+        """
+        Internal function that returns the key used to store given node
+        Names are stored by value and other nodes by identity, so nodes must be alive during the operation
+        :param node: object
+        :return: object
+        """
+
+        try:
+            hash(node)
+        except TypeError:
+            return id(node)
+
+        return node
+
+    def _parent_path(self, full_path):
+        """
+        Internal function that returns the full path of the parent of the node with given full path
+        :param full_path: str
+        :return: str
+        """
+
+        return full_path.rpartition(self._separator)[0]
+
+    def _update_children(self, old_path, new_path):
+        """
+        Internal function that updates the full paths of the cached descendants of a renamed node
+        :param old_path: str
+        :param new_path: str
+        """
+
+        children = self._children.pop(old_path, None)
+        if not children:
+            return
+        self._children[new_path] = children
+        for child in children:
+            child_old_path = child.full_path
+            child.full_path = '{}{}{}'.format(new_path, self._separator, child.short_name)
+            self._update_children(child_old_path, child.full_path)
@@ -0,0 +1,156 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to work with DCC nodes full paths used by tpDcc-tools-renamer
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from collections import OrderedDict
+
+# Separator used by DCC full paths
+PATH_SEPARATOR = '|'
+
+
+def path_depth(node_path, separator=PATH_SEPARATOR):
+    """
+    Returns the depth of the node with given full path inside its hierarchy
+    :param node_path: str
+    :param separator: str
+    :return: int
+    """
+
+    return node_path.strip(separator).count(separator)
+
+
+def unique_paths(node_paths):
+    """
+    Returns given paths without duplicates, keeping the order in which they appear for the first time
+    :param node_paths: list(str)
+    :return: list(str)
+    """
+
+    return list(OrderedDict.fromkeys(node_paths))
+
+
+def sort_paths_by_depth(node_paths, separator=PATH_SEPARATOR):
+    """
+    Returns given full paths sorted from the deepest to the shallowest one
+    Renaming nodes in this order never invalidates the full paths of the nodes renamed later: a node is always renamed
+    after all its descendants. Nodes with the same depth keep their order
+    :param node_paths: list(str)
+    :param separator: str
+    :return: list(str)
+    """
+
+    return sorted(node_paths, key=lambda node_path: -path_depth(node_path, separator=separator))
+
+
+def minimal_roots(node_paths, separator=PATH_SEPARATOR):
+    """
+    Returns the given full paths whose ancestors are not in the given list, keeping their order
+    Expanding the hierarchy of these paths lists all the descendants of the given nodes only once
+    :param node_paths: list(str)
+    :param separator: str
+    :return: list(str)
+    """
+
+    return PathTrie(node_paths, separator=separator).roots()
+
+
+class PathTrie(object):
+    """
+    Prefix trie over the full paths of DCC nodes
+    Allows to check if any ancestor of a node is stored without comparing its path with all the stored paths: checks
+    only walk the path tokens
+    """
+
+    # Key used inside trie nodes to store the full path of the node that ends in that trie node
+    PATH_KEY = None
+
+    def __init__(self, node_paths=None, separator=PATH_SEPARATOR):
+        super(PathTrie, self).__init__()
+
+        self._separator = separator
+        self._root = dict()
+        self._paths = list()
+        for node_path in node_paths or list():
+            self.add(node_path)
+
+    def __contains__(self, node_path):
+        trie_node = self._find(node_path)
+        return trie_node is not None and self.PATH_KEY in trie_node
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def add(self, node_path):
+        """
+        Adds given full path to the trie
+        :param node_path: str
+        :return: bool, True if the path was added or False if it was already stored
+        """
+
+        trie_node = self._root
+        for token in self._split(node_path):
+            trie_node = trie_node.setdefault(token, dict())
+        if self.PATH_KEY in trie_node:
+            return False
+        trie_node[self.PATH_KEY] = node_path
+        self._paths.append(node_path)
+
+        return True
+
+    def has_ancestor(self, node_path):
+        """
+        Returns whether or not any ancestor of the node with given path is stored in the trie
+        :param node_path: str
+        :return: bool
+        """
+
+        trie_node = self._root
+        tokens = self._split(node_path)
+        for token in tokens[:-1]:
+            trie_node = trie_node.get(token, None)
+            if trie_node is None:
+                return False
+            if self.PATH_KEY in trie_node:
+                return True
+
+        return False
+
+    def roots(self):
+        """
+        Returns the stored paths whose ancestors are not stored, in the order they were added
+        :return: list(str)
+        """
+
+        return [node_path for node_path in self._paths if not self.has_ancestor(node_path)]
+
+    def _split(self, node_path):
+        """
+        Internal function that returns the tokens of given full path
+        :param node_path: str
+        :return: list(str)
+        """
+
+        return node_path.strip(self._separator).split(self._separator)
+
+    def _find(self, node_path):
+        """
+        Internal function that returns the trie node of given full path
+        :param node_path: str
+        :return: dict or None
+        """
+
+        trie_node = self._root
+        for token in self._split(node_path):
+            trie_node = trie_node.get(token, None)
+            if trie_node is None:
+                return None
+
+        return trie_node
@@ -0,0 +1,328 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains compiled rename pipelines used by tpDcc-tools-renamer name generation engine
+A pipeline is an ordered list of string transforms compiled once from rename settings. Pipelines can be serialized, so
+the same pipeline can be executed by renamer servers or headless
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import re
+
+# Characters that are not part of name tokens. Renamer names tokens are separated by underscores
+TOKEN_BOUNDARY_START = r'(?<![a-zA-Z0-9])'
+TOKEN_BOUNDARY_END = r'(?![a-zA-Z0-9])'
+
+
+def get_alpha(index, capital=False):
+    """
+    Returns the letters that represent given index: a, b, ..., z, aa, ab, ...
+    :param index: int
+    :param capital: bool
+    :return: str
+    """
+
+    letters = ''
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(97 + remainder) + letters
+
+    return letters.upper() if capital else letters
+
+
+class RenameStage(object):
+    """
+    Base class for rename pipeline stages
+    """
+
+    STAGE_TYPE = None
+
+    @property
+    def key(self):
+        """
+        Returns a hashable key that identifies the stage and its parameters
+        :return: tuple
+        """
+
+        return tuple(sorted(self.to_dict().items()))
+
+    def apply(self, name, index=None, affixes=True):
+        """
+        Returns the result of applying the stage to given name
+        :param name: str
+        :param index: int or None, index of the name. If None or negative, name has no index
+        :param affixes: bool, whether or not side and suffix are added to the name
+        :return: str
+        """
+
+        raise NotImplementedError('apply function not implemented in "{}"'.format(self.__class__.__name__))
+
+    def params(self):
+        """
+        Returns the parameters used to create the stage
+        :return: dict
+        """
+
+        return dict()
+
+    def to_dict(self):
+        stage_dict = self.params()
+        stage_dict['type'] = self.STAGE_TYPE
+
+        return stage_dict
+
+
+class PrefixSideStage(RenameStage):
+    STAGE_TYPE = 'prefix_side'
+
+    def __init__(self, prefix='', side=''):
+        super(PrefixSideStage, self).__init__()
+
+        self._prefix = prefix
+        self._side = side
+        self._head = ''.join('{}_'.format(affix) for affix in (prefix, side) if affix)
+        self._plain_head = '{}_'.format(prefix) if prefix else ''
+
+    def apply(self, name, index=None, affixes=True):
+        return '{}{}'.format(self._head if affixes else self._plain_head, name)
+
+    def params(self):
+        return {'prefix': self._prefix, 'side': self._side}
+
+
+class NumberStage(RenameStage):
+    STAGE_TYPE = 'number'
+
+    def __init__(self, padding=0, letters=False, capital=False):
+        super(NumberStage, self).__init__()
+
+        self._padding = padding
+        self._letters = letters
+        self._capital = capital
+
+    def apply(self, name, index=None, affixes=True):
+        if index is None or index < 0:
+            return name
+        if self._letters:
+            return '{}_{}'.format(name, get_alpha(index, self._capital))
+
+        return '{}_{}'.format(name, str(index).zfill(self._padding))
+
+    def params(self):
+        return {'padding': self._padding, 'letters': self._letters, 'capital': self._capital}
+
+
+class SuffixStage(RenameStage):
+    STAGE_TYPE = 'suffix'
+
+    def __init__(self, suffix=''):
+        super(SuffixStage, self).__init__()
+
+        self._suffix = suffix
+        self._tail = '_{}'.format(suffix)
+
+    def apply(self, name, index=None, affixes=True):
+        return '{}{}'.format(name, self._tail) if affixes else name
+
+    def params(self):
+        return {'suffix': self._suffix}
+
+
+class TrimStage(RenameStage):
+    STAGE_TYPE = 'trim'
+
+    def __init__(self, remove_first=0, remove_last=0):
+        super(TrimStage, self).__init__()
+
+        self._remove_first = remove_first
+        self._remove_last = remove_last
+        self._end = -remove_last if remove_last > 0 else None
+
+    def apply(self, name, index=None, affixes=True):
+        return name[self._remove_first:self._end]
+
+    def params(self):
+        return {'remove_first': self._remove_first, 'remove_last': self._remove_last}
+
+
+class ReplaceStage(RenameStage):
+    STAGE_TYPE = 'replace'
+
+    def __init__(self, search='', replace='', regex=False, ignore_case=False, whole_word=False):
+        """
+        :param search: str, text or regular expression to search
+        :param replace: str, replacement text. In regex mode, it can reference capture groups (\\1, \\g<name>)
+        :param regex: bool, whether or not search is a regular expression
+        :param ignore_case: bool
+        :param whole_word: bool, whether or not only whole name tokens (separated by underscores) are replaced
+        :raises ValueError: if search is not a valid regular expression or if replace text is not a valid template
+        """
+
+        super(ReplaceStage, self).__init__()
+
+        self._search = search
+        self._replace = replace
+        self._regex = regex
+        self._ignore_case = ignore_case
+        self._whole_word = whole_word
+        self._pattern = None
+        if regex or ignore_case or whole_word:
+            pattern = search if regex else re.escape(search)
+            if whole_word:
+                pattern = '{}(?:{}){}'.format(TOKEN_BOUNDARY_START, pattern, TOKEN_BOUNDARY_END)
+            try:
+                self._pattern = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+            except re.error as exc:
+                raise ValueError('Invalid search pattern "{}": {}'.format(search, exc))
+        # In literal mode, replacement text is never interpreted as a template
+        self._replacement = replace if regex else lambda match: replace
+        if regex:
+            self._check_replacement()
+
+    def apply(self, name, index=None, affixes=True):
+        return self.substitute(name)[0]
+
+    def substitute(self, name):
+        """
+        Returns given name with all search occurrences replaced and the number of replaced occurrences
+        :param name: str
+        :return: tuple(str, int)
+        :raises ValueError: if replacement text references capture groups that search pattern does not define
+        """
+
+        if self._pattern is None:
+            count = name.count(self._search) if self._search else 0
+            return (name.replace(self._search, self._replace) if count else name), count
+
+        try:
+            return self._pattern.subn(self._replacement, name)
+        except (re.error, IndexError) as exc:
+            raise ValueError('Invalid replace text "{}": {}'.format(self._replace, exc))
+
+    def _check_replacement(self):
+        """
+        Internal function that checks replace text template once, so invalid templates are found before any name is
+        replaced. Template is expanded with an empty match of a pattern that defines the same capture groups
+        :raises ValueError: if replace text is not a valid template for search pattern
+        """
+
+        group_names = dict((index, name) for name, index in self._pattern.groupindex.items())
+        groups_pattern = ''.join(
+            '(?P<{}>)'.format(group_names[i]) if i in group_names else '()' for i in range(1, self._pattern.groups + 1))
+        try:
+            re.compile(groups_pattern).match('').expand(self._replace)
+        except (re.error, IndexError) as exc:
+            raise ValueError('Invalid replace text "{}": {}'.format(self._replace, exc))
+
+    def params(self):
+        return {
+            'search': self._search, 'replace': self._replace, 'regex': self._regex, 'ignore_case': self._ignore_case,
+            'whole_word': self._whole_word
+        }
+
+
+STAGES = dict((stage_class.STAGE_TYPE, stage_class) for stage_class in (
+    PrefixSideStage, NumberStage, SuffixStage, TrimStage, ReplaceStage))
+
+
+class RenamePipeline(object):
+    """
+    Ordered list of stages that generates names. Only the stages needed by the rename settings are compiled, so
+    generating a name does not check settings that are not used
+    """
+
+    def __init__(self, stages=None, name='', has_affixes=False):
+        """
+        :param stages: list(RenameStage)
+        :param name: str, name used instead of nodes names as base name
+        :param has_affixes: bool, whether or not pipeline adds prefix, side or suffix to names
+        """
+
+        super(RenamePipeline, self).__init__()
+
+        self._stages = list(stages or list())
+        self._name = name or ''
+        self._has_affixes = has_affixes
+
+    def __eq__(self, other):
+        return isinstance(other, RenamePipeline) and self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def has_affixes(self):
+        return self._has_affixes
+
+    @property
+    def stages(self):
+        return self._stages
+
+    @classmethod
+    def from_spec(cls, spec):
+        """
+        Compiles the pipeline defined by given rename spec
+        :param spec: RenameSpec
+        :return: RenamePipeline
+        """
+
+        stages = list()
+        if spec.prefix or spec.side:
+            stages.append(PrefixSideStage(spec.prefix, spec.side))
+        stages.append(NumberStage(spec.padding, spec.letters, spec.capital))
+        if spec.suffix:
+            stages.append(SuffixStage(spec.suffix))
+        if spec.remove_first > 0 or spec.remove_last > 0:
+            stages.append(TrimStage(max(0, spec.remove_first), max(0, spec.remove_last)))
+        if spec.search and spec.replace is not None:
+            stages.append(ReplaceStage(
+                spec.search, spec.replace, regex=spec.regex, ignore_case=spec.ignore_case, whole_word=spec.whole_word))
+
+        return cls(stages, name=spec.name, has_affixes=spec.has_affixes)
+
+    @classmethod
+    def from_dict(cls, pipeline_dict):
+        """
+        Creates a pipeline from its serialized dictionary
+        :param pipeline_dict: dict
+        :return: RenamePipeline
+        """
+
+        stages = list()
+        for stage_dict in pipeline_dict.get('stages', list()):
+            stage_params = dict(stage_dict)
+            stage_type = stage_params.pop('type', None)
+            if stage_type not in STAGES:
+                raise ValueError('Rename pipeline stage "{}" is not supported'.format(stage_type))
+            stages.append(STAGES[stage_type](**stage_params))
+
+        return cls(stages, name=pipeline_dict.get('name', ''), has_affixes=pipeline_dict.get('has_affixes', False))
+
+    def to_dict(self):
+        return {
+            'name': self._name,
+            'has_affixes': self._has_affixes,
+            'stages': [stage.to_dict() for stage in self._stages]
+        }
+
+    def format(self, base_name, index=None, affixes=True):
+        """
+        Returns the name generated from given base name
+        :param base_name: str
+        :param index: int or None, index added to the name. If None or negative, no index is added
+        :param affixes: bool, whether or not side and suffix are added to the name
+        :return: str
+        """
+
+        name = base_name
+        for stage in self._stages:
+            name = stage.apply(name, index, affixes)
+
+        return name
@@ -0,0 +1,193 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains compact wire format used by tpDcc-tools-renamer client and server to exchange large payloads
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import zlib
+import json
+import base64
+import struct
+from collections import OrderedDict
+
+JSON_FORMAT = 'json'
+COMPACT_FORMAT = 'compact'
+WIRE_FORMATS = [COMPACT_FORMAT, JSON_FORMAT]
+
+# Frame header: magic, version, flags and body size
+FRAME_MAGIC = b'RN'
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct('>2sBBI')
+COMPRESSED_FLAG = 1 << 0
+
+# Bodies bigger than this size (in bytes) are compressed
+COMPRESS_THRESHOLD = 4096
+
+# Lists with less items than this are not worth to be encoded as path tables
+MIN_PATHS_TABLE_SIZE = 8
+PATHS_TABLE_KEY = '__paths__'
+PATH_SEPARATOR = '|'
+
+
+def encode_paths(paths):
+    """
+    Encodes given list of node paths as a table of shared parent paths and a flat list of (parent index, leaf name)
+    :param paths: list(str)
+    :return: dict
+    """
+
+    parents = list()
+    parent_indices = dict()
+    encoded = list()
+    for path in paths:
+        leaf_index = path.rfind(PATH_SEPARATOR) + 1
+        parent = path[:leaf_index]
+        parent_index = parent_indices.get(parent)
+        if parent_index is None:
+            parent_index = parent_indices[parent] = len(parents)
+            parents.append(parent)
+        encoded.append(parent_index)
+        encoded.append(path[leaf_index:])
+
+    return {PATHS_TABLE_KEY: [parents, encoded]}
+
+
+def decode_paths(paths_table):
+    """
+    Decodes a table of paths encoded with encode_paths function
+    :param paths_table: dict
+    :return: list(str)
+    """
+
+    parents, encoded = paths_table[PATHS_TABLE_KEY]
+
+    return [parents[encoded[i]] + encoded[i + 1] for i in range(0, len(encoded), 2)]
+
+
+def encode_value(value):
+    """
+    Returns a copy of given value where all lists of node paths are encoded as path tables
+    :param value: object
+    :return: object
+    """
+
+    if isinstance(value, dict):
+        return value.__class__((key, encode_value(item)) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        if _is_paths_list(value):
+            return encode_paths(value)
+        return [encode_value(item) for item in value]
+
+    return value
+
+
+def decode_value(value):
+    """
+    Returns a copy of given value where all path tables are decoded back into lists of node paths
+    :param value: object
+    :return: object
+    """
+
+    if isinstance(value, dict):
+        if len(value) == 1 and PATHS_TABLE_KEY in value:
+            return decode_paths(value)
+        return value.__class__((key, decode_value(item)) for key, item in value.items())
+    elif isinstance(value, list):
+        return [decode_value(item) for item in value]
+
+    return value
+
+
+def pack(data, compress_threshold=COMPRESS_THRESHOLD):
+    """
+    Packs given data into a length-prefixed binary frame
+    :param data: dict
+    :param compress_threshold: int, bodies bigger than this size are compressed using zlib. Negative disables it
+    :return: bytes
+    """
+
+    body = json.dumps(encode_value(data), separators=(',', ':')).encode('utf-8')
+    flags = 0
+    if 0 <= compress_threshold < len(body):
+        body = zlib.compress(body)
+        flags |= COMPRESSED_FLAG
+
+    return FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, flags, len(body)) + body
+
+
+def unpack(frame):
+    """
+    Unpacks data from given binary frame
+    :param frame: bytes
+    :return: dict
+    """
+
+    if len(frame) < FRAME_HEADER.size:
+        raise ValueError('Invalid renamer frame: frame is smaller than its header')
+
+    magic, version, flags, body_size = FRAME_HEADER.unpack(frame[:FRAME_HEADER.size])
+    if magic != FRAME_MAGIC:
+        raise ValueError('Invalid renamer frame: wrong magic number')
+    if version > FRAME_VERSION:
+        raise ValueError('Renamer frame version {} is not supported'.format(version))
+
+    body = frame[FRAME_HEADER.size:FRAME_HEADER.size + body_size]
+    if len(body) != body_size:
+        raise ValueError('Invalid renamer frame: expected {} bytes but {} found'.format(body_size, len(body)))
+    if flags & COMPRESSED_FLAG:
+        body = zlib.decompress(body)
+
+    return decode_value(json.loads(body.decode('utf-8'), object_pairs_hook=OrderedDict))
+
+
+def frame_to_text(frame):
+    """
+    Converts given binary frame into text, so it can be sent within a JSON message
+    :param frame: bytes
+    :return: str
+    """
+
+    return base64.b64encode(frame).decode('ascii')
+
+
+def text_to_frame(text):
+    """
+    Converts back text generated with frame_to_text function into a binary frame
+    :param text: str
+    :return: bytes
+    """
+
+    return base64.b64decode(text.encode('ascii'))
+
+
+def _is_paths_list(value):
+    """
+    Internal function that returns whether or not given list is a list of node paths that can be encoded as a table
+    :param value: list
+    :return: bool
+    """
+
+    if len(value) < MIN_PATHS_TABLE_SIZE:
+        return False
+
+    for item in value:
+        if not _is_text(item):
+            return False
+
+    return any(PATH_SEPARATOR in item for item in value)
+
+
+def _is_text(value):
+    """
+    Internal function that returns whether or not given value is a text value both in Python 2 and Python 3
+    :param value: object
+    :return: bool
+    """
+
+    try:
+        return isinstance(value, basestring)
+    except NameError:
+        return isinstance(value, str)
@@ -0,0 +1,124 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains scene name index used by tpDcc-tools-renamer to check names existence without querying the DCC
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import re
+
+LAST_NUMBER_REGEX = re.compile(r'^(?P<base>.*?)(?P<number>\d+)$')
+
+
+class SceneNameIndex(object):
+    """
+    Snapshot of the short names of the nodes of a scene
+    Index is built once per operation with a single DCC query and it is updated as the operation renames nodes, so
+    all existence checks done during the operation are in-memory lookups
+    """
+
+    def __init__(self, names=None):
+        super(SceneNameIndex, self).__init__()
+
+        # Different nodes can share the same short name, so we store how many nodes use each name
+        self._names = dict()
+        self._used_ranges = dict()
+        for name in names or list():
+            self.add(name)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __len__(self):
+        return len(self._names)
+
+    @classmethod
+    def from_paths(cls, node_paths, separator='|'):
+        """
+        Creates a new index from the full paths of the nodes of a scene
+        :param node_paths: list(str)
+        :param separator: str
+        :return: SceneNameIndex
+        """
+
+        return cls([node_path.rsplit(separator, 1)[-1] for node_path in node_paths or list()])
+
+    def count(self, name):
+        """
+        Returns the number of nodes that use given short name
+        :param name: str
+        :return: int
+        """
+
+        return self._names.get(name, 0)
+
+    def add(self, name):
+        self._names[name] = self._names.get(name, 0) + 1
+
+    def remove(self, name):
+        count = self._names.get(name, 0)
+        if count <= 1:
+            self._names.pop(name, None)
+        else:
+            self._names[name] = count - 1
+
+        # Numbered name could be free now, so next searches for its base name must start from the beginning
+        self._used_ranges.pop(self._split_name(name)[0], None)
+
+    def rename(self, old_name, new_name):
+        """
+        Updates the index after renaming a node
+        :param old_name: str
+        :param new_name: str
+        """
+
+        self.remove(old_name)
+        self.add(new_name)
+
+    def find_unique_name(self, name, reserve=False):
+        """
+        Returns a name that is not used by any node of the index
+        If the name is used, its last number is increased (keeping its padding) or, if it has no number, "_1" is
+        appended and increased until a free name is found
+        :param name: str
+        :param reserve: bool, whether or not returned name is added to the index, so it is not returned again
+        :return: str
+        """
+
+        unique_name = name
+        if unique_name in self:
+            base_name, padding, number = self._split_name(name)
+            used_ranges = self._used_ranges.setdefault(base_name, dict())
+            first_number = number
+            # All the numbers of a stored range are used, so searches starting inside it can skip it
+            used_range = used_ranges.get(padding, None)
+            if used_range and used_range[0] <= number <= used_range[1]:
+                first_number, number = used_range
+            unique_name = '{}{}'.format(base_name, str(number).zfill(padding))
+            while unique_name in self:
+                number += 1
+                unique_name = '{}{}'.format(base_name, str(number).zfill(padding))
+            used_ranges[padding] = (first_number, number)
+
+        if reserve:
+            self.add(unique_name)
+
+        return unique_name
+
+    def _split_name(self, name):
+        """
+        Internal function that splits given name in the base used to generate unique names, the padding of its last
+        number and the first number to try
+        :param name: str
+        :return: tuple(str, int, int)
+        """
+
+        match = LAST_NUMBER_REGEX.match(name)
+        if not match:
+            return '{}_'.format(name), 1, 1
+
+        number = match.group('number')
+
+        return match.group('base'), len(number), int(number) + 1
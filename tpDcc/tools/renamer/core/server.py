@@ -0,0 +1,431 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains base tpDcc-tools-renamer server implementation shared by all DCC servers
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import time
+import logging
+import traceback
+
+from Qt.QtCore import QTimer
+
+from tpDcc import dcc
+from tpDcc.core import server
+
+from tpDcc.tools.renamer.core import protocol, jobs, metrics, sceneindex, engine, pipeline, conflicts, paths
+from tpDcc.tools.renamer.core import categories
+
+LOGGER = logging.getLogger('tpDcc-tools-renamer')
+
+
+class RenamerServer(server.DccServer, object):
+    PORT = 16231
+
+    # Commands that cannot be executed as part of a batch
+    NON_BATCHABLE_COMMANDS = ['batch', 'compact']
+
+    # Maximum number of finished jobs whose progress is kept in the server
+    MAX_FINISHED_JOBS = 20
+
+    # Whether or not server notices scene changes done outside renamer (DCC servers registering scene callbacks)
+    SCENE_CHANGES_TRACKED = False
+
+    # Whether or not _check_node_type result only depends on the type of the node, so it can be reused for all the
+    # nodes with the same type
+    NODE_TYPE_CHECK_BY_TYPE = False
+
+    # Pattern that new node names must match to be valid in the DCC. DCC servers with stricter names override it
+    VALID_NAME_PATTERN = conflicts.VALID_NAME_PATTERN
+
+    def __init__(self, *args, **kwargs):
+        super(RenamerServer, self).__init__(*args, **kwargs)
+
+        self._job_queue = jobs.JobQueue(max_finished_jobs=self.MAX_FINISHED_JOBS)
+        self._job_queue_scheduled = False
+        self._scene_generation = 0
+        self._metrics = metrics.CommandMetrics()
+        self._name_preview = None
+        self._wrap_command_handlers()
+
+    # =================================================================================================================
+    # BASE
+    # =================================================================================================================
+
+    def batch(self, data, reply):
+        commands = data.get('commands', list())
+        stop_on_error = data.get('stop_on_error', False)
+
+        replies = list()
+        failed = False
+        for command_data in commands:
+            if failed and stop_on_error:
+                replies.append({
+                    'cmd': command_data.get('cmd', ''), 'success': False, 'skipped': True,
+                    'msg': 'Skipped because a previous batch command failed', 'result': None})
+                continue
+            command_reply = self._run_command(command_data)
+            if not command_reply['success']:
+                failed = True
+            replies.append(command_reply)
+
+        reply['success'] = True
+        reply['result'] = replies
+
+    def wire_capabilities(self, data, reply):
+        reply['success'] = True
+        reply['result'] = {'formats': protocol.WIRE_FORMATS, 'version': protocol.FRAME_VERSION, 'request_ids': True}
+
+    def compact(self, data, reply):
+        try:
+            command_data = protocol.unpack(protocol.text_to_frame(data.get('frame', '')))
+        except Exception as exc:
+            reply['success'] = False
+            reply['msg'] = 'Impossible to decode compact renamer command: {}'.format(exc)
+            return
+
+        if command_data.get('cmd', '') == 'batch':
+            command_reply = {'cmd': 'batch', 'success': False, 'msg': '', 'result': None}
+            self.batch(command_data, command_reply)
+        else:
+            command_reply = self._run_command(command_data)
+
+        reply['success'] = True
+        reply['result'] = protocol.frame_to_text(protocol.pack(command_reply))
+
+    def job_progress(self, data, reply):
+        job = self._job_queue.get(data.get('job_id', ''))
+        if not job:
+            reply['success'] = False
+            reply['msg'] = 'Renamer job "{}" not found'.format(data.get('job_id', ''))
+            return
+
+        reply['success'] = True
+        reply['result'] = self._job_progress(job)
+
+    def job_result(self, data, reply):
+        job = self._job_queue.get(data.get('job_id', ''))
+        if not job:
+            reply['success'] = False
+            reply['msg'] = 'Renamer job "{}" not found'.format(data.get('job_id', ''))
+            return
+
+        # Results of running jobs are partial. Offset allows to retrieve only the results not retrieved yet
+        offset = max(0, data.get('offset', 0))
+
+        reply['success'] = True
+        reply['result'] = {'progress': self._job_progress(job), 'results': job.results[offset:]}
+
+    def list_jobs(self, data, reply):
+        reply['success'] = True
+        reply['result'] = [self._job_progress(job) for job in self._job_queue.jobs()]
+
+    def cancel_job(self, data, reply):
+        job = self._job_queue.get(data.get('job_id', ''))
+        if not job:
+            reply['success'] = False
+            reply['msg'] = 'Renamer job "{}" not found'.format(data.get('job_id', ''))
+            return
+
+        job.cancel()
+
+        reply['success'] = True
+        reply['result'] = self._job_progress(job)
+
+    def scene_generation(self, data, reply):
+        reply['success'] = True
+        reply['result'] = {'generation': self._scene_generation, 'tracked': self.SCENE_CHANGES_TRACKED}
+
+    def find_unique_names(self, data, reply):
+        scene_index = self._build_scene_index()
+
+        # Returned names are reserved, so names solved in the same call never collide between them
+        reply['success'] = True
+        reply['result'] = [scene_index.find_unique_name(name, reserve=True) for name in data.get('names', list())]
+
+    def preview_rename(self, data, reply):
+        search_hierarchy = data.get('hierarchy_check', False)
+        selection_only = data.get('only_selection', True)
+        filter_type = data.get('filter_type', None)
+
+        try:
+            rename_pipeline = pipeline.RenamePipeline.from_dict(data.get('pipeline', None) or dict())
+        except (ValueError, TypeError) as exc:
+            reply['success'] = False
+            reply['msg'] = 'Invalid rename pipeline: {}'.format(exc)
+            return
+
+        # Nodes are collected as renamer clients collect the nodes they rename, so previews match the renamed names
+        nodes = self._collect_rename_targets(
+            selection_only=selection_only, search_hierarchy=search_hierarchy, filter_type=filter_type,
+            depth_sort=False)
+        nodes_ids = [dcc.node_handle(node) for node in nodes]
+
+        try:
+            name_preview = self._get_name_preview(nodes, nodes_ids)
+            previews = name_preview.preview_names(rename_pipeline)
+        except ValueError as exc:
+            reply['success'] = False
+            reply['msg'] = 'Impossible to generate names: {}'.format(exc)
+            return
+
+        short_names = name_preview.base_names
+
+        reply['success'] = True
+        reply['result'] = [
+            [node_id, old_name, new_name, collision]
+            for node_id, old_name, (new_name, collision) in zip(nodes_ids, short_names, previews)]
+
+    def collect_rename_targets(self, data, reply):
+        reply['success'] = True
+        reply['result'] = self._collect_rename_targets(
+            selection_only=data.get('only_selection', True), search_hierarchy=data.get('hierarchy_check', False),
+            filter_type=data.get('filter_type', None), depth_sort=data.get('depth_sort', True))
+
+    def classify_node_types(self, data, reply):
+        reply['success'] = True
+        reply['result'] = categories.classify_nodes(
+            data.get('nodes', list()), data.get('node_types', list()), dcc.node_type, self._check_node_type,
+            type_based_check=self.NODE_TYPE_CHECK_BY_TYPE)
+
+    def analyze_rename_plan(self, data, reply):
+        plan = data.get('plan', list())
+
+        current_names = list()
+        for plan_entry in plan:
+            node = dcc.find_node_by_id(plan_entry[0], full_path=True) if plan_entry else None
+            current_names.append(dcc.node_short_name(node) if node else None)
+
+        report = conflicts.analyze_rename_plan(
+            plan, current_names, self._build_scene_index(), valid_name_pattern=self.VALID_NAME_PATTERN)
+
+        reply['success'] = True
+        reply['result'] = report.to_dict()
+
+    def command_metrics(self, data, reply):
+        reply['success'] = True
+        reply['result'] = self._metrics.to_dict()
+        if data.get('reset', False):
+            self._metrics.reset()
+
+    # =================================================================================================================
+    # INTERNAL
+    # =================================================================================================================
+
+    def _increment_scene_generation(self, *args):
+        """
+        Internal function that notifies that scene changed, so clients invalidate their cached queries
+        Receives any arguments so it can be used directly as a DCC scene callback
+        """
+
+        self._scene_generation += 1
+
+    def _check_node_type(self, node, category_type):
+        """
+        Internal function that returns whether or not given node matches given category type
+        DCC implementations can inspect the node (not only its type), so result is not reused for other nodes unless
+        NODE_TYPE_CHECK_BY_TYPE is enabled
+        :param node: str
+        :param category_type: str
+        :return: bool
+        """
+
+        return bool(dcc.check_object_type(node, category_type, check_sub_types=True))
+
+    def _build_scene_index(self):
+        """
+        Internal function that returns a new index with the short names of all the nodes of current scene
+        :return: SceneNameIndex
+        """
+
+        return sceneindex.SceneNameIndex.from_paths(dcc.all_scene_nodes(full_path=True) or list())
+
+    def _collect_rename_targets(self, selection_only=True, search_hierarchy=False, filter_type=None, depth_sort=True):
+        """
+        Internal function that returns the full paths of the nodes to rename without duplicates
+        :param selection_only: bool, whether or not only selected nodes are renamed. Otherwise, all scene nodes are
+        :param search_hierarchy: bool, whether or not the descendants of the nodes are also renamed
+        :param filter_type: str or None, type of the nodes to rename
+        :param depth_sort: bool, whether or not nodes are sorted from the deepest to the shallowest one, so they can be
+            renamed by full path. Otherwise, selection and hierarchy order is kept
+        :return: list(str)
+        """
+
+        if filter_type:
+            node_paths = paths.unique_paths(dcc.filter_nodes_by_type(
+                filter_type=filter_type, search_hierarchy=search_hierarchy, selection_only=selection_only) or list())
+            return paths.sort_paths_by_depth(node_paths) if depth_sort else node_paths
+
+        if selection_only:
+            node_paths = dcc.selected_nodes(full_path=True) or list()
+        else:
+            node_paths = dcc.all_scene_nodes(full_path=True) or list()
+        node_paths = paths.unique_paths(node_paths)
+
+        if search_hierarchy:
+            # Nodes whose ancestors are also renamed are listed when expanding the ancestors hierarchy
+            for root_path in paths.minimal_roots(node_paths):
+                node_paths.extend(dcc.list_children(root_path, all_hierarchy=True, full_path=True) or list())
+            node_paths = paths.unique_paths(node_paths)
+
+        return paths.sort_paths_by_depth(node_paths) if depth_sort else node_paths
+
+    def _get_name_preview(self, nodes, nodes_ids):
+        """
+        Internal function that returns the preview used to generate the names of given nodes
+        If server tracks scene changes, the preview is kept while the scene and the nodes do not change, so changing a
+        single rename setting only generates again the affected names
+        :param nodes: list(str)
+        :param nodes_ids: list(str)
+        :return: IncrementalPreview
+        """
+
+        preview_key = (self._scene_generation, tuple(nodes_ids))
+        if self.SCENE_CHANGES_TRACKED and self._name_preview and self._name_preview[0] == preview_key:
+            return self._name_preview[1]
+
+        # Scene is not modified: names are generated against a snapshot of the scene names
+        short_names = [dcc.node_short_name(node) for node in nodes]
+        scene_index = self._build_scene_index()
+        name_preview = engine.IncrementalPreview(
+            short_names, short_names, taken_names=short_names, name_exists=scene_index.__contains__)
+        self._name_preview = (preview_key, name_preview) if self.SCENE_CHANGES_TRACKED else None
+
+        return name_preview
+
+    def _wrap_command_handlers(self):
+        """
+        Internal function that wraps all renamer command handlers, so their execution time is recorded and returned
+        inside the reply of the command, together with the ID of the request if the client sent one
+        """
+
+        for command_name in dir(type(self)):
+            if command_name.startswith('_') or hasattr(server.DccServer, command_name):
+                continue
+            if not callable(getattr(type(self), command_name, None)):
+                continue
+            setattr(self, command_name, self._wrap_command_handler(command_name, getattr(self, command_name)))
+
+    def _wrap_command_handler(self, command_name, handler):
+        """
+        Internal function that returns a function that executes given command handler, records its execution time and
+        echoes the request ID
+        :param command_name: str
+        :param handler: callable
+        :return: callable
+        """
+
+        def _handler(*args, **kwargs):
+            start_time = time.time()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                execute_time = time.time() - start_time
+                data = args[0] if args else kwargs.get('data', None)
+                reply = args[1] if len(args) > 1 else kwargs.get('reply', None)
+                if isinstance(reply, dict):
+                    reply['timing'] = {'execute': execute_time}
+                    if isinstance(data, dict) and 'request_id' in data:
+                        reply['request_id'] = data['request_id']
+                self._metrics.record(command_name, {'execute': execute_time, 'total': execute_time})
+
+        return _handler
+
+    def _start_job(self, job, reply):
+        """
+        Internal function that adds given job to the server job queue. Job chunks are executed within server event
+        loop, so other commands (such as job progress or cancel requests) are processed between chunks
+        Jobs are executed one after another, in the same order they were started
+        :param job: RenamerJob
+        :param reply: dict
+        """
+
+        self._job_queue.submit(job)
+        if not self._job_queue_scheduled:
+            self._job_queue_scheduled = True
+            QTimer.singleShot(0, self._run_job_queue_chunk)
+
+        reply['success'] = True
+        reply['result'] = self._job_progress(job)
+
+    def _run_job_queue_chunk(self):
+        """
+        Internal function that executes next chunk of the job queue and schedules the following one
+        """
+
+        if self._job_queue.run_next_chunk():
+            QTimer.singleShot(0, self._run_job_queue_chunk)
+        else:
+            self._job_queue_scheduled = False
+
+    def _job_progress(self, job):
+        """
+        Internal function that returns the progress of given job, including its position in the job queue
+        :param job: RenamerJob
+        :return: dict
+        """
+
+        progress = job.progress()
+        progress['position'] = self._job_queue.position(job.id)
+
+        return progress
+
+    def _get_command_handler(self, command_name):
+        """
+        Internal function that returns the renamer server function that handles the command with given name
+        :param command_name: str
+        :return: callable or None
+        """
+
+        if not command_name or command_name.startswith('_') or hasattr(server.DccServer, command_name):
+            return None
+
+        handler = getattr(self, command_name, None)
+
+        return handler if callable(handler) else None
+
+    def _run_command(self, command_data):
+        """
+        Internal function that executes a single command in the server and returns its reply
+        Renamer commands are executed by its server handler and the rest of commands are forwarded to tpDcc
+        :param command_data: dict
+        :return: dict
+        """
+
+        command_name = command_data.get('cmd', '')
+        command_reply = {'cmd': command_name, 'success': False, 'msg': '', 'result': None}
+
+        if command_name in self.NON_BATCHABLE_COMMANDS:
+            command_reply['msg'] = 'Command "{}" cannot be executed inside a batch'.format(command_name)
+            return command_reply
+
+        try:
+            handler = self._get_command_handler(command_name)
+            if handler:
+                # Renamer handlers read their arguments by name, so batch commands kwargs are used as command data
+                handler_data = dict(command_data.get('kwargs', None) or dict())
+                handler_data.update(
+                    (key, value) for key, value in command_data.items() if key not in ('args', 'kwargs'))
+                handler(handler_data, command_reply)
+            else:
+                dcc_fn = getattr(dcc, command_name, None)
+                if not dcc_fn or not callable(dcc_fn):
+                    command_reply['msg'] = 'Command "{}" is not supported by renamer server'.format(command_name)
+                    return command_reply
+                args = command_data.get('args', list())
+                kwargs = command_data.get('kwargs', dict())
+                start_time = time.time()
+                command_reply['result'] = dcc_fn(*args, **kwargs)
+                command_reply['success'] = True
+                execute_time = time.time() - start_time
+                command_reply['timing'] = {'execute': execute_time}
+                self._metrics.record(command_name, {'execute': execute_time, 'total': execute_time})
+        except Exception as exc:
+            LOGGER.error('Error while executing renamer command "{}": {}'.format(command_name, exc))
+            command_reply['success'] = False
+            command_reply['msg'] = traceback.format_exc()
+
+        return command_reply
@@ -49,7 +49,8 @@ class RenamerToolset(toolset.ToolsetWidget, object):
         naming_lib = self._naming_lib or namelib.NameLib(naming_file=naming_file)
 
         config = configs.get_config(config_name=self.ID, environment='development' if self._dev else 'production')
-        renamer_model = model.RenamerModel(config=config, naming_config=self._naming_config)
+        renamer_model = model.RenamerModel(
+            config=config, naming_config=self._naming_config, client=self.client)
         renamer_controller = controller.RenamerController(
             naming_lib=naming_lib, client=self.client, model=renamer_model)
         renamer_view = view.RenamerView(model=renamer_model, controller=renamer_controller, parent=self)
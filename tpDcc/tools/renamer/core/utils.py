@@ -11,53 +11,186 @@ import logging
 
 from tpDcc import dcc
 
-from tpDcc.tools.renamer.core import consts
+from tpDcc.tools.renamer.core import consts, paths
 
 LOGGER = logging.getLogger('tpDcc-tools-renamer')
 
-
-def get_objects_to_rename(hierarchy_check, selection_type, uuid=False):
-
-    if dcc.client(consts.TOOL_ID).is_maya():
-        import maya.OpenMaya
+# Maximum number of nodes of each chunk returned by iter_objects_to_rename
+OBJECTS_CHUNK_SIZE = 5000
+
+
+def get_objects_to_rename(hierarchy_check, selection_type, uuid=False, depth_sort=True, filter_type=None):
+    """
+    Returns all the nodes to rename in a single list
+    Used by operations that need all the nodes at once. Operations that can process nodes in chunks should use
+    iter_objects_to_rename instead
+    :param hierarchy_check: bool
+    :param selection_type: int, 0 to rename selected nodes or 1 to rename all scene nodes
+    :param uuid: bool, whether or not Maya nodes are returned as MObjectHandle instances
+    :param depth_sort: bool, whether or not paths are sorted from the deepest to the shallowest one
+    :param filter_type: str or None, type of the nodes to rename
+    :return: list(str or MObjectHandle) or None
+    """
+
+    objs_to_rename = list()
+    for objs_chunk in iter_objects_to_rename(
+            hierarchy_check, selection_type, uuid=uuid, depth_sort=depth_sort, filter_type=filter_type):
+        objs_to_rename.extend(objs_chunk)
+
+    return objs_to_rename or None
+
+
+def iter_objects_to_rename(
+        hierarchy_check, selection_type, uuid=False, depth_sort=True, chunk_size=OBJECTS_CHUNK_SIZE, filter_type=None):
+    """
+    Yields the nodes to rename in chunks, in the order they must be renamed
+    Nodes order depends on all the nodes to rename, so their paths are retrieved at once, but Maya handles are only
+    created for the chunk that is yielded. Paths are sorted from the deepest to the shallowest one, so chunks can be
+    renamed before the next one is requested: renaming a chunk never invalidates the paths of the next chunks.
+    Handles are not invalidated by renames, so they keep selection and hierarchy order, used to number the nodes
+    :param hierarchy_check: bool
+    :param selection_type: int, 0 to rename selected nodes or 1 to rename all scene nodes
+    :param uuid: bool, whether or not Maya nodes are returned as MObjectHandle instances
+    :param depth_sort: bool, whether or not paths are sorted from the deepest to the shallowest one. Callers that
+        rename nodes by UUID disable it, so nodes keep selection and hierarchy order
+    :param chunk_size: int, maximum number of nodes of each chunk
+    :param filter_type: str or None, type of the nodes to rename. Server collects the nodes of its rename previews
+        with the same function, so previews and renames always use the same nodes
+    :return: generator(list(str or MObjectHandle))
+    """
+
+    client = dcc.client(consts.TOOL_ID)
 
     search_hierarchy = hierarchy_check
     search_selection = True if selection_type == 0 else False
+    use_handles = uuid and client.is_maya()
+    depth_sort = depth_sort and not use_handles
 
-    if not search_selection:
-        objs_to_rename = dcc.client(consts.TOOL_ID).all_scene_nodes(full_path=True)
-    else:
-        objs_to_rename = dcc.client(consts.TOOL_ID).selected_nodes(full_path=True)
+    # Renamer server expands hierarchies, removes duplicates and sorts the nodes in a single request
+    objs_to_rename = client.collect_rename_targets(
+        hierarchy_check=search_hierarchy, only_selection=search_selection, filter_type=filter_type,
+        depth_sort=depth_sort)
+    if objs_to_rename is None:
+        objs_to_rename = _collect_objects_to_rename(
+            client, search_hierarchy, search_selection, filter_type=filter_type, depth_sort=depth_sort)
 
     if not objs_to_rename:
         LOGGER.warning('No objects to rename!')
         return
 
-    if search_hierarchy:
-        children_list = list()
-        for obj in objs_to_rename:
-            children = dcc.client(consts.TOOL_ID).list_children(obj, all_hierarchy=True, full_path=True)
-            if children:
-                children_list.extend(children)
-        children_list = list(set(children_list))
-        objs_to_rename.extend(children_list)
-
-    if uuid and dcc.client(consts.TOOL_ID).is_maya():
-        import tpDcc.dccs.maya as maya
-
-        handles_list = list()
-        # objs_to_rename = [obj for obj in objs_to_rename if dcc.node_type(obj) == 'transform']
-        for obj in objs_to_rename:
-            mobj = maya.OpenMaya.MObject()
-            sel = maya.OpenMaya.MSelectionList()
-            sel.add(obj)
-            sel.getDependNode(0, mobj)
-            handle = maya.OpenMaya.MObjectHandle(mobj)
-            handles_list.append(handle)
-        return handles_list
+    chunk_size = max(1, chunk_size)
+    for i in range(0, len(objs_to_rename), chunk_size):
+        objs_chunk = objs_to_rename[i:i + chunk_size]
+        yield _get_node_handles(objs_chunk) if use_handles else objs_chunk
+
+
+def _get_node_handles(node_paths):
+    """
+    Internal function that returns the Maya object handles of the nodes with given paths
+    All the nodes are added to a single selection list
+    :param node_paths: list(str)
+    :return: list(MObjectHandle)
+    """
+
+    import tpDcc.dccs.maya as maya
+
+    sel = maya.OpenMaya.MSelectionList()
+    for node_path in node_paths:
+        sel.add(node_path)
+
+    handles_list = list()
+    for i in range(sel.length()):
+        mobj = maya.OpenMaya.MObject()
+        sel.getDependNode(i, mobj)
+        handles_list.append(maya.OpenMaya.MObjectHandle(mobj))
+
+    return handles_list
+
+
+def _collect_objects_to_rename(client, search_hierarchy, search_selection, filter_type=None, depth_sort=True):
+    """
+    Internal function that returns the nodes to rename using a request per node hierarchy
+    Used with renamer servers that do not support collect_rename_targets command
+    :param client: RenamerClient
+    :param search_hierarchy: bool
+    :param search_selection: bool
+    :param filter_type: str or None, type of the nodes to rename
+    :param depth_sort: bool, whether or not nodes are sorted from the deepest to the shallowest one
+    :return: list(str)
+    """
+
+    if filter_type:
+        objs_to_rename = paths.unique_paths(client.filter_nodes_by_type(
+            filter_type=filter_type, search_hierarchy=search_hierarchy, selection_only=search_selection) or list())
+        return paths.sort_paths_by_depth(objs_to_rename) if depth_sort else objs_to_rename
+
+    if not search_selection:
+        objs_to_rename = client.all_scene_nodes(full_path=True)
     else:
-        # We reverse the list so we update first children and later parents, otherwise we will have
-        # problems during renaming if we use full paths
-        objs_to_rename.reverse()
+        objs_to_rename = client.selected_nodes(full_path=True)
+    if not objs_to_rename:
+        return list()
 
-    return objs_to_rename
+    if search_hierarchy:
+        for obj in paths.minimal_roots(objs_to_rename):
+            children = client.list_children(obj, all_hierarchy=True, full_path=True)
+            if children:
+                objs_to_rename.extend(children)
+
+    objs_to_rename = paths.unique_paths(objs_to_rename)
+    if not depth_sort:
+        return objs_to_rename
+
+    # Nodes are renamed from the deepest to the shallowest one, so renaming a node never invalidates the full paths
+    # of the nodes renamed after it, even if the list mixes unrelated hierarchies
+    return paths.sort_paths_by_depth(objs_to_rename)
+
+
+def resolve_node(node):
+    """
+    Returns the full path and the UUID of given node
+    Used to resolve the nodes of renamer operations node caches
+    :param node: str, MObjectHandle or item with handle or full_name attributes
+    :return: tuple(str, str) or None
+    """
+
+    handle = getattr(node, 'handle', node)
+    if hasattr(handle, 'object') and dcc.is_maya():
+        resolved = _resolve_maya_handle(handle)
+        if resolved or not hasattr(node, 'full_name'):
+            return resolved
+
+    full_path = getattr(node, 'full_name', node)
+    try:
+        node_id = dcc.node_handle(full_path)
+    except Exception as exc:
+        LOGGER.warning('Impossible to retrieve UUID of node "{}" | {}'.format(full_path, exc))
+        return None
+
+    return full_path, node_id
+
+
+def _resolve_maya_handle(handle):
+    """
+    Internal function that returns the full path and the UUID of the Maya node of given handle
+    :param handle: MObjectHandle
+    :return: tuple(str, str) or None
+    """
+
+    import tpDcc.dccs.maya as maya
+
+    try:
+        if not handle.isValid():
+            return None
+        mobj = handle.object()
+        dependency_node = maya.OpenMaya.MFnDependencyNode(mobj)
+        if mobj.hasFn(maya.OpenMaya.MFn.kDagNode):
+            dag_path = maya.OpenMaya.MDagPath()
+            maya.OpenMaya.MDagPath.getAPathTo(mobj, dag_path)
+            full_path = dag_path.fullPathName()
+        else:
+            full_path = dependency_node.name()
+        return full_path, dependency_node.uuid().asString()
+    except Exception as exc:
+        LOGGER.warning('Error while retrieving node path from MObject: {}'.format(exc))
+        return None
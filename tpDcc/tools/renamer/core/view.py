@@ -160,7 +160,7 @@ class RenamerView(base.BaseWidget, object):
         nodes_to_discard = self._model.nodes_to_discard
         types_to_discard = self._model.types_to_discard
         for node_type in types_to_discard:
-            nodes_to_discard.extend(dcc.client().list_nodes(node_type=node_type))
+            nodes_to_discard.extend(self._controller.client.cached_query('list_nodes', node_type=node_type))
 
         for i, category in enumerate(categories):
             for category_name, category_data in category.items():
@@ -175,7 +175,8 @@ class RenamerView(base.BaseWidget, object):
                     category_btn.setChecked(True)
                 self._buttons_grp.addButton(category_btn)
                 self._categories_layout.addWidget(category_btn)
-                category_widget = categorywidget.CategoryWidget(types=types, nodes_to_discard=nodes_to_discard)
+                category_widget = categorywidget.CategoryWidget(
+                    types=types, nodes_to_discard=nodes_to_discard, client=self._controller.client)
                 self._stack.addWidget(category_widget)
 
                 # category_widget.doRefresh.connect(self._on_refresh_category)
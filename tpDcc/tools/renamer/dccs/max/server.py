@@ -8,12 +8,14 @@ Module that contains tpDcc-tools-renamer server implementation for 3ds Max
 from __future__ import print_function, division, absolute_import
 
 from tpDcc import dcc
-from tpDcc.core import server
 
+from tpDcc.tools.renamer.core import server
 
-class RenamerServer(server.DccServer, object):
+
+class RenamerServer(server.RenamerServer, object):
     PORT = 16231
 
+    @dcc.undo_decorator()
     def simple_rename(self, data, reply):
         new_name = data.get('new_name', '')
         if not new_name:
@@ -29,6 +31,31 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
+    def apply_rename_plan(self, data, reply):
+        plan = data.get('plan', list())
+        if not plan:
+            reply['msg'] = 'No rename plan to apply defined.'
+            reply['success'] = False
+            return
+
+        renamed = 0
+        failed = dict()
+        for node_id, new_name, _ in plan:
+            node = dcc.find_node_by_id(node_id, full_path=True)
+            if not node:
+                failed[node_id] = 'Node with ID "{}" not found in current scene'.format(node_id)
+                continue
+            try:
+                dcc.rename_node(node, new_name)
+                renamed += 1
+            except Exception as exc:
+                failed[node_id] = str(exc)
+
+        reply['success'] = True
+        reply['result'] = {'renamed': renamed, 'failed': failed}
+
+    @dcc.undo_decorator()
     def add_prefix(self, data, reply):
 
         prefix_text = data.get('prefix_text', '')
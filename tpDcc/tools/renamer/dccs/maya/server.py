@@ -8,22 +8,68 @@ Module that contains tpDcc-tools-renamer server implementation for Maya
 from __future__ import print_function, division, absolute_import
 
 import logging
+from functools import partial
 from collections import OrderedDict
 
+import maya.cmds
 import maya.api.OpenMaya
 
 from tpDcc import dcc
-from tpDcc.core import server
 
-from tpDcc.dccs.maya import api
 from tpDcc.dccs.maya.core import namespace, gui
 
+from tpDcc.tools.renamer.core import server, jobs, pipeline, conflicts, paths
+
 LOGGER = logging.getLogger('tpDcc-tools-renamer')
 
 
-class RenamerServer(server.DccServer, object):
+def _remove_scene_callbacks(callback_ids, *args):
+    """
+    Removes given Maya callbacks
+    :param callback_ids: list(int)
+    """
+
+    for callback_id in callback_ids:
+        try:
+            maya.api.OpenMaya.MMessage.removeCallback(callback_id)
+        except Exception as exc:
+            LOGGER.warning('Impossible to remove renamer scene callback: {}'.format(exc))
+    del callback_ids[:]
+
+
+def _undo_chunk_fn(chunk_name, chunk_fn):
+    """
+    Returns a function that executes given job chunk function inside its own undo chunk
+    Undo chunks are never kept open between job chunks: Maya processes user actions between them, so those actions
+    would be merged into the renamer undo chunk
+    :param chunk_name: str
+    :param chunk_fn: callable
+    :return: callable
+    """
+
+    def _run_chunk(chunk):
+        maya.cmds.undoInfo(openChunk=True, chunkName=chunk_name)
+        try:
+            return chunk_fn(chunk)
+        finally:
+            maya.cmds.undoInfo(closeChunk=True)
+
+    return _run_chunk
+
+
+class RenamerServer(server.RenamerServer, object):
     PORT = 16231
+    SCENE_CHANGES_TRACKED = True
+    VALID_NAME_PATTERN = conflicts.MAYA_NAME_PATTERN
+
+    def __init__(self, *args, **kwargs):
+        super(RenamerServer, self).__init__(*args, **kwargs)
 
+        self._scene_callback_ids = list()
+        self._register_scene_callbacks()
+        self.destroyed.connect(partial(_remove_scene_callbacks, self._scene_callback_ids))
+
+    @dcc.undo_decorator()
     def simple_rename(self, data, reply):
 
         new_name = data.get('new_name', '')
@@ -41,6 +87,26 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
+    def apply_rename_plan(self, data, reply):
+        plan = data.get('plan', list())
+        if not plan:
+            reply['msg'] = 'No rename plan to apply defined.'
+            reply['success'] = False
+            return
+
+        if data.get('job'):
+            chunk_size = data.get('chunk_size', jobs.RenamerJob.DEFAULT_CHUNK_SIZE)
+            # Each chunk is a different undo entry, so user actions executed between chunks are never undone with it
+            job = jobs.RenamerJob(
+                'apply_rename_plan', plan, _undo_chunk_fn('apply_rename_plan', self._apply_rename_entries),
+                chunk_size=chunk_size)
+            self._start_job(job, reply)
+            return
+
+        reply['success'] = True
+        reply['result'] = self._apply_rename_entries(plan)
+
     def find_auto_solved_data(self, data, reply):
 
         auto_rename_data = OrderedDict()
@@ -52,7 +118,8 @@ class RenamerServer(server.DccServer, object):
         if not nodes:
             nodes = dcc.selected_nodes()
 
-        for i, obj_name in enumerate(reversed(nodes)):
+        # Nodes are solved in the given order, because it is the order used to number them
+        for obj_name in nodes:
             node_uuid = dcc.node_handle(obj_name)
             if node_uuid in auto_rename_data:
                 LOGGER.warning(
@@ -100,6 +167,7 @@ class RenamerServer(server.DccServer, object):
         reply['success'] = True
         reply['result'] = auto_rename_data
 
+    @dcc.undo_decorator()
     def add_prefix(self, data, reply):
 
         prefix_text = data.get('prefix_text', '')
@@ -124,6 +192,7 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def remove_prefix(self, data, reply):
         rename_shape = data.get('rename_shape', True)
         search_hierarchy = data.get('hierarchy_check', False)
@@ -141,6 +210,7 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def remove_first(self, data, reply):
         num_to_remove = data.get('count', 0)
         rename_shape = data.get('rename_shape', True)
@@ -173,6 +243,7 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def add_suffix(self, data, reply):
         suffix_text = data.get('suffix_text', '')
         if not suffix_text:
@@ -191,6 +262,7 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def remove_suffix(self, data, reply):
         rename_shape = data.get('rename_shape', True)
         search_hierarchy = data.get('hierarchy_check', False)
@@ -210,6 +282,7 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def remove_last(self, data, reply):
         num_to_remove = data.get('count', 0)
         rename_shape = data.get('rename_shape', True)
@@ -246,6 +319,7 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def replace_padding(self, data, reply):
         pad = data.get('pad', 0)
         rename_shape = data.get('rename_shape', True)
@@ -274,6 +348,7 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def append_padding(self, data, reply):
         pad = data.get('pad', 0)
         rename_shape = data.get('rename_shape', True)
@@ -302,6 +377,7 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def change_padding(self, data, reply):
         pad = data.get('pad', 0)
         rename_shape = data.get('rename_shape', True)
@@ -330,6 +406,7 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def add_side(self, data, reply):
         side = data.get('side', None)
         rename_shape = data.get('rename_shape', True)
@@ -351,6 +428,7 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def add_replace_namespace(self, data, reply):
         namespace_to_add = data.get('namespace', None)
         rename_shape = data.get('rename_shape', True)
@@ -365,6 +443,15 @@ class RenamerServer(server.DccServer, object):
             reply['msg'] = msg
             return
 
+        if data.get('job', False):
+            self._start_selection_job(
+                'add_replace_namespace', data, reply,
+                lambda nodes: self._run_over_nodes(nodes, lambda: namespace.assign_namespace_to_object_by_filter(
+                    namespace=namespace_to_add, filter_type=filter_type, force_create=True, rename_shape=rename_shape,
+                    search_hierarchy=False, selection_only=True, dag=False, remove_maya_defaults=True,
+                    transforms_only=True)))
+            return
+
         namespace.assign_namespace_to_object_by_filter(
             namespace=namespace_to_add, filter_type=filter_type, force_create=True, rename_shape=rename_shape,
             search_hierarchy=search_hierarchy, selection_only=selection_only, dag=False, remove_maya_defaults=True,
@@ -372,6 +459,7 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def remove_namespace(self, data, reply):
         namespace_to_remove = data.get('namespace', None)
         rename_shape = data.get('rename_shape', True)
@@ -393,72 +481,116 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def search_and_replace(self, data, reply):
-        search_str = data.get('search', '')
-        replace_str = data.get('replace', '')
         nodes = data.get('nodes', list())
-        if not nodes:
-            nodes = dcc.selected_nodes()
 
-        handles_list = list()
-        for obj in nodes:
-            sel = api.SelectionList()
-            sel.add(obj)
-            mobj = sel.get_depend_node(0)
-            handle = maya.api.OpenMaya.MObjectHandle(mobj)
-            handles_list.append(handle)
-
-        new_name = None
-        for node_handle in handles_list:
-            node = node_handle
+        # Pattern is compiled and replace template is checked once, before renaming any node
+        try:
+            replace_stage = pipeline.ReplaceStage(
+                data.get('search', ''), data.get('replace', ''), regex=data.get('regex', False),
+                ignore_case=data.get('ignore_case', False), whole_word=data.get('whole_word', False))
+        except ValueError as exc:
+            reply['success'] = False
+            reply['msg'] = str(exc)
+            return
+
+        # All nodes are resolved in a single ls call. Nodes are renamed from the deepest to the shallowest one, so
+        # renaming a node never invalidates the full paths of the nodes renamed after it
+        node_paths = (maya.cmds.ls(nodes, long=True) if nodes else maya.cmds.ls(sl=True, long=True)) or list()
+        node_paths = paths.sort_paths_by_depth(paths.unique_paths(node_paths))
+
+        matched = 0
+        changed = 0
+        skipped = 0
+        for node in node_paths:
+            short_name = node.rsplit('|', 1)[-1]
+            new_name, count = replace_stage.substitute(short_name)
+            if not count:
+                continue
+            matched += 1
+            if not new_name or new_name == short_name:
+                skipped += 1
+                continue
             try:
-                mobj = node_handle.object()
-                dag_path = maya.api.OpenMaya.MDagPath.getAPathTo(mobj)
-                node = dag_path.partialPathName()
-                obj_short_name = dag_path.partialPathName()
-                new_name = obj_short_name.replace(search_str, replace_str)
                 dcc.rename_node(node, new_name)
+                changed += 1
             except Exception as exc:
                 LOGGER.warning('Impossible to rename {} >> {} | {}'.format(node, new_name, exc))
+                skipped += 1
 
         reply['success'] = True
+        reply['result'] = {'nodes': len(node_paths), 'matched': matched, 'changed': changed, 'skipped': skipped}
 
+    @dcc.undo_decorator()
     def automatic_suffix(self, data, reply):
         rename_shape = data.get('rename_shape', True)
         search_hierarchy = data.get('hierarchy_check', False)
         selection_only = data.get('only_selection', True)
         filter_type = data.get('filter_type', None)
 
+        if data.get('job', False):
+            self._start_selection_job(
+                'automatic_suffix', data, reply,
+                lambda nodes: self._run_over_nodes(nodes, lambda: dcc.auto_name_suffix(
+                    filter_type=filter_type, rename_shape=rename_shape, search_hierarchy=False, selection_only=True)))
+            return
+
         dcc.auto_name_suffix(
             filter_type=filter_type, rename_shape=rename_shape, search_hierarchy=search_hierarchy,
             selection_only=selection_only)
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def make_unique_name(self, data, reply):
         rename_shape = data.get('rename_shape', True)
         search_hierarchy = data.get('hierarchy_check', False)
         selection_only = data.get('only_selection', True)
         filter_type = data.get('filter_type', None)
 
-        dcc.find_unique_name(
-            filter_type=filter_type, do_rename=True, rename_shape=rename_shape, search_hierarchy=search_hierarchy,
-            selection_only=selection_only)
+        if data.get('job', False):
+            # Scene index is built when the job starts and it is shared by all its chunks
+            scene_indices = list()
+
+            def _make_unique_nodes_names(nodes):
+                if not scene_indices:
+                    scene_indices.append(self._build_scene_index())
+                self._make_unique_names(maya.cmds.ls(nodes, uuid=True) or list(), rename_shape, scene_indices[0])
+
+            self._start_selection_job('make_unique_name', data, reply, _make_unique_nodes_names)
+            return
+
+        nodes = dcc.filter_nodes_by_type(
+            filter_type=filter_type, search_hierarchy=search_hierarchy, selection_only=selection_only)
+        if nodes:
+            self._make_unique_names(
+                maya.cmds.ls(nodes, uuid=True) or list(), rename_shape, self._build_scene_index())
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def remove_all_numbers(self, data, reply):
         rename_shape = data.get('rename_shape', True)
         search_hierarchy = data.get('hierarchy_check', False)
         selection_only = data.get('only_selection', True)
         filter_type = data.get('filter_type', None)
 
+        if data.get('job', False):
+            self._start_selection_job(
+                'remove_all_numbers', data, reply,
+                lambda nodes: self._run_over_nodes(nodes, lambda: dcc.remove_name_numbers(
+                    filter_type=filter_type, rename_shape=rename_shape, search_hierarchy=False, selection_only=True,
+                    trailing_only=False)))
+            return
+
         dcc.remove_name_numbers(
             filter_type=filter_type, rename_shape=rename_shape, search_hierarchy=search_hierarchy,
             selection_only=selection_only, trailing_only=False)
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def remove_trail_numbers(self, data, reply):
         rename_shape = data.get('rename_shape', True)
         search_hierarchy = data.get('hierarchy_check', False)
@@ -471,6 +603,7 @@ class RenamerServer(server.DccServer, object):
 
         reply['success'] = True
 
+    @dcc.undo_decorator()
     def clean_unused_namespaces(self, data, reply):
         namespace.remove_empty_namespaces()
         reply['success'] = True
@@ -485,3 +618,132 @@ class RenamerServer(server.DccServer, object):
 
     def rename(self):
         pass
+
+    def _apply_rename_entries(self, plan):
+        """
+        Internal function that renames the nodes of given rename plan entries
+        :param plan: list(tuple(str, str, bool)), list of (node UUID, new short name, rename_shape) entries
+        :return: dict, dictionary containing the number of renamed nodes and the nodes that failed to be renamed
+        """
+
+        renamed = 0
+        failed = OrderedDict()
+        for node_uuid, new_name, rename_shape in plan:
+            node = dcc.find_node_by_id(node_uuid, full_path=True)
+            if not node:
+                failed[node_uuid] = 'Node with UUID "{}" not found in current scene'.format(node_uuid)
+                continue
+            try:
+                dcc.rename_node(node, new_name, rename_shape=rename_shape)
+                renamed += 1
+            except Exception as exc:
+                LOGGER.warning('Impossible to rename {} >> {} | {}'.format(node, new_name, exc))
+                failed[node_uuid] = str(exc)
+
+        return {'renamed': renamed, 'failed': failed}
+
+    def _make_unique_names(self, nodes_uuids, rename_shape, scene_index):
+        """
+        Internal function that renames the nodes with given UUIDs whose short name is used by other nodes
+        Unique names are found by the scene index instead of tpDcc find_unique_name: their last number is increased
+        (keeping its padding) or "_1" is appended if they have no number
+        :param nodes_uuids: list(str)
+        :param rename_shape: bool
+        :param scene_index: SceneNameIndex, index that is updated with the new names
+        """
+
+        for node_uuid in nodes_uuids:
+            node = (maya.cmds.ls(node_uuid, long=True) or [None])[0]
+            if not node:
+                continue
+            short_name = node.rsplit('|', 1)[-1]
+            if scene_index.count(short_name) <= 1:
+                continue
+            unique_name = scene_index.find_unique_name(short_name)
+            shapes = (maya.cmds.listRelatives(node, shapes=True, fullPath=True) or list()) if rename_shape else list()
+            try:
+                dcc.rename_node(node, unique_name, rename_shape=rename_shape)
+            except Exception as exc:
+                LOGGER.warning('Impossible to rename {} >> {} | {}'.format(node, unique_name, exc))
+                continue
+
+            # Maya can modify the given name, so we update the index with the actual names of the renamed nodes
+            new_node = (maya.cmds.ls(node_uuid, long=True) or [node])[0]
+            scene_index.rename(short_name, new_node.rsplit('|', 1)[-1])
+            # Shapes names can be used by other nodes, so they are listed by full path and indexed by short name
+            if shapes:
+                for shape in shapes:
+                    scene_index.remove(shape.rsplit('|', 1)[-1])
+                for shape in maya.cmds.listRelatives(new_node, shapes=True, fullPath=True) or list():
+                    scene_index.add(shape.rsplit('|', 1)[-1])
+
+    def _register_scene_callbacks(self):
+        """
+        Internal function that registers Maya callbacks that increment scene generation each time a node is created,
+        deleted, renamed or reparented or a new scene is opened. Reparenting a node changes the full paths of all its
+        descendants, so cached full paths cannot be used after it
+        """
+
+        om = maya.api.OpenMaya
+        try:
+            self._scene_callback_ids.extend([
+                om.MDGMessage.addNodeAddedCallback(self._increment_scene_generation, 'dependNode'),
+                om.MDGMessage.addNodeRemovedCallback(self._increment_scene_generation, 'dependNode'),
+                om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, self._increment_scene_generation),
+                om.MDagMessage.addParentAddedCallback(self._increment_scene_generation),
+                om.MDagMessage.addParentRemovedCallback(self._increment_scene_generation),
+                om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, self._increment_scene_generation),
+                om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, self._increment_scene_generation)
+            ])
+        except Exception as exc:
+            LOGGER.warning('Impossible to register renamer scene callbacks: {}'.format(exc))
+            _remove_scene_callbacks(self._scene_callback_ids)
+            self.SCENE_CHANGES_TRACKED = False
+
+    def _start_selection_job(self, name, data, reply, operation_fn):
+        """
+        Internal function that starts a job that executes given operation over the filtered nodes in chunks
+        Each chunk is executed in its own undo chunk, so undo chunks are never kept open while Maya processes user
+        actions between chunks
+        :param name: str, name of the job
+        :param data: dict, command data
+        :param reply: dict, command reply
+        :param operation_fn: callable, function that executes the operation over the given list of nodes full paths
+        """
+
+        search_hierarchy = data.get('hierarchy_check', False)
+        selection_only = data.get('only_selection', True)
+        filter_type = data.get('filter_type', None)
+        chunk_size = data.get('chunk_size', jobs.RenamerJob.DEFAULT_CHUNK_SIZE)
+
+        # Nodes are stored by UUID because their names will change while the job is executed
+        nodes = dcc.filter_nodes_by_type(
+            filter_type=filter_type, search_hierarchy=search_hierarchy, selection_only=selection_only)
+        nodes_uuids = maya.cmds.ls(nodes, uuid=True) if nodes else list()
+
+        def _run_chunk(chunk_uuids):
+            chunk_nodes = maya.cmds.ls(chunk_uuids, long=True)
+            if chunk_nodes:
+                operation_fn(chunk_nodes)
+
+        job = jobs.RenamerJob(name, nodes_uuids, _undo_chunk_fn(name, _run_chunk), chunk_size=chunk_size)
+        self._start_job(job, reply)
+
+    def _run_over_nodes(self, nodes, operation_fn):
+        """
+        Internal function that executes given operation, that works over selected nodes, over given nodes
+        User selection is restored before returning, so it does not change while a job is executed
+        :param nodes: list(str)
+        :param operation_fn: callable
+        """
+
+        selection_uuids = maya.cmds.ls(sl=True, uuid=True) or list()
+        maya.cmds.select(nodes, replace=True)
+        try:
+            operation_fn()
+        finally:
+            selection = maya.cmds.ls(selection_uuids, long=True) if selection_uuids else None
+            if selection:
+                maya.cmds.select(selection, replace=True)
+            else:
+                maya.cmds.select(clear=True)
@@ -15,6 +15,8 @@ from tpDcc.managers import resources
 from tpDcc.libs.qt.core import base
 from tpDcc.libs.qt.widgets import layouts, search, buttons, dividers, checkbox
 
+from tpDcc.tools.renamer.core import paths, categories
+
 
 class CategoryWidget(base.BaseWidget, object):
 
@@ -23,8 +25,9 @@ class CategoryWidget(base.BaseWidget, object):
     doRename = Signal()
     togglePreview = Signal()
 
-    def __init__(self, types, nodes_to_discard=None, parent=None):
+    def __init__(self, types, nodes_to_discard=None, client=None, parent=None):
         self._types = types
+        self._client = client
         self._default_nodes_to_discard = nodes_to_discard or list()
         self._category_buttons = list()
         super(CategoryWidget, self).__init__(parent=parent)
@@ -131,22 +134,33 @@ class CategoryWidget(base.BaseWidget, object):
         try:
             objs_names = list()
             if not selected_objects:
-                objs_names.extend(dcc.client().all_scene_nodes(full_path=True))
+                objs_names.extend(self._query('all_scene_nodes', full_path=True))
             else:
                 objs_names.extend(dcc.client().selected_nodes(full_path=True))
                 if objs_names and hierarchy:
-                    children_list = list()
-                    for obj in objs_names:
-                        children = dcc.client().list_children(obj, all_hierarchy=True, full_path=True)
+                    # Only selected nodes whose ancestors are not selected are expanded
+                    for obj in paths.minimal_roots(objs_names):
+                        children = self._query('list_children', obj, all_hierarchy=True, full_path=True)
                         if children:
-                            children_list.extend(children)
-                    children_list = list(set(children_list))
-                    objs_names.extend(children_list)
+                            objs_names.extend(children)
+                    objs_names = paths.unique_paths(objs_names)
             self._update_names_list(objs_names)
             self._on_filter_names_changed(self._names_filter.get_text())
         finally:
             self._names_list.setSortingEnabled(False)
 
+    def _query(self, query_name, *args, **kwargs):
+        """
+        Internal function that executes given DCC query, using renamer client cache if available
+        :param query_name: str
+        :return: object
+        """
+
+        if self._client:
+            return self._client.cached_query(query_name, *args, **kwargs)
+
+        return getattr(dcc.client(), query_name)(*args, **kwargs)
+
     def _setup_types(self):
         for i, category_type in enumerate(self._types):
             for type_name, type_data in category_type.items():
@@ -177,7 +191,7 @@ class CategoryWidget(base.BaseWidget, object):
         discard_nodes = self._default_nodes_to_discard[:] or list()
 
         if self._hide_default_scene_nodes_cbx and self._hide_default_scene_nodes_cbx.isChecked():
-            discard_nodes.extend(dcc.client().default_scene_nodes(full_path=False))
+            discard_nodes.extend(self._query('default_scene_nodes', full_path=False))
 
         # discard_nodes.extend(dcc.list_nodes(node_type='camera'))
 
@@ -185,7 +199,7 @@ class CategoryWidget(base.BaseWidget, object):
             if not btn.isChecked():
                 dcc_type = btn.property('dcc_type')
                 if dcc_type:
-                    discard_nodes.extend(dcc.client().list_nodes(node_type=btn.property('dcc_type')))
+                    discard_nodes.extend(self._query('list_nodes', node_type=btn.property('dcc_type')))
                 else:
                     dcc_fn = btn.property('dcc_fn')
                     if dcc_fn:
@@ -226,24 +240,23 @@ class CategoryWidget(base.BaseWidget, object):
         :param nodes: list(str)
         """
 
-        nodes_to_discard = self._get_nodes_to_discard() or list()
+        nodes_to_discard = set(self._get_nodes_to_discard() or list())
+
+        nodes = [obj for obj in set(nodes) if obj not in nodes_to_discard]
+
+        if self._client:
+            # Per node queries are pipelined in a single round so the loop below does not wait a reply for each node
+            self._client.prefetch_queries([('node_short_name', [obj], dict()) for obj in nodes])
 
-        nodes = list(set(nodes))
+        type_ids = None
+        if not self._others_btn.isChecked():
+            type_ids = self._classify_nodes(nodes, self._get_node_types())
 
-        for obj in nodes:
-            if obj in nodes_to_discard:
+        for i, obj in enumerate(nodes):
+            if type_ids is not None and type_ids[i] == categories.UNCLASSIFIED:
                 continue
-            node_type = dcc.client().node_type(obj)
-            if node_type not in self._get_node_types() and not self._others_btn.isChecked():
-                is_valid = False
-                for node_type in self._get_node_types():
-                    is_valid = dcc.client().check_object_type(obj, node_type, check_sub_types=True)
-                    if is_valid:
-                        break
-                if not is_valid:
-                    continue
-
-            node_name = dcc.client().node_short_name(obj)
+
+            node_name = self._query('node_short_name', obj)
             item = QTreeWidgetItem(self._names_list, [node_name])
             item.obj = node_name
             item.preview_name = ''
@@ -255,6 +268,26 @@ class CategoryWidget(base.BaseWidget, object):
 
             self._names_list.addTopLevelItem(item)
 
+    def _classify_nodes(self, nodes, node_types):
+        """
+        Internal function that returns the index of the node type matched by each one of the given nodes
+        All nodes are classified by the renamer server in a single request when available
+        :param nodes: list(str)
+        :param node_types: list(str)
+        :return: list(int)
+        """
+
+        if not nodes or not node_types:
+            return [categories.UNCLASSIFIED] * len(nodes)
+
+        type_ids = self._client.classify_node_types(nodes, node_types) if self._client else None
+        if type_ids is None:
+            type_ids = categories.classify_nodes(
+                nodes, node_types, lambda node: self._query('node_type', node),
+                lambda node, node_type: self._query('check_object_type', node, node_type, check_sub_types=True))
+
+        return type_ids
+
     def _on_filter_names_changed(self, filter_text):
         """
         Internal callback function that is called each time the user enters text in the search line widget
@@ -32,6 +32,7 @@ class NameItRenameWidget(base.BaseWidget):
         self._model = model
         self._controller = controller
         self._token_widgets = OrderedDict()
+        self._auto_rename_settings = None
 
         super(NameItRenameWidget, self).__init__(parent=parent)
 
@@ -251,7 +252,42 @@ class NameItRenameWidget(base.BaseWidget):
         unique_id = self._model.unique_id_auto
         last_joint_end = self._model.last_joint_end_auto
 
-        return self._controller.auto_rename(tokens_dict, unique_id=unique_id, last_joint_end=last_joint_end)
+        # Settings are read and names are solved in the main thread. Only server requests are sent from worker threads
+        self._auto_rename_settings = self._controller.auto_rename_settings(
+            tokens_dict, unique_id=unique_id, last_joint_end=last_joint_end)
+        if not self._auto_rename_settings:
+            return None
+
+        self._rename_btn.setEnabled(False)
+        future = self._controller.async_client.submit(
+            self._controller.collect_auto_rename_targets, self._auto_rename_settings)
+        future.add_done_callback(self._on_auto_rename_targets_collected)
+
+        return future
+
+    def _on_auto_rename_targets_collected(self, future):
+        """
+        Internal callback function that is called when the nodes to auto rename are retrieved from the server
+        :param future: RenamerFuture
+        """
+
+        auto_rename_targets = None if future.error else future.result()
+        if not auto_rename_targets:
+            self._rename_btn.setEnabled(True)
+            return
+
+        solved_names = self._controller.solve_auto_rename_names(self._auto_rename_settings, auto_rename_targets)
+        future = self._controller.async_client.submit(
+            self._controller.apply_auto_rename_names, self._auto_rename_settings, solved_names)
+        future.add_done_callback(self._on_rename_finished)
+
+    def _on_rename_finished(self, future):
+        """
+        Internal callback function that is called when auto rename operation is finished in the server
+        :param future: RenamerFuture
+        """
+
+        self._rename_btn.setEnabled(True)
 
     def _on_naming_file_changed(self, naming_file_path):
         self._controller.set_naming_file(naming_file_path)
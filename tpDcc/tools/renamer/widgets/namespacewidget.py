@@ -10,7 +10,6 @@ from __future__ import print_function, division, absolute_import
 from Qt.QtCore import Qt, Signal, QObject
 from Qt.QtWidgets import QSizePolicy
 
-from tpDcc import dcc
 from tpDcc.managers import resources
 from tpDcc.libs.qt.core import base
 from tpDcc.libs.qt.widgets import layouts, checkbox, lineedit, combobox, buttons
@@ -155,6 +154,12 @@ class NamespaceWidgetModel(QObject, object):
 
 class NamespaceWidgetController(object):
     def __init__(self, client, model):
+        """
+        :param client: AsyncRenamerClient or RenamerClient. Commands are executed by the server in its own undo chunks,
+            so they can be sent from worker threads through an asynchronous client
+        :param model: NamespaceWidgetModel
+        """
+
         super(NamespaceWidgetController, self).__init__()
 
         self._client = client
@@ -181,7 +186,6 @@ class NamespaceWidgetController(object):
         elif namespace_option == 1:
             self.remove_namespace()
 
-    @dcc.undo_decorator()
     def add_replace_namespace(self):
         global_data = self._model.global_data
         namespace = self._model.namespace
@@ -192,10 +196,9 @@ class NamespaceWidgetController(object):
 
         return self._client.add_replace_namespace(
             namespace=namespace, rename_shape=rename_shape, hierarchy_check=hierarchy_check,
-            only_selection=only_selection, filter_type=filter_type
+            only_selection=only_selection, filter_type=filter_type, as_job=True
         )
 
-    @dcc.undo_decorator()
     def remove_namespace(self):
         global_data = self._model.global_data
         namespace = self._model.namespace
@@ -12,7 +12,6 @@ from functools import partial
 from Qt.QtCore import Qt, Signal, QObject
 from Qt.QtWidgets import QSizePolicy, QButtonGroup
 
-from tpDcc import dcc
 from tpDcc.managers import resources
 from tpDcc.libs.qt.core import base
 from tpDcc.libs.qt.widgets import layouts, dividers, label, buttons, checkbox, combobox, spinbox
@@ -361,6 +360,12 @@ class NumberSideWidgetModel(QObject, object):
 
 class NumberSideWidgetController(object):
     def __init__(self, client, model):
+        """
+        :param client: AsyncRenamerClient or RenamerClient. Commands are executed by the server in its own undo chunks,
+            so they can be sent from worker threads through an asynchronous client
+        :param model: NumberSideWidgetModel
+        """
+
         super(NumberSideWidgetController, self).__init__()
 
         self._client = client
@@ -399,7 +404,6 @@ class NumberSideWidgetController(object):
         elif padding_option == 2:
             self.change_padding()
 
-    @dcc.undo_decorator()
     def replace_padding(self):
         global_data = self._model.global_data
         padding = self._model.padding_value
@@ -413,7 +417,6 @@ class NumberSideWidgetController(object):
             only_selection=only_selection, filter_type=filter_type
         )
 
-    @dcc.undo_decorator()
     def append_padding(self):
         global_data = self._model.global_data
         padding = self._model.padding_value
@@ -427,7 +430,6 @@ class NumberSideWidgetController(object):
             only_selection=only_selection, filter_type=filter_type
         )
 
-    @dcc.undo_decorator()
     def change_padding(self):
         global_data = self._model.global_data
         padding = self._model.padding_value
@@ -441,7 +443,6 @@ class NumberSideWidgetController(object):
             only_selection=only_selection, filter_type=filter_type
         )
 
-    @dcc.undo_decorator()
     def add_side(self):
         global_data = self._model.global_data
         side = self._model.get_side()
@@ -11,7 +11,6 @@ from Qt.QtCore import Qt, Signal, QObject, QRegExp
 from Qt.QtWidgets import QSizePolicy
 from Qt.QtGui import QRegExpValidator
 
-from tpDcc import dcc
 from tpDcc.managers import configs, resources
 
 from tpDcc.libs.qt.core import base
@@ -446,6 +445,12 @@ class PrefixSuffixWidgetModel(QObject, object):
 
 class PrefixSuffixWidgetController(object):
     def __init__(self, client, model):
+        """
+        :param client: AsyncRenamerClient or RenamerClient. Commands are executed by the server in its own undo chunks,
+            so they can be sent from worker threads through an asynchronous client
+        :param model: PrefixSuffixWidgetModel
+        """
+
         super(PrefixSuffixWidgetController, self).__init__()
 
         self._client = client
@@ -481,7 +486,6 @@ class PrefixSuffixWidgetController(object):
     def change_selected_suffix(self, index):
         self._model.selected_suffix = index
 
-    @dcc.undo_decorator()
     def add_prefix(self):
         global_data = self._model.global_data
         new_prefix = self._model.prefix
@@ -495,7 +499,6 @@ class PrefixSuffixWidgetController(object):
             only_selection=only_selection, filter_type=filter_type
         )
 
-    @dcc.undo_decorator()
     def remove_prefix(self):
         global_data = self._model.global_data
         rename_shape = global_data.get('rename_shape', True)
@@ -508,7 +511,6 @@ class PrefixSuffixWidgetController(object):
             only_selection=only_selection, filter_type=filter_type
         )
 
-    @dcc.undo_decorator()
     def remove_first(self):
         count = self._model.remove_first_value
         global_data = self._model.global_data
@@ -522,7 +524,6 @@ class PrefixSuffixWidgetController(object):
             only_selection=only_selection, filter_type=filter_type
         )
 
-    @dcc.undo_decorator()
     def remove_last(self):
         count = self._model.remove_last_value
         global_data = self._model.global_data
@@ -536,7 +537,6 @@ class PrefixSuffixWidgetController(object):
             only_selection=only_selection, filter_type=filter_type
         )
 
-    @dcc.undo_decorator()
     def add_suffix(self):
         global_data = self._model.global_data
         new_suffix = self._model.suffix
@@ -550,7 +550,6 @@ class PrefixSuffixWidgetController(object):
             only_selection=only_selection, filter_type=filter_type
         )
 
-    @dcc.undo_decorator()
     def remove_suffix(self):
         global_data = self._model.global_data
         rename_shape = global_data.get('rename_shape', True)
@@ -11,12 +11,11 @@ from Qt.QtCore import Qt, Signal, QObject, QRegExp
 from Qt.QtWidgets import QWidget, QSizePolicy
 from Qt.QtGui import QRegExpValidator
 
-from tpDcc import dcc
 from tpDcc.managers import resources
 from tpDcc.libs.qt.core import base
 from tpDcc.libs.qt.widgets import layouts, buttons, checkbox, lineedit
 
-from tpDcc.tools.renamer.core import utils
+from tpDcc.tools.renamer.core import utils, asyncclient
 
 
 class RenamerView(base.BaseWidget, object):
@@ -142,6 +141,12 @@ class RenamerWidgetModel(QObject, object):
 
 class RenamerWidgetController(object):
     def __init__(self, client, model):
+        """
+        :param client: AsyncRenamerClient or RenamerClient. Commands are executed by the server in its own undo chunks,
+            so they can be sent from worker threads through an asynchronous client
+        :param model: RenamerWidgetModel
+        """
+
         super(RenamerWidgetController, self).__init__()
 
         self._client = client
@@ -153,16 +158,31 @@ class RenamerWidgetController(object):
     def change_name(self, new_name):
         self._model.name = new_name
 
-    @dcc.undo_decorator()
     def rename_simple(self):
         global_data = self._model.global_data
         new_name = self._model.name
         rename_shape = global_data.get('rename_shape', True)
         hierarchy_check = global_data.get('hierarchy_check', False)
         selection_type = global_data.get('selection_type', 0)
+
+        # Nodes are collected and renamed in a worker thread if the controller uses an asynchronous client
+        return asyncclient.run_command(
+            self._client, self._rename_simple, new_name, rename_shape, hierarchy_check, selection_type)
+
+    def _rename_simple(self, renamer_client, new_name, rename_shape, hierarchy_check, selection_type):
+        """
+        Internal function that renames the nodes to rename with given name
+        :param renamer_client: RenamerClient
+        :param new_name: str
+        :param rename_shape: bool
+        :param hierarchy_check: bool
+        :param selection_type: int
+        :return: bool
+        """
+
         nodes = utils.get_objects_to_rename(hierarchy_check=hierarchy_check, selection_type=selection_type)
 
-        return self._client.simple_rename(new_name, rename_shape=rename_shape, nodes=nodes)
+        return renamer_client.simple_rename(new_name, rename_shape=rename_shape, nodes=nodes)
 
 
 def renamer_widget(client, parent=None):
@@ -11,12 +11,11 @@ from Qt.QtCore import Qt, Signal, QObject, QRegExp
 from Qt.QtGui import QRegExpValidator
 
 
-from tpDcc import dcc
 from tpDcc.managers import resources
 from tpDcc.libs.qt.core import base
 from tpDcc.libs.qt.widgets import layouts, checkbox, lineedit, buttons
 
-from tpDcc.tools.renamer.core import utils
+from tpDcc.tools.renamer.core import utils, asyncclient
 
 
 class ReplacerView(base.BaseWidget, object):
@@ -54,9 +53,9 @@ class ReplacerView(base.BaseWidget, object):
         self._with_line = lineedit.BaseLineEdit(parent=self)
         self._with_line.setPlaceholderText('Replace')
         reg_ex = QRegExp("[a-zA-Z_0-9]+")
-        text_validator = QRegExpValidator(reg_ex, self._replace_line)
-        self._replace_line.setValidator(text_validator)
-        self._with_line.setValidator(text_validator)
+        self._text_validator = QRegExpValidator(reg_ex, self._replace_line)
+        self._replace_line.setValidator(self._text_validator)
+        self._with_line.setValidator(self._text_validator)
         self._search_replace_btn = buttons.BaseButton(parent=self)
         self._search_replace_btn.setIcon(resources.icon('find_replace'))
 
@@ -65,16 +64,35 @@ class ReplacerView(base.BaseWidget, object):
         replace_layout.addWidget(self._with_line)
         replace_layout.addWidget(self._search_replace_btn)
 
+        options_layout = layouts.HorizontalLayout(spacing=2, margins=(0, 0, 0, 0))
+        options_layout.setAlignment(Qt.AlignLeft)
+        self.main_layout.addLayout(options_layout)
+
+        self._regex_cbx = checkbox.BaseCheckBox('Regex', parent=self)
+        self._ignore_case_cbx = checkbox.BaseCheckBox('Ignore Case', parent=self)
+        self._whole_word_cbx = checkbox.BaseCheckBox('Whole Token', parent=self)
+        options_layout.addWidget(self._regex_cbx)
+        options_layout.addWidget(self._ignore_case_cbx)
+        options_layout.addWidget(self._whole_word_cbx)
+
         self._replace_line.setEnabled(False)
         self._with_line.setEnabled(False)
+        for option_cbx in (self._regex_cbx, self._ignore_case_cbx, self._whole_word_cbx):
+            option_cbx.setEnabled(False)
 
     def setup_signals(self):
         self._find_replace_cbx.toggled.connect(self._controller.toggle_search_replace_check)
         self._replace_line.textChanged.connect(self._controller.change_search)
         self._with_line.textChanged.connect(self._controller.change_replace)
         self._search_replace_btn.clicked.connect(self._controller.search_and_replace)
+        self._regex_cbx.toggled.connect(self._controller.toggle_regex)
+        self._ignore_case_cbx.toggled.connect(self._controller.toggle_ignore_case)
+        self._whole_word_cbx.toggled.connect(self._controller.toggle_whole_word)
 
         self._model.searchReplaceCheckChanged.connect(self._on_find_replace_toggled)
+        self._model.regexChanged.connect(self._on_regex_toggled)
+        self._model.ignoreCaseChanged.connect(self._ignore_case_cbx.setChecked)
+        self._model.wholeWordChanged.connect(self._whole_word_cbx.setChecked)
         self._model.searchChanged.connect(self._on_search_changed)
         self._model.replaceChanged.connect(self._on_replace_changed)
 
@@ -82,14 +100,27 @@ class ReplacerView(base.BaseWidget, object):
         self._find_replace_cbx.setChecked(self._model.search_replace_check)
         self._replace_line.setText(self._model.search)
         self._with_line.setText(self._model.replace)
+        self._regex_cbx.setChecked(self._model.regex)
+        self._ignore_case_cbx.setChecked(self._model.ignore_case)
+        self._whole_word_cbx.setChecked(self._model.whole_word)
 
     def _on_find_replace_toggled(self, flag):
         self._find_replace_cbx.setChecked(flag)
         self._replace_line.setEnabled(flag)
         self._with_line.setEnabled(flag)
         self._search_replace_btn.setEnabled(flag)
+        for option_cbx in (self._regex_cbx, self._ignore_case_cbx, self._whole_word_cbx):
+            option_cbx.setEnabled(flag)
         # self.replaceUpdate.emit()
 
+    def _on_regex_toggled(self, flag):
+        self._regex_cbx.setChecked(flag)
+
+        # Regular expressions and capture group references use characters that are not valid in node names
+        text_validator = None if flag else self._text_validator
+        self._replace_line.setValidator(text_validator)
+        self._with_line.setValidator(text_validator)
+
     def _on_search_changed(self, new_text):
         self._replace_line.setText(new_text)
         # self.replaceUpdate.emit()
@@ -104,6 +135,9 @@ class ReplacerWidgetModel(QObject, object):
     searchReplaceCheckChanged = Signal(bool)
     searchChanged = Signal(str)
     replaceChanged = Signal(str)
+    regexChanged = Signal(bool)
+    ignoreCaseChanged = Signal(bool)
+    wholeWordChanged = Signal(bool)
 
     def __init__(self):
         super(ReplacerWidgetModel, self).__init__()
@@ -112,6 +146,9 @@ class ReplacerWidgetModel(QObject, object):
         self._search_replace_check = False
         self._search = ''
         self._replace = ''
+        self._regex = False
+        self._ignore_case = False
+        self._whole_word = False
 
     @property
     def global_data(self):
@@ -148,6 +185,33 @@ class ReplacerWidgetModel(QObject, object):
         self._replace = str(value)
         self.replaceChanged.emit(self._replace)
 
+    @property
+    def regex(self):
+        return self._regex
+
+    @regex.setter
+    def regex(self, flag):
+        self._regex = bool(flag)
+        self.regexChanged.emit(self._regex)
+
+    @property
+    def ignore_case(self):
+        return self._ignore_case
+
+    @ignore_case.setter
+    def ignore_case(self, flag):
+        self._ignore_case = bool(flag)
+        self.ignoreCaseChanged.emit(self._ignore_case)
+
+    @property
+    def whole_word(self):
+        return self._whole_word
+
+    @whole_word.setter
+    def whole_word(self, flag):
+        self._whole_word = bool(flag)
+        self.wholeWordChanged.emit(self._whole_word)
+
     @property
     def rename_settings(self):
         search_str = self.search if self.search_replace_check else ''
@@ -155,12 +219,21 @@ class ReplacerWidgetModel(QObject, object):
 
         return {
             'search': search_str,
-            'replace': replace_str
+            'replace': replace_str,
+            'regex': self.regex,
+            'ignore_case': self.ignore_case,
+            'whole_word': self.whole_word
         }
 
 
 class ReplacerWidgetController(object):
     def __init__(self, client, model):
+        """
+        :param client: AsyncRenamerClient or RenamerClient. Commands are executed by the server in its own undo chunks,
+            so they can be sent from worker threads through an asynchronous client
+        :param model: ReplacerWidgetModel
+        """
+
         super(ReplacerWidgetController, self).__init__()
 
         self._client = client
@@ -175,16 +248,57 @@ class ReplacerWidgetController(object):
     def change_replace(self, value):
         self._model.replace = value
 
-    @dcc.undo_decorator()
+    def toggle_regex(self, flag):
+        self._model.regex = flag
+
+    def toggle_ignore_case(self, flag):
+        self._model.ignore_case = flag
+
+    def toggle_whole_word(self, flag):
+        self._model.whole_word = flag
+
     def search_and_replace(self):
         global_data = self._model.global_data
         search_str = self._model.search
         replace_str = self._model.replace
         hierarchy_check = global_data.get('hierarchy_check', False)
         selection_type = global_data.get('selection_type', 0)
-        nodes = utils.get_objects_to_rename(hierarchy_check=hierarchy_check, selection_type=selection_type)
-
-        return self._client.search_and_replace(search_str, replace_str, nodes=nodes)
+        replace_kwargs = {
+            'regex': self._model.regex, 'ignore_case': self._model.ignore_case, 'whole_word': self._model.whole_word}
+
+        # Nodes are collected and renamed in a worker thread if the controller uses an asynchronous client
+        return asyncclient.run_command(
+            self._client, self._search_and_replace, search_str, replace_str, hierarchy_check, selection_type,
+            replace_kwargs)
+
+    def _search_and_replace(
+            self, renamer_client, search_str, replace_str, hierarchy_check, selection_type, replace_kwargs):
+        """
+        Internal function that replaces given search text in the names of the nodes to rename
+        :param renamer_client: RenamerClient
+        :param search_str: str
+        :param replace_str: str
+        :param hierarchy_check: bool
+        :param selection_type: int
+        :param replace_kwargs: dict, regex, ignore_case and whole_word search options
+        :return: dict or bool
+        """
+
+        # Each chunk is renamed as soon as it is retrieved, so requests sent to the server have a bounded size
+        total_result = None
+        for nodes in utils.iter_objects_to_rename(hierarchy_check=hierarchy_check, selection_type=selection_type):
+            result = renamer_client.search_and_replace(search_str, replace_str, nodes=nodes, **replace_kwargs)
+            if not result:
+                return result
+            if isinstance(result, dict):
+                total_result = dict(
+                    (key, (total_result or dict()).get(key, 0) + value) for key, value in result.items())
+            elif total_result is None:
+                total_result = result
+        if total_result is None:
+            return renamer_client.search_and_replace(search_str, replace_str, nodes=None, **replace_kwargs)
+
+        return total_result
 
 
 def replacer_widget(client, parent=None):
@@ -7,16 +7,21 @@ Widget that contains manual rename widgets for tpRenamer
 
 from __future__ import print_function, division, absolute_import
 
+import logging
+
 from Qt.QtCore import Signal
+from Qt.QtWidgets import QProgressBar
 
 from tpDcc import dcc
 from tpDcc.managers import resources
 from tpDcc.libs.qt.core import base
-from tpDcc.libs.qt.widgets import accordion, dividers, buttons
+from tpDcc.libs.qt.widgets import layouts, accordion, dividers, buttons
 
 from tpDcc.tools.renamer.widgets import renamerwidget, replacerwidget, prefixsuffixwidget, numbersidewidget
 from tpDcc.tools.renamer.widgets import namespacewidget, utilswidget
 
+LOGGER = logging.getLogger('tpDcc-tools-renamer')
+
 
 class ToolsRenameWidget(base.BaseWidget, object):
 
@@ -38,15 +43,18 @@ class ToolsRenameWidget(base.BaseWidget, object):
         manual_accordion = accordion.AccordionWidget(parent=self)
         self.main_layout.addWidget(manual_accordion)
 
-        self._renamer_widget = renamerwidget.renamer_widget(client=self._controller.client, parent=self)
+        # Tools commands are executed through asynchronous client, so UI is not blocked while the server works.
+        # Server opens the undo chunks of the commands, so they are not opened by sub-widgets controllers
+        renamer_client = self._controller.async_client
+        self._renamer_widget = renamerwidget.renamer_widget(client=renamer_client, parent=self)
         self._prefix_suffix_widget = prefixsuffixwidget.preffix_suffix_widget(
-            client=self._controller.client, naming_config=self._model.naming_config, parent=self)
-        self._number_side_widget = numbersidewidget.number_side_widget(client=self._controller.client, parent=self)
+            client=renamer_client, naming_config=self._model.naming_config, parent=self)
+        self._number_side_widget = numbersidewidget.number_side_widget(client=renamer_client, parent=self)
         self._namespace_widget = None
         if dcc.client().is_maya():
-            self._namespace_widget = namespacewidget.namespace_widget(client=self._controller.client, parent=self)
-        self._replacer_widget = replacerwidget.replacer_widget(client=self._controller.client, parent=self)
-        self._utils_widget = utilswidget.utils_widget(client=self._controller.client, parent=self)
+            self._namespace_widget = namespacewidget.namespace_widget(client=renamer_client, parent=self)
+        self._replacer_widget = replacerwidget.replacer_widget(client=renamer_client, parent=self)
+        self._utils_widget = utilswidget.utils_widget(client=renamer_client, parent=self)
 
         manual_accordion.add_item('Name', self._renamer_widget)
         manual_accordion.add_item('Prefix/Suffix', self._prefix_suffix_widget)
@@ -58,12 +66,26 @@ class ToolsRenameWidget(base.BaseWidget, object):
 
         self._rename_btn = buttons.BaseButton('Rename')
         self._rename_btn.setIcon(resources.icon('rename'))
+        self._progress_bar = QProgressBar(parent=self)
+        self._progress_bar.setTextVisible(True)
+        self._progress_bar.setFormat('%v / %m commands')
+        self._progress_bar.setVisible(False)
+        self._cancel_btn = buttons.BaseButton('Cancel')
+        self._cancel_btn.setVisible(False)
+        progress_layout = layouts.HorizontalLayout(spacing=2, margins=(0, 0, 0, 0))
+        progress_layout.addWidget(self._progress_bar)
+        progress_layout.addWidget(self._cancel_btn)
         self.main_layout.addLayout(dividers.DividerLayout())
+        self.main_layout.addLayout(progress_layout)
         self.main_layout.addWidget(self._rename_btn)
 
     def setup_signals(self):
         self._model.globalAttributeChanged.connect(self._on_updated_global_attribute)
         self._rename_btn.clicked.connect(self._on_rename)
+        self._controller.async_client.busyChanged.connect(self._on_busy_changed)
+        self._controller.async_client.progressChanged.connect(self._on_progress_changed)
+        self._controller.async_client.jobProgressChanged.connect(self._on_job_progress_changed)
+        self._cancel_btn.clicked.connect(self._on_cancel)
 
     def refresh(self):
         self._update_global_attribute()
@@ -98,4 +120,52 @@ class ToolsRenameWidget(base.BaseWidget, object):
             renaming_data = widget.model.rename_settings
             models_data.update(renaming_data)
 
-        return self._controller.rename(**models_data)
+        # Settings are compiled once, so names are generated without checking unused settings per node
+        try:
+            rename_pipeline = self._controller.compile_rename_pipeline(**models_data)
+        except ValueError as exc:
+            LOGGER.warning('Impossible to rename: {}'.format(exc))
+            return
+
+        return self._controller.rename(pipeline=rename_pipeline, **models_data)
+
+    def _on_busy_changed(self, flag):
+        """
+        Internal callback function that is called when asynchronous client starts or finishes executing commands
+        :param flag: bool
+        """
+
+        self._progress_bar.setVisible(flag)
+        self._progress_bar.setFormat('%v / %m commands')
+        self._cancel_btn.setVisible(flag)
+        self._cancel_btn.setEnabled(True)
+        self._rename_btn.setEnabled(not flag)
+
+    def _on_progress_changed(self, completed, submitted):
+        """
+        Internal callback function that is called each time asynchronous client commands progress changes
+        :param completed: int
+        :param submitted: int
+        """
+
+        self._progress_bar.setMaximum(submitted)
+        self._progress_bar.setValue(completed)
+
+    def _on_job_progress_changed(self, progress):
+        """
+        Internal callback function that is called each time the progress of a server job is received
+        :param progress: dict
+        """
+
+        self._progress_bar.setMaximum(progress.get('total', 0))
+        self._progress_bar.setValue(progress.get('processed', 0))
+        self._progress_bar.setFormat('{}: %v / %m nodes ({:.0f} nodes/s)'.format(
+            progress.get('name', ''), progress.get('throughput', 0.0)))
+
+    def _on_cancel(self):
+        """
+        Internal callback function that is called when the user clicks on cancel button
+        """
+
+        self._cancel_btn.setEnabled(False)
+        self._controller.async_client.cancel_jobs()
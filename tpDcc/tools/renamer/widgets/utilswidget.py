@@ -100,12 +100,17 @@ class UtilsWidgetModel(QObject, object):
 
 class UtilsWidgetController(object):
     def __init__(self, client, model):
+        """
+        :param client: AsyncRenamerClient or RenamerClient. Commands are executed by the server in its own undo chunks,
+            so they can be sent from worker threads through an asynchronous client
+        :param model: UtilsWidgetModel
+        """
+
         super(UtilsWidgetController, self).__init__()
 
         self._client = client
         self._model = model
 
-    @dcc.undo_decorator()
     def automatic_suffix(self):
         global_data = self._model.global_data
         rename_shape = global_data.get('rename_shape', True)
@@ -115,10 +120,9 @@ class UtilsWidgetController(object):
 
         return self._client.automatic_suffix(
             rename_shape=rename_shape, hierarchy_check=hierarchy_check,
-            only_selection=only_selection, filter_type=filter_type
+            only_selection=only_selection, filter_type=filter_type, as_job=True
         )
 
-    @dcc.undo_decorator()
     def make_unique_name(self):
         global_data = self._model.global_data
         rename_shape = global_data.get('rename_shape', True)
@@ -128,10 +132,9 @@ class UtilsWidgetController(object):
 
         return self._client.make_unique_name(
             rename_shape=rename_shape, hierarchy_check=hierarchy_check,
-            only_selection=only_selection, filter_type=filter_type
+            only_selection=only_selection, filter_type=filter_type, as_job=True
         )
 
-    @dcc.undo_decorator()
     def remove_all_numbers(self):
         global_data = self._model.global_data
         rename_shape = global_data.get('rename_shape', True)
@@ -141,10 +144,9 @@ class UtilsWidgetController(object):
 
         return self._client.remove_all_numbers(
             rename_shape=rename_shape, hierarchy_check=hierarchy_check,
-            only_selection=only_selection, filter_type=filter_type
+            only_selection=only_selection, filter_type=filter_type, as_job=True
         )
 
-    @dcc.undo_decorator()
     def remove_trail_numbers(self):
         global_data = self._model.global_data
         rename_shape = global_data.get('rename_shape', True)
@@ -157,7 +159,6 @@ class UtilsWidgetController(object):
             only_selection=only_selection, filter_type=filter_type
         )
 
-    @dcc.undo_decorator()
     def clean_unused_namespaces(self):
         return self._client.clean_unused_namespaces()
 